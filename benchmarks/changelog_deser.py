@@ -0,0 +1,83 @@
+""" Benchmarks loading and dumping changelogs with the schema-specific fast path of #slap.changelog.load_changelog()
+and #slap.changelog.dump_changelog() against the generic databind conversion that is used as the fallback.
+
+Generates changelogs with a total of 10,000 entries (in releases of 25 entries each), converts the decoded TOML data
+with both implementations and checks that the results are equal.
+
+    $ python benchmarks/changelog_deser.py [--entries N]
+"""
+
+import argparse
+import datetime
+import time
+import typing as t
+import uuid
+
+import databind.json
+import tomli
+import tomli_w
+from databind.core.settings import SerializeDefaults
+
+from slap.changelog import Changelog, ChangelogEntry, dump_changelog, load_changelog
+
+ENTRIES_PER_RELEASE = 25
+
+
+def _make_changelogs(entries: int) -> list[dict[str, t.Any]]:
+    changelogs = []
+    for release in range(0, entries, ENTRIES_PER_RELEASE):
+        changelog = Changelog(release_date=datetime.date(2020, 1, 1) + datetime.timedelta(days=release))
+        for index in range(release, min(release + ENTRIES_PER_RELEASE, entries)):
+            changelog.entries.append(
+                ChangelogEntry(
+                    id=str(uuid.UUID(int=index)),
+                    type="fix",
+                    description=f"Fix `thing{index}` in a module with a reasonably long description",
+                    author="@someone" if index % 2 else None,
+                    authors=None if index % 2 else ["@someone", "@else"],
+                    pr=f"https://github.com/owner/repo/pull/{index}" if index % 3 == 0 else None,
+                    issues=[f"https://github.com/owner/repo/issues/{index}"] if index % 5 == 0 else None,
+                )
+            )
+        changelogs.append(tomli.loads(tomli_w.dumps(dump_changelog(changelog))))
+    return changelogs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=10_000)
+    args = parser.parse_args()
+
+    data = _make_changelogs(args.entries)
+    settings = [SerializeDefaults(False)]
+
+    tstart = time.perf_counter()
+    fast = [load_changelog(item) for item in data]
+    fast_load = time.perf_counter() - tstart
+
+    tstart = time.perf_counter()
+    slow = [databind.json.load(item, Changelog) for item in data]
+    slow_load = time.perf_counter() - tstart
+
+    tstart = time.perf_counter()
+    fast_dumped = [dump_changelog(changelog) for changelog in fast]
+    fast_dump = time.perf_counter() - tstart
+
+    tstart = time.perf_counter()
+    slow_dumped = [databind.json.dump(changelog, Changelog, settings=settings) for changelog in slow]
+    slow_dump = time.perf_counter() - tstart
+
+    assert fast == slow, "fast path and databind loaded different changelogs"
+    assert fast_dumped == slow_dumped, "fast path and databind dumped different data"
+
+    for name, duration in [
+        ("load (fast path)", fast_load),
+        ("load (databind)", slow_load),
+        ("dump (fast path)", fast_dump),
+        ("dump (databind)", slow_dump),
+    ]:
+        print(f"{name:>20}: {duration:6.3f}s ({args.entries / duration:,.0f} entries/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+""" Benchmarks `slap changelog diff assert-added` in a generated mono-repository.
+
+Generates a Git repository with 200 projects that each have an unreleased changelog, and a second commit that adds
+an entry to every changelog. Reads the 400 changelog files of the diff `HEAD~1..HEAD` through a single call to
+#Git.get_files_contents() and, for comparison, with one `git show` process per file like before #GitCatFile was
+added, then times the whole command.
+
+    $ python benchmarks/changelog_diff.py [--projects N] [--directory DIR]
+"""
+
+import argparse
+import subprocess as sp
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from nr.util.git import Git as _Git
+
+from slap.util.vcs import Git
+
+PYPROJECT = """
+[build-system]
+build-backend = "poetry.core.masonry.api"
+[tool.poetry]
+name = "{name}"
+version = "0.1.0"
+packages = [{{ include = "{name}" }}]
+"""
+
+ENTRY = """
+[[entries]]
+id = "{id}"
+type = "improvement"
+description = "Change number {index} of {name}"
+author = "@someone"
+"""
+
+
+def _git(directory: Path, *args: str) -> None:
+    sp.check_call(["git", "-c", "user.name=x", "-c", "user.email=x@x", *args], cwd=directory)
+
+
+def _make_repository(directory: Path, projects: int) -> list[Path]:
+    (directory / "slap.toml").write_text("")
+    changelogs = []
+    for index in range(projects):
+        name = f"project{index}"
+        (directory / name / name).mkdir(parents=True)
+        (directory / name / name / "__init__.py").write_text('__version__ = "0.1.0"\n')
+        (directory / name / "pyproject.toml").write_text(PYPROJECT.format(name=name))
+        (directory / name / ".changelog").mkdir()
+        changelog = directory / name / ".changelog" / "_unreleased.toml"
+        changelog.write_text(ENTRY.format(id=uuid.uuid4(), index=0, name=name))
+        changelogs.append(changelog)
+    _git(directory, "init", "-q")
+    _git(directory, "add", ".")
+    _git(directory, "commit", "-qm", "first")
+    for changelog in changelogs:
+        with changelog.open("a") as fp:
+            fp.write(ENTRY.format(id=uuid.uuid4(), index=1, name=changelog.parent.parent.name))
+    _git(directory, "commit", "-qam", "second")
+    return changelogs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--directory", type=Path, help="Generate the repository here instead of a temporary directory.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        directory = args.directory or Path(tmpdir)
+        directory.mkdir(parents=True, exist_ok=True)
+        changelogs = _make_repository(directory, args.projects)
+        print(f"generated {args.projects} projects in {directory}")
+
+        tstart = time.perf_counter()
+        git = Git(directory)
+        for revision in ("HEAD~1", "HEAD"):
+            git.get_files_contents(changelogs, revision)
+        bulk = time.perf_counter() - tstart
+
+        tstart = time.perf_counter()
+        baseline = _Git(str(directory))
+        for revision in ("HEAD~1", "HEAD"):
+            for changelog in changelogs:
+                baseline.get_file_contents(str(changelog), revision)
+        per_file = time.perf_counter() - tstart
+
+        tstart = time.perf_counter()
+        sp.check_call(
+            [sys.executable, "-m", "slap", "changelog", "diff", "assert-added", "HEAD~1..HEAD"],
+            cwd=directory,
+            stdout=sp.DEVNULL,
+        )
+        command = time.perf_counter() - tstart
+
+    reads = 2 * len(changelogs)
+    print(f"{'get_files_contents()':>24}: {bulk:6.2f}s ({reads} files)")
+    print(f"{'git show per file':>24}: {per_file:6.2f}s ({reads} files)")
+    print(f"{'changelog diff assert':>24}: {command:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+""" Benchmarks `slap release --validate` in a generated mono-repository.
+
+Generates a repository with 300 Poetry projects that each have a `__version__` in their package, a custom version
+reference in their `README.md` (configured in `[tool.slap.release.references]`) and dependencies on the two projects
+before them, then times the command. With `--compare REVISION`, the command is also timed with the Slap sources of
+the given Git revision of this repository (e.g. the commit before #VersionRefScanner was added) and the outputs of
+both runs are compared.
+
+    $ python benchmarks/release_validate.py [--projects N] [--compare REVISION]
+"""
+
+import argparse
+import os
+import subprocess as sp
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PYPROJECT = """
+[build-system]
+build-backend = "poetry.core.masonry.api"
+[tool.poetry]
+name = "{name}"
+version = "1.2.3"
+packages = [{{ include = "{name}" }}]
+[tool.poetry.dependencies]
+python = "^3.10"
+{dependencies}
+[tool.slap.release]
+references = [{{ file = "README.md", pattern = "{name}=={{version}}`" }}]
+"""
+
+
+def _make_repository(directory: Path, projects: int) -> None:
+    (directory / "slap.toml").write_text("")
+    for index in range(projects):
+        name = f"project{index}"
+        dependencies = "".join(f'project{dep} = "^1.2.3"\n' for dep in range(max(0, index - 2), index))
+        (directory / name / name).mkdir(parents=True)
+        (directory / name / name / "__init__.py").write_text('__version__ = "1.2.3"\n')
+        (directory / name / "README.md").write_text(f"# {name}\n\nInstall with `pip install {name}==1.2.3`.\n")
+        (directory / name / "pyproject.toml").write_text(PYPROJECT.format(name=name, dependencies=dependencies))
+    sp.check_call(["git", "init", "-q"], cwd=directory)
+
+
+def _run(directory: Path, src: Path, stderr: int | None = None) -> tuple[float, bytes]:
+    env = {**os.environ, "PYTHONPATH": str(src)}
+    command = [sys.executable, "-m", "slap", "release", "--validate"]
+    tstart = time.perf_counter()
+    output = sp.check_output(command, cwd=directory, env=env, stderr=stderr)
+    return time.perf_counter() - tstart, output
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--projects", type=int, default=300)
+    parser.add_argument("--compare", metavar="REVISION", help="Also time the Slap sources of this Git revision.")
+    args = parser.parse_args()
+
+    root = Path(__file__).resolve().parent.parent
+    with tempfile.TemporaryDirectory() as tmpdir:
+        directory = Path(tmpdir) / "repo"
+        directory.mkdir()
+        _make_repository(directory, args.projects)
+
+        duration, output = _run(directory, root / "src")
+        print(f"{'release --validate':>24}: {duration:6.2f}s ({args.projects} projects)")
+
+        if args.compare:
+            sources = Path(tmpdir) / "baseline"
+            sources.mkdir()
+            archive = sp.check_output(["git", "archive", args.compare, "src/"], cwd=root)
+            sp.run(["tar", "-x", "-C", str(sources)], input=archive, check=True)
+            # NOTE: The entry points of the installed distribution may refer to plugins that do not exist in the older
+            #       sources. Slap logs and skips them, which would clutter the output.
+            baseline_duration, baseline_output = _run(directory, sources / "src", sp.DEVNULL)
+            print(f"{args.compare:>24}: {baseline_duration:6.2f}s (same output: {baseline_output == output})")
+
+
+if __name__ == "__main__":
+    main()
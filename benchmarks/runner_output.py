@@ -0,0 +1,86 @@
+""" Benchmarks forwarding the output of a chatty test command through #TestRunner.
+
+Pipes one million lines from a child process through the #LinePump alone, through the #TestRunner into a cleo #IO
+that writes to `/dev/null`, and, for comparison, through the line-by-line reading loop that the #TestRunner used
+before it was switched to the #LinePump.
+
+    $ python benchmarks/runner_output.py [--lines N]
+"""
+
+import argparse
+import os
+import subprocess as sp
+import sys
+import time
+from codecs import getreader
+
+from cleo.io.inputs.string_input import StringInput
+from cleo.io.io import IO, OutputType
+from cleo.io.outputs.stream_output import StreamOutput
+
+from slap.ext.application.test import TestRunner
+from slap.util.pump import LinePump
+
+
+def _command(lines: int) -> str:
+    code = f"import sys; sys.stdout.writelines(f'line {{i}} of some output\\n' for i in range({lines}))"
+    return f'{sys.executable} -c "{code}"'
+
+
+def _make_io(devnull) -> IO:
+    output = StreamOutput(devnull, decorated=True)
+    return IO(StringInput(""), output, output)
+
+
+def bench_pump(lines: int) -> int:
+    proc = sp.Popen(_command(lines), shell=True, stdout=sp.PIPE)
+    assert proc.stdout
+    count = sum(len(batch) for batch in LinePump(proc.stdout.fileno()))
+    proc.wait()
+    return count
+
+
+def bench_test_runner(lines: int, io: IO) -> int:
+    return TestRunner("bench", _command(lines), io).run()
+
+
+def bench_readline_baseline(lines: int, io: IO) -> int:
+    proc = sp.Popen(_command(lines), shell=True, stdout=sp.PIPE, stderr=sp.STDOUT)
+    assert proc.stdout
+    for line in iter(getreader("utf-8")(proc.stdout).readline, ""):
+        io.write("<fg=blue>bench| </fg>")
+        io.write(line.rstrip() + "\n", type=OutputType.NORMAL)
+    return proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    # Run the TestRunner command with the same shell that the other benchmarks use through `shell=True`.
+    os.environ["SHELL"] = "sh"
+
+    with open(os.devnull, "w") as devnull:
+        io = _make_io(devnull)
+        for name, func in [
+            ("LinePump", lambda: bench_pump(args.lines)),
+            ("TestRunner", lambda: bench_test_runner(args.lines, io)),
+            ("readline baseline", lambda: bench_readline_baseline(args.lines, io)),
+        ]:
+            # The TestRunner uses a PTY if stdout is a terminal. Redirect stdout to measure the pipe path, like in CI.
+            sys.stdout.flush()
+            stdout = os.dup(1)
+            os.dup2(devnull.fileno(), 1)
+            try:
+                tstart = time.perf_counter()
+                func()
+                duration = time.perf_counter() - tstart
+            finally:
+                os.dup2(stdout, 1)
+                os.close(stdout)
+            print(f"{name:>20}: {duration:6.2f}s ({args.lines / duration:,.0f} lines/s)")
+
+
+if __name__ == "__main__":
+    main()
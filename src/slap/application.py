@@ -3,28 +3,35 @@ user and project configuration. """
 
 from __future__ import annotations
 
+import contextlib
 import dataclasses
 import logging
 import subprocess as sp
 import textwrap
+import threading
 import typing as t
 from pathlib import Path
 
 from cleo.application import Application as BaseCleoApplication  # type: ignore[import]
 from cleo.commands.command import Command as _BaseCommand  # type: ignore[import]
 from cleo.helpers import argument, option  # type: ignore[import]
-from cleo.io.io import IO  # type: ignore[import]
+from cleo.io.io import IO, OutputType  # type: ignore[import]
 from databind.core.settings import Alias
 
 from slap import __version__
+from slap.util.profiling import span
 from slap.util.strings import split_by_commata
 
 if t.TYPE_CHECKING:
+    import cProfile
+
+    from cleo.io.inputs.definition import Definition  # type: ignore[import]
     from nr.util.functional import Once
 
     from slap.configuration import Configuration
     from slap.project import Project
     from slap.repository import Repository
+    from slap.util.profiling import Profiler
 
 __all__ = ["Command", "argument", "option", "IO", "Application"]
 logger = logging.getLogger(__name__)
@@ -65,6 +72,9 @@ class CleoApplication(BaseCleoApplication):
         super().__init__(name, version)
         self._init_callback = init
         self._styles = {}
+        self._profiler: Profiler | None = None
+        self._cprofile: cProfile.Profile | None = None
+        self._profile_io: IO | None = None
 
         self._initialized = True
         from slap.util.cleo import HelpCommand
@@ -82,6 +92,111 @@ class CleoApplication(BaseCleoApplication):
     def add_style(self, name, fg=None, bg=None, options=None):
         self._styles[name] = self.Style(fg, bg, options)
 
+    @property
+    def _default_definition(self) -> Definition:
+        from cleo.io.inputs.option import Option  # type: ignore[import]
+
+        definition = super()._default_definition
+        definition.add_option(
+            Option(
+                "--profile",
+                flag=True,
+                description="Print a summary of the time spent in the main phases of the command, such as loading "
+                "plugins, reading configuration files and running subprocesses.",
+            )
+        )
+        definition.add_option(
+            Option(
+                "--trace-out",
+                flag=False,
+                description="Write the timing of the main phases of the command to the given file in the Chrome "
+                "trace event format.",
+            )
+        )
+        definition.add_option(
+            Option(
+                "--cprofile-out",
+                flag=False,
+                description="Profile the command with <u>cProfile</u> and write the statistics to the given file.",
+            )
+        )
+        return definition
+
+    def run(self, *args: t.Any, **kwargs: t.Any) -> int:
+        try:
+            return super().run(*args, **kwargs)
+        finally:
+            self._finish_profiling()
+
+    def _start_profiling(self, io: IO) -> None:
+        """Start recording timing spans and/or cProfile statistics if requested with the global options. The input is
+        not bound yet at this point, so only the presence of the options is checked (see #_get_profiling_option())."""
+
+        if io.input.has_parameter_option(["--profile", "--trace-out"], True):
+            from slap.util.profiling import Profiler
+
+            self._profiler = Profiler()
+            self._profiler.start()
+        if io.input.has_parameter_option("--cprofile-out", True):
+            import cProfile
+
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._profile_io = io
+
+    def _get_profiling_option(self, io: IO, name: str) -> t.Any:
+        """Internal. Return the value of a profiling option from the bound input. Unlike
+        #cleo.io.inputs.argv_input.ArgvInput.parameter_option(), this supports both the `--opt value` and `--opt=value`
+        forms. If the command failed before the input was bound, the input is bound to the default definition."""
+
+        from cleo.exceptions import CleoError  # type: ignore[import]
+
+        try:
+            return io.input.option(name)
+        except CleoError:
+            pass
+        with contextlib.suppress(CleoError):
+            io.input.bind(self._default_definition)
+        try:
+            return io.input.option(name)
+        except CleoError:
+            return None
+
+    def _finish_profiling(self) -> None:
+        """Stop profiling and write the results requested with the global options."""
+
+        io = self._profile_io
+        if io is None:
+            return
+        self._profile_io = None
+
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            filename = self._get_profiling_option(io, "cprofile-out")
+            if filename:
+                try:
+                    self._cprofile.dump_stats(filename)
+                except OSError as exc:
+                    io.write_error_line(f"<error>error: could not write cProfile statistics: {exc}</error>")
+                else:
+                    io.write_error_line(f"<info>cProfile statistics written to</info> <u>{filename}</u>")
+            self._cprofile = None
+
+        if self._profiler is not None:
+            self._profiler.stop()
+            if self._get_profiling_option(io, "profile"):
+                io.write_error_line(f"\n<b>Profile</b> (total: {self._profiler.elapsed():.3f}s)")
+                io.write_error(self._profiler.format_summary() + "\n", type=OutputType.RAW)
+            filename = self._get_profiling_option(io, "trace-out")
+            if filename:
+                try:
+                    self._profiler.write_chrome_trace(Path(filename))
+                except OSError as exc:
+                    io.write_error_line(f"<error>error: could not write trace: {exc}</error>")
+                else:
+                    io.write_error_line(f"<info>Trace written to</info> <u>{filename}</u>")
+            self._profiler = None
+
     def create_io(
         self, input: Input | None = None, output: Output | None = None, error_output: Output | None = None
     ) -> IO:
@@ -142,11 +257,13 @@ class CleoApplication(BaseCleoApplication):
         formatter.install("tty")
         formatter.install("notty")  # Hack for now to enable it also in CI
 
+        self._start_profiling(io)
         super()._configure_io(io)
         self._init_callback(io)
 
     def _run_command(self, command: Command, io: IO) -> int:  # type: ignore[override]
-        return super()._run_command(command, io)
+        with span(f"command {command.name}", "command"):
+            return super()._run_command(command, io)
 
 
 @dataclasses.dataclass
@@ -180,6 +297,7 @@ class Application:
         self.config = Once(self._get_application_configuration)
         self.cleo = CleoApplication(self._cleo_init, name, version)
         self.main_project = Once(self._get_main_project)
+        self._affected_projects: dict[str, list[Project]] = {}
 
     @property
     def repository(self) -> Repository:
@@ -187,7 +305,8 @@ class Application:
         that do not require the repository to function, so this property creates the repository lazily."""
 
         if self._repository is None:
-            self._repository = find_repository(self._directory)
+            with span("find_repository", "repository"):
+                self._repository = find_repository(self._directory)
 
         return self._repository
 
@@ -230,9 +349,10 @@ class Application:
         plugins delivered immediately with Slap are enabled by default unless disabled explicitly with the `disable`
         option."""
 
-        from nr.util.plugins import iter_entrypoints
+        with span("import entrypoints", "plugins"):
+            from nr.util.plugins import iter_entrypoints
 
-        from slap.plugins import ApplicationPlugin
+            from slap.plugins import ApplicationPlugin
 
         assert not self._plugins_loaded
         self._plugins_loaded = True
@@ -242,16 +362,22 @@ class Application:
 
         logger.debug("Loading application plugins")
 
-        for plugin_name, loader in iter_entrypoints(ApplicationPlugin):  # type: ignore[misc]
+        with span("iter_entrypoints", "plugins", group=ApplicationPlugin.ENTRYPOINT):
+            entrypoints = list(iter_entrypoints(ApplicationPlugin))  # type: ignore[misc]
+
+        for plugin_name, loader in entrypoints:
             if plugin_name in disable:
                 continue
             try:
-                plugin = loader()(self)
+                with span(f"load entrypoint {plugin_name}", "plugins"):
+                    plugin = loader()(self)
             except Exception:
                 logger.exception("Could not load plugin <subj>%s</subj> due to an exception", plugin_name)
             else:
-                plugin_config = plugin.load_configuration(self)
-                plugin.activate(self, plugin_config)
+                with span(f"{plugin_name}.load_configuration", "plugins"):
+                    plugin_config = plugin.load_configuration(self)
+                with span(f"{plugin_name}.activate", "plugins"):
+                    plugin.activate(self, plugin_config)
 
     def _cleo_init(self, io: IO) -> None:
         self.load_plugins()
@@ -262,13 +388,25 @@ class Application:
         self.cleo.run()
 
     def get_target_projects(
-        self, only_projects: str | t.Sequence[str] | None = None, cwd: Path | None = None
+        self,
+        only_projects: str | t.Sequence[str] | None = None,
+        cwd: Path | None = None,
+        changed_since: str | None = None,
     ) -> list[Project]:
         """
         Returns the list of projects that should be dealt with when executing a command. When there is a main project,
-        only the main project will be returned. When in the repository root, all projects will be returned.
+        only the main project will be returned. When in the repository root, all projects will be returned. If
+        *changed_since* is specified, only the projects affected by changes since the given revision are returned
+        (see #get_affected_projects()).
         """
 
+        projects = self._get_target_projects(only_projects, cwd)
+        if changed_since is not None:
+            affected = set(self.get_affected_projects(changed_since))
+            projects = [p for p in projects if p in affected]
+        return projects
+
+    def _get_target_projects(self, only_projects: str | t.Sequence[str] | None, cwd: Path | None) -> list[Project]:
         cwd = cwd or self._directory
         if isinstance(only_projects, str):
             only_projects = split_by_commata(only_projects)
@@ -290,6 +428,74 @@ class Application:
             return self.repository.get_projects_ordered()
         return []
 
+    def get_affected_projects(self, revision: str) -> list[Project]:
+        """Returns the projects that have changed since the given revision according to the repository's version
+        control system, as well as the projects that depend on them (see #Repository.get_projects_affected_by()).
+        The result is cached per revision.
+
+        Raises ValueError: If the repository is not managed by a version control system or if the *revision* does
+            not exist."""
+
+        if revision not in self._affected_projects:
+            vcs = self.repository.vcs()
+            if vcs is None:
+                raise ValueError(f"cannot determine changes since {revision!r}, no VCS detected for the repository")
+            changed_files = vcs.get_changed_files_since(revision)
+            logger.info("Detected <val>%d</val> changed files since <val>%s</val>", len(changed_files), revision)
+            self._affected_projects[revision] = self.repository.get_projects_affected_by(changed_files)
+        return self._affected_projects[revision]
+
+    def reload_configurations(self, files: t.Iterable[Path]) -> bool:
+        """Reload the configuration of the projects whose `pyproject.toml` or `slap.toml` is among the given *files*.
+        If the repository configuration is among them, or a configuration file that does not belong to a known
+        project (which may be a new project), the repository is reloaded instead, which also creates its projects
+        anew. Returns `True` if the repository was reloaded.
+
+        Note that the configuration of the application plugins is not reloaded."""
+
+        files = {file.resolve() for file in files if file.name in ("pyproject.toml", "slap.toml")}
+        if not files:
+            return False
+
+        projects = {project.directory.resolve(): project for project in self.repository.projects()}
+        directories = {file.parent for file in files}
+        if self.repository.directory.resolve() in directories or not directories <= projects.keys():
+            from nr.util.functional import Once
+
+            logger.info("Reloading configuration of repository <subj>%s</subj>", self.repository.directory)
+            self.repository.reload()
+            self.config = Once(self._get_application_configuration)
+            self.main_project = Once(self._get_main_project)
+            return True
+
+        for directory in directories:
+            logger.info("Reloading configuration of project <subj>%s</subj>", projects[directory])
+            projects[directory].reload()
+        return False
+
+    def watch_projects(self, stop: threading.Event | None = None) -> t.Iterator[list[Project]]:
+        """Watch the files in the repository for changes (see #FileWatcher) and yield the projects affected by every
+        batch of changes (see #Repository.get_projects_affected_by()), until the *stop* event is set. Changed
+        configuration files are reloaded first (see #reload_configurations()); if the repository was reloaded, all
+        projects are yielded in topological order."""
+
+        from slap.util.watch import FileWatcher
+
+        watcher = FileWatcher([self.repository.directory])
+        while True:
+            changed_files = watcher.wait(stop)
+            if not changed_files:
+                return
+            logger.info("Detected <val>%d</val> changed files", len(changed_files))
+            if self.reload_configurations(changed_files):
+                yield self.repository.get_projects_ordered()
+                continue
+            affected = self.repository.get_projects_affected_by(changed_files)
+            if affected:
+                yield affected
+            else:
+                logger.info("The changed files do not belong to any project")
+
 
 def find_repository(directory: Path) -> Repository:
     """
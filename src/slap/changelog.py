@@ -4,6 +4,10 @@ import abc
 import copy
 import dataclasses
 import datetime
+import hashlib
+import logging
+import os
+import re
 import typing as t
 import uuid
 from pathlib import Path
@@ -15,6 +19,9 @@ if t.TYPE_CHECKING:
     from poetry.core.constraints.version import Version  # type: ignore[import]
 
     from slap.repository import RepositoryHost
+    from slap.util.cache import DirectoryCache
+
+logger = logging.getLogger(__name__)
 
 
 def is_url(s: str) -> bool:
@@ -69,44 +76,186 @@ class ChangelogDeser(abc.ABC):
         ...
 
 
+#: The fields of #ChangelogEntry that must be strings, and those that are optional strings or lists of strings.
+_ENTRY_REQUIRED_FIELDS = ("id", "type", "description")
+_ENTRY_OPTIONAL_STR_FIELDS = ("author", "pr")
+_ENTRY_OPTIONAL_LIST_FIELDS = ("authors", "issues")
+_ENTRY_FIELDS = frozenset(_ENTRY_REQUIRED_FIELDS + _ENTRY_OPTIONAL_STR_FIELDS + _ENTRY_OPTIONAL_LIST_FIELDS)
+
+#: The length of the ISO 8601 release dates that are converted by the fast path of #load_changelog().
+_ISO_DATE_LENGTH = len("YYYY-MM-DD")
+
+
+def _load_entry_fast(data: t.Any) -> ChangelogEntry | None:
+    """Internal. Convert a changelog entry with the fast path of #load_changelog(), or return `None`."""
+
+    if type(data) is not dict or not data.keys() <= _ENTRY_FIELDS:
+        return None
+    for key in _ENTRY_REQUIRED_FIELDS:
+        if type(data.get(key)) is not str:
+            return None
+    for key in _ENTRY_OPTIONAL_STR_FIELDS:
+        if key in data and type(data[key]) is not str:
+            return None
+    for key in _ENTRY_OPTIONAL_LIST_FIELDS:
+        if key in data and (type(data[key]) is not list or not all(type(x) is str for x in data[key])):
+            return None
+    return ChangelogEntry(
+        id=data["id"],
+        type=data["type"],
+        description=data["description"],
+        author=data.get("author"),
+        authors=data.get("authors"),
+        pr=data.get("pr"),
+        issues=data.get("issues"),
+    )
+
+
+def _load_changelog_fast(data: t.Any) -> Changelog | None:
+    """Internal. Convert decoded changelog *data* without databind. Returns `None` if the data does not have exactly
+    the shape that is produced by Slap (e.g. it has unknown keys or values of an unexpected type), in which case the
+    caller must fall back to databind, which also produces meaningful error messages."""
+
+    if type(data) is not dict or not data.keys() <= {"entries", "release-date"}:
+        return None
+
+    release_date = data.get("release-date")
+    if type(release_date) is str and len(release_date) == _ISO_DATE_LENGTH:
+        try:
+            release_date = datetime.date.fromisoformat(release_date)
+        except ValueError:
+            return None
+    elif release_date is not None and type(release_date) is not datetime.date:
+        return None
+
+    entries = data.get("entries", [])
+    if type(entries) is not list:
+        return None
+    changelog = Changelog(entries=[], release_date=release_date)
+    for entry_data in entries:
+        entry = _load_entry_fast(entry_data)
+        if entry is None:
+            return None
+        changelog.entries.append(entry)
+    return changelog
+
+
+def _dump_entry_fast(entry: ChangelogEntry) -> dict[str, t.Any]:
+    """Internal. The fast path of #dump_changelog() for a single entry."""
+
+    data: dict[str, t.Any] = {"id": entry.id, "type": entry.type, "description": entry.description}
+    for key in ("author", "authors", "pr", "issues"):
+        value = getattr(entry, key)
+        if value is not None:
+            data[key] = list(value) if isinstance(value, list) else value
+    return data
+
+
+def load_changelog(data: t.Any, filename: str | None = None) -> Changelog:
+    """Convert decoded changelog *data* (e.g. from a TOML file) to a #Changelog. Data in the shape that Slap itself
+    writes is converted by a schema-specific fast path; anything else is converted with databind, which raises a
+    #databind.core.converter.ConversionError with details if the data is invalid."""
+
+    changelog = _load_changelog_fast(data)
+    if changelog is None:
+        import databind.json
+
+        changelog = databind.json.load(data, Changelog, filename=filename)
+    return changelog
+
+
+def dump_changelog(changelog: Changelog) -> dict[str, t.Any]:
+    """Convert a #Changelog to a JSON/TOML compatible dictionary, omitting fields that have their default value. This
+    is the inverse of #load_changelog()."""
+
+    if changelog.release_date is not None and type(changelog.release_date) is not datetime.date:
+        import databind.json
+        from databind.core.settings import SerializeDefaults
+
+        return t.cast(dict, databind.json.dump(changelog, Changelog, settings=[SerializeDefaults(False)]))
+
+    data: dict[str, t.Any] = {}
+    if changelog.entries:
+        data["entries"] = [_dump_entry_fast(entry) for entry in changelog.entries]
+    if changelog.release_date is not None:
+        data["release-date"] = changelog.release_date.isoformat()
+    return data
+
+
 class TomlChangelogDeser(ChangelogDeser):
     def load(self, fp: t.TextIO, filename: str) -> Changelog:
-        import databind.json
         import tomli
 
-        return databind.json.load(tomli.loads(fp.read()), Changelog, filename=filename)
+        return load_changelog(tomli.loads(fp.read()), filename)
 
     def dump(self, changelog: Changelog) -> str:
-        import databind.json
         import tomli_w
-        from databind.core.settings import SerializeDefaults
 
-        data = databind.json.dump(changelog, Changelog, settings=[SerializeDefaults(False)])
-        return tomli_w.dumps(t.cast(dict, data))
+        return tomli_w.dumps(dump_changelog(changelog))
 
     def dump_entry(self, entry: ChangelogEntry) -> str:
-        import databind.json
         import tomli_w
-        from databind.core.settings import SerializeDefaults
 
-        return tomli_w.dumps(
-            t.cast(dict, databind.json.dump(entry, ChangelogEntry, settings=[SerializeDefaults(False)]))
-        )
+        return tomli_w.dumps(_dump_entry_fast(entry))
+
+
+@dataclasses.dataclass
+class ChangelogIndexEntry:
+    """A summary of a changelog file, as stored in the index of a #ChangelogManager. It allows listing and sorting the
+    changelogs in a directory without parsing the files."""
+
+    #: The version of the changelog, or `None` for the unreleased changelog.
+    version: str | None
+
+    #: The release date of the changelog in ISO format, if any.
+    release_date: str | None
+
+    #: The IDs of the entries in the changelog, in order.
+    entry_ids: list[str]
+
+    #: The SHA-256 hex digest of the file contents.
+    hash: str
+
+    #: The modification time (in nanoseconds) and size of the file when it was indexed. If both still match, the
+    #: file is assumed to be unchanged without hashing its contents.
+    mtime_ns: int
+    size: int
+
+    @property
+    def entries(self) -> int:
+        return len(self.entry_ids)
 
 
 class ManagedChangelog:
     _manager: "ChangelogManager" = weak_property("_ManagedChangelog__manager")
 
-    def __init__(self, manager: "ChangelogManager", path: Path, version: str | None) -> None:
-        from poetry.core.constraints.version import Version
-
+    def __init__(
+        self,
+        manager: "ChangelogManager",
+        path: Path,
+        version: str | None,
+        index: ChangelogIndexEntry | None = None,
+    ) -> None:
         assert version is None or isinstance(version, str), type(version)
 
         self.path = path
-        self.version = Version.parse(version) if version else None
+        self.index = index
+        self._version_string = version
+        self._version: Version | None = None
         self._manager = manager
         self._content: Changelog | None = None
 
+    @property
+    def version(self) -> Version | None:
+        """The parsed version of the changelog, or `None` for the unreleased changelog. The version is parsed on first
+        access, so that listing changelogs does not need to import Poetry."""
+
+        if self._version is None and self._version_string:
+            from poetry.core.constraints.version import Version
+
+            self._version = Version.parse(self._version_string)
+        return self._version
+
     @property
     def content(self) -> Changelog:
         return self.load()
@@ -119,6 +268,11 @@ class ManagedChangelog:
             self._content = self._manager.load(self.path)
         return self._content
 
+    def unload(self) -> None:
+        """Discard the loaded content, if any. The next access to #content loads the file again."""
+
+        self._content = None
+
     def save(self, changelog: Changelog | None) -> None:
         if changelog is None:
             if self._content is None:
@@ -170,6 +324,13 @@ class ChangelogManager:
     #: If enabled, write operations to the changelog directory are disabled.
     readonly: bool = False
 
+    #: The cache in which the index of the changelog directory is stored. If not set, the index is rebuilt every time
+    #: it is needed.
+    index_cache: DirectoryCache | None = None
+
+    #: The version of the index format. Indexes stored with a different version are discarded.
+    INDEX_VERSION: t.ClassVar[int] = 1
+
     def load(self, file: Path | t.TextIO) -> Changelog:
         if isinstance(file, Path):
             with file.open("r") as fp:
@@ -193,17 +354,109 @@ class ChangelogManager:
         return ManagedChangelog(self, self.directory / self.version_fn_template.format(version=version), version)
 
     def all(self) -> list[ManagedChangelog]:
-        if not self.directory.exists():
-            return []
-        changelogs = []
-        for path in self.directory.iterdir():
-            if path.suffix == ".toml" and path.name != self.unreleased_fn:
-                changelogs.append(ManagedChangelog(self, path, path.stem))
-        changelogs.sort(key=lambda c: t.cast("Version", c.version), reverse=True)
-        unreleased = self.unreleased()
-        if unreleased.exists():
-            changelogs.insert(0, unreleased)
-        return changelogs
+        """Return the unreleased changelog (if it exists) followed by all released changelogs, sorted by version in
+        descending order. The order is taken from the #index() and the contents of the changelogs are only loaded
+        when they are accessed."""
+
+        return [
+            ManagedChangelog(self, self.directory / filename, entry.version, entry)
+            for filename, entry in self.index().items()
+        ]
+
+    def index(self) -> dict[str, ChangelogIndexEntry]:
+        """Return the index of the changelog directory, mapping the filenames of the changelogs to a summary of their
+        contents, in the same order as #all(). The index is updated for files that were added, removed or changed
+        since it was last stored in the #index_cache; a file is only hashed if its modification time or size
+        changed and only parsed if its hash changed. Versions are only parsed to sort the changelogs if the set of
+        files changed."""
+
+        if not self.directory.is_dir():
+            return {}
+
+        cache_key = "index-" + hashlib.sha256(str(self.directory.resolve()).encode()).hexdigest()[:32]
+        data = self.index_cache.get(cache_key) if self.index_cache else None
+        if not isinstance(data, dict) or data.get("version") != self.INDEX_VERSION:
+            data = {"version": self.INDEX_VERSION, "files": {}}
+
+        try:
+            cached = {filename: ChangelogIndexEntry(**entry) for filename, entry in data["files"].items()}
+        except TypeError:
+            cached = {}
+
+        changed = False
+        entries: dict[str, ChangelogIndexEntry] = {}
+        with os.scandir(self.directory) as it:
+            for dirent in it:
+                if not dirent.name.endswith(".toml") or not dirent.is_file():
+                    continue
+                stat = dirent.stat()
+                entry = cached.get(dirent.name)
+                if entry is None or entry.mtime_ns != stat.st_mtime_ns or entry.size != stat.st_size:
+                    entry = self._index_file(Path(dirent.path), stat, entry)
+                    changed = True
+                entries[dirent.name] = entry
+
+        if entries.keys() != cached.keys():
+            entries = self._sort_index(entries)
+        else:
+            entries = {filename: entries[filename] for filename in cached}
+
+        if self.index_cache and (changed or list(entries) != list(cached)):
+            self.index_cache.put(
+                cache_key,
+                {
+                    "version": self.INDEX_VERSION,
+                    "files": {filename: dataclasses.asdict(entry) for filename, entry in entries.items()},
+                },
+            )
+
+        return entries
+
+    def _index_file(
+        self, path: Path, stat: os.stat_result, previous: ChangelogIndexEntry | None
+    ) -> ChangelogIndexEntry:
+        """Internal. Create the index entry for a changelog file. If the contents match the *previous* entry, only the
+        file's modification time and size are updated."""
+
+        import tomli
+
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        if previous is not None and previous.hash == digest:
+            return dataclasses.replace(previous, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+
+        version = None if path.name == self.unreleased_fn else path.stem
+        release_date: str | None = None
+        entry_ids: list[str] = []
+        try:
+            content = tomli.loads(data.decode())
+        except (UnicodeDecodeError, tomli.TOMLDecodeError) as exc:
+            # Broken files are still listed, the error surfaces when the changelog is loaded.
+            logger.debug("Unable to index changelog <val>%s</val>: %s", path, exc)
+        else:
+            if content.get("release-date") is not None:
+                release_date = str(content["release-date"])
+            entries = content.get("entries")
+            if isinstance(entries, list):
+                entry_ids = [str(entry.get("id")) for entry in entries if isinstance(entry, dict)]
+
+        return ChangelogIndexEntry(version, release_date, entry_ids, digest, stat.st_mtime_ns, stat.st_size)
+
+    def _sort_index(self, entries: dict[str, ChangelogIndexEntry]) -> dict[str, ChangelogIndexEntry]:
+        """Internal. Sort the index *entries* like #all() does."""
+
+        from poetry.core.constraints.version import Version
+
+        released = sorted(
+            (filename for filename, entry in entries.items() if entry.version is not None),
+            key=lambda filename: Version.parse(t.cast(str, entries[filename].version)),
+            reverse=True,
+        )
+        result = {}
+        if self.unreleased_fn in entries:
+            result[self.unreleased_fn] = entries[self.unreleased_fn]
+        result.update((filename, entries[filename]) for filename in released)
+        return result
 
     def make_entry(
         self,
@@ -246,3 +499,173 @@ class ChangelogManager:
                 entry.pr = self.repository_host.get_pull_request_by_reference(entry.pr).url
             if entry.issues:
                 entry.issues = [self.repository_host.get_issue_by_reference(issue).url for issue in entry.issues]
+
+
+#: The fields that can be used in a query to #ChangelogSearchIndex.search(), in addition to `since`.
+SEARCH_FIELDS = ("type", "author", "issue", "pr")
+
+
+def _get_search_terms(entry: ChangelogEntry) -> set[str]:
+    """Internal. Return the terms under which the *entry* is found in a #ChangelogSearchIndex. Terms are lowercase
+    and prefixed with their field; description words use the `word` field."""
+
+    terms = {"type:" + entry.type.lower()}
+    terms.update("author:" + author.lower().lstrip("@") for author in entry.get_authors())
+    for field, refs in (("pr", [entry.pr] if entry.pr else []), ("issue", entry.issues or [])):
+        for ref in refs:
+            ref = ref.lower().rstrip("/")
+            terms.add(f"{field}:{ref}")
+            # Make issues and pull requests findable by their number as well as by their URL.
+            terms.add(f"{field}:{ref.rpartition('/')[2].lstrip('#')}")
+    terms.update("word:" + word for word in _tokenize(entry.description))
+    return terms
+
+
+def _tokenize(text: str) -> list[str]:
+    return re.findall(r"\w+", text.lower())
+
+
+@dataclasses.dataclass
+class ChangelogSearchResult:
+    """A changelog entry that matches a query to the #ChangelogSearchIndex."""
+
+    #: The name of the changelog file that contains the entry.
+    filename: str
+
+    #: The version of the changelog, or `None` for the unreleased changelog.
+    version: str | None
+
+    #: The release date of the changelog in ISO format, if any.
+    release_date: str | None
+
+    #: The matching entry.
+    entry: ChangelogEntry
+
+
+class ChangelogSearchIndex:
+    """An inverted index over the entries of the changelogs managed by a #ChangelogManager. Each entry is indexed by
+    its type, authors, issue and pull request URLs (and numbers) and the words in its description.
+
+    The index is stored per changelog file in the #ChangelogManager.index_cache, together with the entries of the
+    file, so that queries do not need to load any changelogs. Files are re-indexed when their hash in the
+    #ChangelogManager.index() changes.
+    """
+
+    #: The version of the format of the stored index. Indexes stored with a different version are discarded.
+    VERSION: t.ClassVar[int] = 1
+
+    def __init__(self, manager: ChangelogManager) -> None:
+        self.manager = manager
+        self._files: dict[str, dict[str, t.Any]] | None = None
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(directory="{self.manager.directory}")'
+
+    def update(self) -> None:
+        """Load the index from the cache and re-index all changelog files that were added or changed since it was
+        stored. This is called automatically by #search()."""
+
+        manager = self.manager
+        cache_key = "search-" + hashlib.sha256(str(manager.directory.resolve()).encode()).hexdigest()[:32]
+        data = manager.index_cache.get(cache_key) if manager.index_cache else None
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            data = {"version": self.VERSION, "files": {}}
+
+        cached: dict[str, dict[str, t.Any]] = data["files"]
+        files: dict[str, dict[str, t.Any]] = {}
+        for filename, index_entry in manager.index().items():
+            file_data = cached.get(filename)
+            if file_data is None or file_data.get("hash") != index_entry.hash:
+                file_data = self._index_file(filename, index_entry)
+            files[filename] = file_data
+
+        if manager.index_cache and files != cached:
+            manager.index_cache.put(cache_key, {"version": self.VERSION, "files": files})
+        self._files = files
+
+    def _index_file(self, filename: str, index_entry: ChangelogIndexEntry) -> dict[str, t.Any]:
+        import tomli
+        from databind.core.converter import ConversionError
+
+        path = self.manager.directory / filename
+        try:
+            changelog = self.manager.load(path)
+        except (OSError, ValueError, tomli.TOMLDecodeError, ConversionError) as exc:
+            logger.warning("Unable to index changelog <val>%s</val>: %s", path, exc)
+            changelog = Changelog()
+
+        postings: dict[str, list[int]] = {}
+        for index, entry in enumerate(changelog.entries):
+            for term in _get_search_terms(entry):
+                postings.setdefault(term, []).append(index)
+
+        return {
+            "hash": index_entry.hash,
+            "version": index_entry.version,
+            "release_date": index_entry.release_date,
+            "entries": [_dump_entry_fast(entry) for entry in changelog.entries],
+            "postings": postings,
+        }
+
+    @staticmethod
+    def parse_query(query: t.Sequence[str]) -> tuple[list[str], str | None]:
+        """Parse the words of a *query* into the terms to search for and the value of the `since` field, if any. A
+        word in the form `field:value`, where the field is one of #SEARCH_FIELDS, matches entries with that value in
+        the field. Any other word matches entries with that word in their description. Raises a #ValueError if the
+        query contains no terms."""
+
+        terms = []
+        since = None
+        for word in query:
+            field, sep, value = word.partition(":")
+            if sep and field == "since":
+                since = value
+            elif sep and field in SEARCH_FIELDS:
+                value = value.lower()
+                if field == "author":
+                    value = value.lstrip("@")
+                elif field in ("issue", "pr"):
+                    value = value.rstrip("/").lstrip("#")
+                terms.append(f"{field}:{value}")
+            else:
+                terms += ["word:" + token for token in _tokenize(word)]
+        if not terms and since is None:
+            raise ValueError("empty query")
+        return terms, since
+
+    def search(self, query: t.Sequence[str]) -> list[ChangelogSearchResult]:
+        """Return all entries that match every word in the *query* (see #parse_query()), in the order of
+        #ChangelogManager.all(). With a `since:<version>` word, only entries that were released in or after the given
+        version or that are unreleased are returned."""
+
+        terms, since = self.parse_query(query)
+        if self._files is None:
+            self.update()
+        assert self._files is not None
+
+        since_version = None
+        if since is not None:
+            from poetry.core.constraints.version import Version
+
+            since_version = Version.parse(since)
+
+        results = []
+        for filename, file_data in self._files.items():
+            postings = file_data["postings"]
+            if terms:
+                if not all(term in postings for term in terms):
+                    continue
+                indices = sorted(set.intersection(*(set(postings[term]) for term in terms)))
+            else:
+                indices = list(range(len(file_data["entries"])))
+            if not indices:
+                continue
+            if since_version is not None and file_data["version"] is not None:
+                from poetry.core.constraints.version import Version
+
+                if Version.parse(file_data["version"]) < since_version:
+                    continue
+            for index in indices:
+                entry = ChangelogEntry(**file_data["entries"][index])
+                results.append(ChangelogSearchResult(filename, file_data["version"], file_data["release_date"], entry))
+        return results
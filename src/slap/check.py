@@ -4,9 +4,11 @@ import dataclasses
 import enum
 import inspect
 import typing as t
+from pathlib import Path
 
 if t.TYPE_CHECKING:
     from slap.application import Application
+    from slap.configuration import Configuration
     from slap.project import Project
 
 
@@ -101,3 +103,16 @@ def get_checks(obj: t.Any, subject: t.Union[Application, Project]) -> t.Iterable
         check_type = getattr(value, "__check_type__", None)
         if check_type is type(subject):
             yield value(subject)
+
+
+def get_configuration_files(*configurations: Configuration) -> list[Path]:
+    """Return the `pyproject.toml` and `slap.toml` files of the given configurations that exist. This is useful to
+    implement #CheckPlugin.get_project_check_inputs() for checks that depend on the configuration."""
+
+    files = [
+        path
+        for configuration in configurations
+        for path in (configuration.pyproject_toml.path, configuration.slap_toml.path)
+        if path.is_file()
+    ]
+    return list(dict.fromkeys(files))
@@ -35,12 +35,22 @@ class Configuration:
     raw_config: Once[dict[str, t.Any]]
 
     def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.reload()
+
+    def reload(self) -> None:
+        """Discard the cached configuration, causing it to be read from the configuration files again on the next
+        access. Subclasses reset the values that are derived from the configuration as well."""
+
         from nr.util.functional import Once
 
-        self.directory = directory
-        self.pyproject_toml = TomlFile(directory / "pyproject.toml")
-        self.slap_toml = TomlFile(directory / "slap.toml")
-        self.raw_config = Once(self.get_raw_configuration)
+        from slap.util.profiling import traced
+
+        self.pyproject_toml = TomlFile(self.directory / "pyproject.toml")
+        self.slap_toml = TomlFile(self.directory / "slap.toml")
+        self.raw_config = Once(
+            traced(self.get_raw_configuration, "Configuration.raw_config", "config", directory=str(self.directory))
+        )
 
     def __repr__(self) -> str:
         return f'{type(self).__name__}(directory="{self.directory}")'
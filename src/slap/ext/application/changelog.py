@@ -1,7 +1,9 @@
+import contextlib
 import dataclasses
 import io
 import logging
 import re
+import shutil
 import sys
 import typing as t
 from pathlib import Path
@@ -10,9 +12,10 @@ from databind.core.settings import Alias, ExtraKeys
 
 from slap.application import Application, Command, argument, option
 from slap.changelog import Changelog, ChangelogEntry, ChangelogManager, ManagedChangelog
+from slap.configuration import Configuration
 from slap.plugins import ApplicationPlugin, RepositoryCIPlugin
 from slap.project import Project
-from slap.repository import Issue, PullRequest, Repository
+from slap.repository import Repository
 from slap.util.pygments import toml_highlight
 from slap.util.vcs import Vcs
 
@@ -249,6 +252,7 @@ class ChangelogDiffBaseCommand(Command):
         self.base_ref: str
         self.head_ref: str | None
         self.vcs: Vcs
+        self._contents: dict[tuple[str, Path], bytes | None] = {}
 
     def validate_arguments(self) -> None:
         """Validates the arguments to the command to populates relevant attributes."""
@@ -290,6 +294,17 @@ class ChangelogDiffBaseCommand(Command):
             sys.exit(1)
         self.vcs = vcs
 
+        # Fetch the unreleased changelogs of all managers in bulk, instead of one at a time in #get_diff().
+        paths = [manager.unreleased().path for manager in self.managers.values()]
+        for revision in filter(None, (self.base_ref, self.head_ref)):
+            for path, data in self.vcs.get_files_contents(paths, revision).items():
+                self._contents[(revision, path)] = data
+
+    def _get_file_contents(self, path: Path, revision: str) -> bytes | None:
+        if (revision, path) in self._contents:
+            return self._contents[(revision, path)]
+        return self.vcs.get_file_contents(path, revision)
+
     def get_diff(self, manager: ChangelogManager) -> ChangelogDiff:
         """Calculates the difference in the unreleased changelogs for the given changelog manager."""
 
@@ -297,14 +312,14 @@ class ChangelogDiffBaseCommand(Command):
 
         # Load the old changelog contents.
         old_changelog: Changelog | None = None
-        old_data = self.vcs.get_file_contents(changelog_path, self.base_ref)
+        old_data = self._get_file_contents(changelog_path, self.base_ref)
         if old_data is not None:
             old_changelog = manager.load(io.StringIO(old_data.decode()))
 
         # Load the new changelog contents.
         new_changelog: Changelog | None = None
         if self.head_ref:
-            new_data = self.vcs.get_file_contents(changelog_path, self.head_ref)
+            new_data = self._get_file_contents(changelog_path, self.head_ref)
             if new_data is not None:
                 new_changelog = manager.load(io.StringIO(new_data.decode()))
         elif changelog_path.is_file():
@@ -468,12 +483,14 @@ class ChangelogFormatCommand(BaseChangelogCommand):
         else:
             changelogs = [self.manager.unreleased()]
 
+        # Render release by release, discarding each changelog's content once it was written.
         for changelog in changelogs:
             if self.option("markdown"):
                 self._render_markdown(changelog)
             else:
                 self._render_terminal(changelog)
             self.line("")
+            changelog.unload()
 
         return 0
 
@@ -498,41 +515,208 @@ class ChangelogFormatCommand(BaseChangelogCommand):
             self.line(f"  <fg=cyan;options=italic>{entry.type}</fg> — {description} (<fg=yellow>{entry.author}</fg>)")
 
     def _render_markdown(self, changelog: ManagedChangelog) -> None:
-        if changelog.version:
-            assert changelog.content.release_date
-            print(f"## {changelog.version} ({changelog.content.release_date})")
-        else:
-            print("## Unreleased")
-            if not changelog.exists():
-                return
+        from slap.ext.changelog_renderers import MarkdownChangelogRenderer
 
-        print()
-        print("<table><tr><th>Type</th><th>Description</th><th>PR</th><th>Issues</th><th>Author</th></tr>")
-        for entry in changelog.content.entries:
-            pr_link = self._html_anchor("pr", entry.pr) if entry.pr else ""
-            issues = ", ".join(self._html_anchor("issue", issue) for issue in entry.issues) if entry.issues else ""
-            print(
-                f"  <tr><td>{entry.type.capitalize()}</td><td>\n\n{entry.description}</td>"
-                f'<td>{pr_link}</td><td>{issues}</td><td>{", ".join(entry.get_authors())}</td></tr>'
-            )
-        print("</table>")
+        sys.stdout.write(MarkdownChangelogRenderer().render_release(self.manager, changelog))
 
-    def _html_anchor(self, type: t.Literal["pr", "issue"], ref: str) -> str:
-        if self.manager.repository_host:
-            try:
-                if type == "pr":
-                    item: Issue | PullRequest = self.manager.repository_host.get_pull_request_by_reference(ref)
+
+class ChangelogExportCommand(BaseChangelogCommand):
+    """Export the changelogs of all releases, e.g. to publish the full history on a documentation site.
+
+    Releases are rendered one at a time and written to the output in buffered chunks. When writing to a file, the
+    file is replaced atomically once the export is complete. Renderers for the <u>markdown</u>, <u>html</u> and
+    <u>json</u> formats are built in; additional formats can be provided by plugins of the
+    <u>slap.plugins.changelog_renderer</u> entrypoint group.
+
+    With <opt>--incremental, -i</opt>, the rendered releases are cached in <u>.slap/cache/changelog-export/</u> and
+    only releases whose changelog file changed since the last export are rendered again.
+    """
+
+    name = "changelog export"
+    options = [
+        option(
+            "--format",
+            "-f",
+            description="The output format (<u>markdown</u>, <u>html</u>, <u>json</u> or the name of a renderer "
+            "plugin).",
+            flag=False,
+            default="markdown",
+        ),
+        option(
+            "--output",
+            "-o",
+            description="The file to write the export to. Defaults to stdout.",
+            flag=False,
+        ),
+        option(
+            "--incremental",
+            "-i",
+            description="Only render releases whose changelog file changed since the last export.",
+        ),
+    ]
+
+    #: The buffer size in bytes for writing the output file.
+    BUFFER_SIZE = 64 * 1024
+
+    def handle(self) -> int:
+        import hashlib
+
+        from nr.util.plugins import NoSuchEntrypointError, load_entrypoint
+
+        from slap.plugins import ChangelogRendererPlugin
+        from slap.util.cache import DirectoryCache
+
+        format_name: str = self.option("format")
+        try:
+            renderer = load_entrypoint(ChangelogRendererPlugin, format_name)()  # type: ignore[type-abstract]
+        except NoSuchEntrypointError:
+            self.line_error(f'error: unknown <opt>--format, -f</opt>: "{format_name}"', "error")
+            return 1
+
+        # The rendered releases of an export are cached in a single entry, keyed by everything they depend on.
+        cache = DirectoryCache(self.app.repository.directory / ".slap" / "cache" / "changelog-export")
+        cache_key = hashlib.sha256(
+            "\0".join(
+                [
+                    format_name,
+                    str(renderer.version),
+                    str(self.manager.directory.resolve()),
+                    repr(self.manager.repository_host),
+                ]
+            ).encode()
+        ).hexdigest()
+        cached: dict[str, list[str]] = (cache.get(cache_key) or {}) if self.option("incremental") else {}
+        rendered: dict[str, list[str]] = {}
+        changelogs = self.manager.all()
+
+        output: str | None = self.option("output")
+        with _open_output(Path(output) if output else None, self.BUFFER_SIZE) as fp:
+            fp.write(renderer.begin(self.manager))
+            for index, changelog in enumerate(changelogs):
+                if index:
+                    fp.write(renderer.separator)
+                digest = changelog.index.hash if changelog.index else ""
+                previous = cached.get(changelog.path.name)
+                if previous and digest and previous[0] == digest:
+                    text = previous[1]
                 else:
-                    item = self.manager.repository_host.get_issue_by_reference(ref)
-            except ValueError as exc:
-                self.line_error(f"warning: {exc}", "error")
-                url = ref
-                text = "Link"
-            else:
-                url, text = item.url, item.id
-            return f'<a href="{url}">{text}</a>'
-        else:
-            return ref
+                    text = renderer.render_release(self.manager, changelog)
+                    changelog.unload()
+                rendered[changelog.path.name] = [digest, text]
+                fp.write(text)
+            fp.write(renderer.end(self.manager))
+
+        if self.option("incremental"):
+            cache.put(cache_key, rendered)
+
+        if output:
+            reused = sum(1 for name, value in rendered.items() if cached.get(name) == value)
+            self.line(
+                f"exported <b>{len(changelogs)}</b> release(s) to <u>{output}</u> "
+                f"(<b>{len(changelogs) - reused}</b> rendered, <b>{reused}</b> unchanged)"
+            )
+
+        return 0
+
+
+@contextlib.contextmanager
+def _open_output(path: Path | None, buffer_size: int) -> t.Iterator[t.TextIO]:
+    """Internal. Open a temporary file next to *path* for writing and move it into place when the context exits
+    without an error, or yield stdout if *path* is `None`."""
+
+    if path is None:
+        yield sys.stdout
+        sys.stdout.flush()
+        return
+
+    import os
+    import secrets
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # NOTE: Unlike tempfile.mkstemp(), which creates the file with mode 0600, open() applies the umask, so a new
+    #       export is readable by the same users as any other file created by the user.
+    tmpname = path.parent / f".{path.name}.{secrets.token_hex(8)}.tmp"
+    fp = open(tmpname, "x", buffering=buffer_size, encoding="utf-8")
+    try:
+        with fp:
+            yield fp
+        if path.exists():
+            shutil.copymode(path, tmpname)
+        os.replace(tmpname, path)
+    except BaseException:
+        os.unlink(tmpname)
+        raise
+
+
+class ChangelogSearchCommand(Command):
+    """Search the changelog entries of all projects in the repository.
+
+    An entry must match every word of the query. A word in the form <u>field:value</u> matches entries by their
+    <u>type</u>, <u>author</u>, <u>issue</u> or <u>pr</u> (issues and pull requests can be given as URL or as number).
+    Any other word matches entries that contain the word in their description. With <u>since:VERSION</u>, only entries
+    that were released in or after the given version or that are not released yet are shown.
+
+    <b>Example:</b>
+
+      $ slap changelog search issue:123
+      $ slap changelog search "type:breaking change" author:@alice since:3.0
+
+    The search index is stored in <u>.slap/cache/changelogs/</u> and updated for the changelog files that changed
+    since the last search.
+    """
+
+    name = "changelog search"
+    arguments = [
+        argument("query", "The words to search for.", multiple=True),
+    ]
+
+    def __init__(self, app: Application) -> None:
+        super().__init__()
+        self.app = app
+
+    def handle(self) -> int:
+        import itertools
+        import time
+
+        from slap.changelog import ChangelogSearchIndex, ChangelogSearchResult
+
+        managers: dict[Path, tuple[Configuration, ChangelogManager]] = {}
+        for config in self.app.configurations():
+            manager = get_changelog_manager(self.app.repository, config if isinstance(config, Project) else None)
+            if manager.directory.is_dir():
+                managers.setdefault(manager.directory, (config, manager))
+
+        tstart = time.perf_counter()
+        results: list[tuple[Configuration, ChangelogSearchResult]] = []
+        try:
+            for config, manager in managers.values():
+                results += ((config, result) for result in ChangelogSearchIndex(manager).search(self.argument("query")))
+        except ValueError as exc:
+            self.line_error(f"error: {exc}", "error")
+            return 1
+        logger.debug(
+            "Searched %d changelog director(ies) in %.1fms", len(managers), (time.perf_counter() - tstart) * 1e3
+        )
+
+        if not results:
+            self.line_error("no matching changelog entries", "error")
+            return 1
+
+        for (config, filename), group in itertools.groupby(results, key=lambda x: (x[0], x[1].filename)):
+            items = list(group)
+            prefix = f"{config.id} " if isinstance(config, Project) and len(managers) > 1 else ""
+            header = f"<b>{prefix}{items[0][1].version or 'Unreleased'}</b>"
+            if items[0][1].release_date:
+                header += f" (<u>{items[0][1].release_date}</u>)"
+            self.line(header)
+            for _, result in items:
+                entry = result.entry
+                description = re.sub(r"(?!<\\)`([^`]+)`", r"<fg=dark_gray>\1</fg>", entry.description)
+                authors = ", ".join(entry.get_authors())
+                self.line(f"  <fg=cyan;options=italic>{entry.type}</fg> — {description} (<fg=yellow>{authors}</fg>)")
+
+        return 0
 
 
 class ChangelogConvertCommand(BaseChangelogCommand):
@@ -587,12 +771,13 @@ class ChangelogConvertCommand(BaseChangelogCommand):
 
         directory = self.option("directory") or self.manager.directory
         has_failures = False
+        converted: list[tuple[ManagedChangelog, Changelog]] = []
         for filename in directory.iterdir():
             if has_failures and self.option("fail-fast"):
                 break
             if filename.suffix in (".yaml", ".yml"):
                 try:
-                    self._convert_changelog(author, filename)
+                    converted.append(self._convert_changelog(author, filename))
                 except yaml.error.YAMLError as exc:
                     has_failures = True
                     self.line_error(f'warn: cannot parse "{filename}": {exc}', "warning")
@@ -606,9 +791,18 @@ class ChangelogConvertCommand(BaseChangelogCommand):
                         self.line_error(traceback.format_exc())
                     continue
 
+        self._resolve_authors([changelog for _, changelog in converted])
+
+        for dest, changelog in converted:
+            if self.option("dry"):
+                self.io.write_line(f"<fg=cyan;options=underline># {dest.path}</fg>")
+                print(toml_highlight(self.manager.deser.dump(changelog)))
+            else:
+                dest.save(changelog)
+
         return 1 if has_failures else 0
 
-    def _convert_changelog(self, default_author: str, source: Path) -> None:
+    def _convert_changelog(self, default_author: str, source: Path) -> tuple[ManagedChangelog, Changelog]:
         import datetime
 
         import yaml
@@ -645,12 +839,27 @@ class ChangelogConvertCommand(BaseChangelogCommand):
             datetime.datetime.strptime(data["release_date"], "%Y-%m-%d").date() if data.get("release_date") else None
         )
         changelog.entries = entries
+        return dest, changelog
 
-        if self.option("dry"):
-            self.io.write_line(f"<fg=cyan;options=underline># {dest.path}</fg>")
-            print(toml_highlight(self.manager.deser.dump(changelog)))
-        else:
-            dest.save(changelog)
+    def _resolve_authors(self, changelogs: list[Changelog]) -> None:
+        """Internal. Replaces authors that are email addresses with the username on the repository host, looking up
+        all distinct email addresses of all converted changelogs at once."""
+
+        host = self.manager.repository_host
+        entries = [entry for changelog in changelogs for entry in changelog.entries]
+        emails = [entry.author for entry in entries if entry.author and "@" in entry.author[1:]]
+        if not host or not emails:
+            return
+
+        try:
+            usernames = host.get_usernames_by_email(emails)
+        except Exception as exc:
+            logger.warning(f"unable to resolve usernames, keeping email addresses as authors. (reason: {exc})")
+            return
+
+        for entry in entries:
+            if entry.author:
+                entry.author = usernames.get(entry.author) or entry.author
 
     def _match_author_in_description(self, description: str) -> tuple[str | None, str]:
         """Internal. Tries to find the @Author at the end of a changelog entry description."""
@@ -670,6 +879,8 @@ class ChangelogCommandPlugin(ApplicationPlugin):
         app.cleo.add(ChangelogDiffUpdatePrCommand(app))
         app.cleo.add(ChangelogDiffAssertCommand(app))
         app.cleo.add(ChangelogFormatCommand(app, config))
+        app.cleo.add(ChangelogExportCommand(app, config))
+        app.cleo.add(ChangelogSearchCommand(app))
         app.cleo.add(ChangelogConvertCommand(app, config))
 
 
@@ -680,9 +891,12 @@ def get_changelog_manager(repository: Repository, project: Project | None) -> Ch
     if config.enabled is None and project:
         config.enabled = project.is_python_project
 
+    from slap.util.cache import DirectoryCache
+
     return ChangelogManager(
         directory=(project or repository).directory / config.directory,
         repository_host=repository.host(),
         valid_types=config.valid_types,
         readonly=not config.enabled,
+        index_cache=DirectoryCache(repository.directory / ".slap" / "cache" / "changelogs"),
     )
@@ -1,14 +1,20 @@
 import collections
 import dataclasses
 import logging
+import os
+import threading
+import time
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
 
 from nr.util.plugins import load_entrypoint
 
+from slap import __version__
 from slap.application import Application, Command, option
 from slap.check import Check, CheckResult
 from slap.plugins import ApplicationPlugin, CheckPlugin
 from slap.project import Project
+from slap.util.cache import DirectoryCache, fingerprint
 
 logger = logging.getLogger(__name__)
 DEFAULT_PLUGINS = ["changelog", "general", "poetry", "release"]
@@ -20,6 +26,10 @@ COLORS = {
     Check.Result.SKIPPED: "light_gray",
 }
 
+#: A list of checks, each with a flag whether its result was loaded from the cache, and the number of seconds that
+#: each plugin took to produce the checks that were not cached.
+CheckResults = tuple[list[tuple[Check, bool]], dict[str, float]]
+
 
 @dataclasses.dataclass
 class CheckConfig:
@@ -28,7 +38,10 @@ class CheckConfig:
 
 
 class CheckCommandPlugin(Command, ApplicationPlugin):
-    """Run sanity checks on your Python project."""
+    """Run sanity checks on your Python project.
+
+    With <opt>-v,--verbose</opt>, the time that each plugin took to produce its checks is printed after the checks of
+    every project. The time is measured per plugin because plugins may compute all of their checks at once."""
 
     app: Application
     config: dict[Project, CheckConfig]
@@ -37,18 +50,38 @@ class CheckCommandPlugin(Command, ApplicationPlugin):
     options = [
         option(
             "--show-skipped",
-            description="Show skipped checks.",
+            description="Show skipped checks and mark the results that were taken from the cache.",
         ),
         option(
             "--warnings-as-errors",
             "w",
             description="Treat warnings as errors.",
         ),
+        option(
+            "--changed-since",
+            description="Only check the projects that changed since the given revision, and the projects that depend "
+            "on them. Changes are determined relative to the merge-base of the revision and the "
+            "current commit.",
+            flag=False,
+        ),
+        option(
+            "--jobs",
+            "-j",
+            description="The number of projects to check concurrently. Defaults to the number of CPUs. The results are "
+            "always printed in the same order.",
+            flag=False,
+        ),
+        option(
+            "--no-cache",
+            description="Run all checks, even if the results of a previous run are cached.",
+        ),
     ]
 
     def __init__(self, app: Application) -> None:
         Command.__init__(self)
         ApplicationPlugin.__init__(self, app)
+        self._plugins: dict[str, type[CheckPlugin]] = {}
+        self._plugins_lock = threading.Lock()
 
     def load_configuration(self, app: "Application") -> dict[Project, CheckConfig]:
         import databind.json
@@ -65,15 +98,62 @@ class CheckCommandPlugin(Command, ApplicationPlugin):
         app.cleo.add(self)
 
     def handle(self) -> int:
+        try:
+            jobs = int(self.option("jobs") or os.cpu_count() or 1)
+            if jobs < 1:
+                raise ValueError
+        except ValueError:
+            self.line_error(f'error: invalid value for <opt>-j,--jobs</opt>: "{self.option("jobs")}"', "error")
+            return 1
+
+        self._cache = DirectoryCache(self.app.repository.directory / ".slap" / "cache" / "checks")
+        try:
+            projects = [
+                project
+                for project in self.app.get_target_projects(changed_since=self.option("changed-since"))
+                if project.is_python_project
+            ]
+        except ValueError as exc:
+            self.line_error(f"error: {exc}", "error")
+            return 1
+
         counter: t.MutableMapping[CheckResult, int] = collections.defaultdict(int)
         if self.app.repository.is_monorepo:
-            for check in self._run_application_checks():
-                counter[check.result] += 1
-        for project in self.app.get_target_projects():
-            if not project.is_python_project:
-                continue
-            for check in self._run_project_checks(project):
+            checks, timings = self._get_application_checks()
+            for check, _ in checks:
                 counter[check.result] += 1
+            if checks:
+                self.line("Global checks:")
+                self._print_checks(checks, timings)
+                self.line("")
+
+        # Populate the lazily computed values of the repository and its projects that plugins commonly access before
+        # checking projects concurrently, as #nr.util.functional.Once is not thread-safe. Checks of one project may
+        # also access the values of other projects (e.g. to resolve interdependencies), hence we populate all of them.
+        self.app.repository.vcs()
+        self.app.repository.host()
+        if jobs > 1:
+            for project in self.app.repository.projects():
+                if project.is_python_project:
+                    project.dist_name()
+                    project.version()
+                    project.dependencies()
+                    project.readme()
+                    project.packages()
+
+        # Results are printed in the order of the projects, each as soon as it and all projects before it are done.
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(self._get_project_checks, project) for project in projects]
+            for project, future in zip(projects, futures):
+                checks, timings = future.result()
+                for check, _ in checks:
+                    counter[check.result] += 1
+                if checks:
+                    if self.app.repository.is_monorepo:
+                        self.line(f"Checks for project <info>{project.id}</info>")
+                        self.line("")
+                    self._print_checks(checks, timings)
+                    self.line("")
 
         if self.option("warnings-as-errors") and counter.get(Check.WARNING, 0) > 0:
             exit_code = 1
@@ -93,78 +173,133 @@ class CheckCommandPlugin(Command, ApplicationPlugin):
 
         return exit_code
 
-    def _print_checks(self, checks: t.Sequence[Check]) -> None:
-        max_w = max(len(c.name) for c in checks)
-        for check in checks:
+    def _print_checks(self, checks: t.Sequence[tuple[Check, bool]], timings: t.Mapping[str, float]) -> None:
+        max_w = max(len(c.name) for c, _ in checks)
+        for check, cached in checks:
             if not self.option("show-skipped") and check.result == Check.SKIPPED:
                 continue
 
+            # Write every check with a single call, so that it is not interrupted by log output from other threads.
             color = COLORS[check.result]
-            self.io.write(
-                f"  <b>{check.name.ljust(max_w)}</b>  <fg={color};options=bold>{check.result.name.ljust(14)}</fg>"
-            )
+            text = f"  <b>{check.name.ljust(max_w)}</b>  <fg={color};options=bold>{check.result.name.ljust(14)}</fg>"
             if check.description:
-                self.io.write(f" — {check.description}")
-            self.io.write("\n")
-
+                text += f" — {check.description}"
+            if cached and (self.option("show-skipped") or self.io.is_verbose()):
+                text += " <fg=dark_gray>(cached)</fg>"
+            text += "\n"
             if check.details:
-                for line in check.details.splitlines():
-                    self.io.write_line(f"    {line}")
+                text += "".join(f"    {line}\n" for line in check.details.splitlines())
+            self.io.write(text)
 
-    def _run_project_checks(self, project: Project) -> t.Iterator[Check]:
-        checks = []
+        if timings and self.io.is_verbose():
+            text = ", ".join(f"{name} {duration:.2f}s" for name, duration in sorted(timings.items()))
+            self.io.write(f"  <fg=dark_gray>(time per plugin: {text})</fg>\n")
+
+    def _get_plugin(self, plugin_name: str) -> CheckPlugin:
+        """Create an instance of the check plugin with the given name. The entrypoint is loaded only once per run, but
+        every caller gets a new instance because plugins may keep state while producing their checks."""
+
+        with self._plugins_lock:
+            if plugin_name not in self._plugins:
+                self._plugins[plugin_name] = load_entrypoint(CheckPlugin, plugin_name)  # type: ignore[misc]
+            plugin_type = self._plugins[plugin_name]
+        return plugin_type()
+
+    def _collect_checks(
+        self, plugin_name: str, checks: t.Callable[[], t.Iterable[Check]], error_message: str, *args: t.Any
+    ) -> tuple[list[Check], float, bool]:
+        """Collect the checks returned by the *checks* function, sorted by name, along with the time it took to
+        produce all of them. An exception raised by the plugin is logged and turned into an error check. The third
+        element of the returned tuple is `False` in that case."""
+
+        result: list[Check] = []
+        success = True
+        tstart = time.perf_counter()
+        try:
+            for check in checks():
+                check.name = f"{plugin_name}:{check.name}"
+                result.append(check)
+        except Exception as exc:
+            logger.exception(error_message, *args)
+            result.append(Check(f"{plugin_name}", CheckResult.ERROR, str(exc)))
+            success = False
+        return sorted(result, key=lambda x: x.name), time.perf_counter() - tstart, success
+
+    def _get_cache_key(self, plugin_name: str, plugin: CheckPlugin, project: Project) -> str | None:
+        """Return the key under which the results of the project checks of the *plugin* are cached, or `None` if the
+        plugin does not declare the inputs of its checks."""
+
+        try:
+            inputs = plugin.get_project_check_inputs(project)
+            if inputs is None:
+                return None
+            plugin_type = f"{type(plugin).__module__}.{type(plugin).__qualname__}"
+            return fingerprint(__version__, plugin_name, plugin_type, str(project.directory.resolve()), files=inputs)
+        except Exception:
+            logger.exception("Could not determine the check inputs of plugin <val>%s</val>", plugin_name)
+            return None
+
+    def _run_project_checks(
+        self, plugin_name: str, plugin: CheckPlugin, project: Project
+    ) -> tuple[list[Check], float | None]:
+        """Run the project checks of the *plugin*, or load their results from the cache if the plugin declares the
+        inputs of its checks and none of them changed. Returns the checks and the time it took to produce them, which
+        is `None` if the results were loaded from the cache."""
+
+        key = self._get_cache_key(plugin_name, plugin, project)
+        if key is not None and not self.option("no-cache"):
+            entry = self._cache.get(key)
+            if entry is not None:
+                logger.debug(
+                    "Using cached results of plugin <val>%s</val> for project <subj>%s</subj>", plugin_name, project
+                )
+                return [
+                    Check(name, CheckResult[result], description, details)
+                    for name, result, description, details in entry
+                ], None
+
+        checks, duration, success = self._collect_checks(
+            plugin_name,
+            lambda: plugin.get_project_checks(project),
+            "Uncaught exception in project <subj>%s</subj> project checks for plugin <val>%s</val>",
+            project,
+            plugin_name,
+        )
+        if key is not None and success:
+            self._cache.put(key, [[c.name, c.result.name, c.description, c.details] for c in checks])
+        return checks, duration
+
+    def _get_project_checks(self, project: Project) -> CheckResults:
+        checks: list[tuple[Check, bool]] = []
+        timings: dict[str, float] = {}
         for plugin_name in sorted(self.config[project].plugins):
-            plugin = load_entrypoint(CheckPlugin, plugin_name)()
-            try:
-                for check in sorted(plugin.get_project_checks(project), key=lambda c: c.name):
-                    check.name = f"{plugin_name}:{check.name}"
-                    yield check
-                    checks.append(check)
-            except Exception as exc:
-                logger.exception(
-                    "Uncaught exception in project <subj>%s</subj> application checks for plugin <val>%s</val>",
-                    project,
+            plugin = self._get_plugin(plugin_name)
+            project_checks, duration = self._run_project_checks(plugin_name, plugin, project)
+            checks += ((check, duration is None) for check in project_checks)
+            if duration is not None:
+                timings[plugin_name] = duration
+            if not self.app.repository.is_monorepo:
+                application_checks, duration, _ = self._collect_checks(
+                    plugin_name,
+                    lambda: plugin.get_application_checks(self.app),
+                    "Uncaught exception in application checks for plugin <val>%s</val>",
                     plugin_name,
                 )
-                check = Check(f"{plugin_name}", CheckResult.ERROR, str(exc))
-                yield check
-                checks.append(check)
-            if not self.app.repository.is_monorepo:
-                try:
-                    for check in sorted(plugin.get_application_checks(self.app), key=lambda c: c.name):
-                        check.name = f"{plugin_name}:{check.name}"
-                        yield check
-                        checks.append(check)
-                except Exception as exc:
-                    logger.exception("Uncaught exception in project checks for plugin <val>%s</val>", plugin_name)
-                    check = Check(f"{plugin_name}", CheckResult.ERROR, str(exc))
-                    yield check
-                    checks.append(check)
-
-        if checks:
-            if self.app.repository.is_monorepo:
-                self.line(f"Checks for project <info>{project.id}</info>")
-                self.line("")
-            self._print_checks(checks)
-            self.line("")
+                checks += ((check, False) for check in application_checks)
+                timings[plugin_name] = timings.get(plugin_name, 0.0) + duration
+        return checks, timings
 
-    def _run_application_checks(self) -> t.Iterable[Check]:
+    def _get_application_checks(self) -> CheckResults:
         plugin_names = {p for project in self.app.get_target_projects() for p in self.config[project].plugins}
-        checks = []
+        checks: list[tuple[Check, bool]] = []
+        timings: dict[str, float] = {}
         for plugin_name in sorted(plugin_names):
-            plugin = load_entrypoint(CheckPlugin, plugin_name)()
-            try:
-                for check in sorted(plugin.get_application_checks(self.app), key=lambda c: c.name):
-                    check.name = f"{plugin_name}:{check.name}"
-                    yield check
-                    checks.append(check)
-            except Exception as exc:
-                logger.exception("Uncaught exception in application checks for plugin <val>%s</val>", plugin_name)
-                check = Check(f"{plugin_name}", CheckResult.ERROR, str(exc))
-                yield check
-                checks.append(check)
-
-        if checks:
-            self.line("Global checks:")
-            self._print_checks(checks)
-            self.line("")
+            plugin = self._get_plugin(plugin_name)
+            application_checks, timings[plugin_name], _ = self._collect_checks(
+                plugin_name,
+                lambda: plugin.get_application_checks(self.app),
+                "Uncaught exception in application checks for plugin <val>%s</val>",
+                plugin_name,
+            )
+            checks += ((check, False) for check in application_checks)
+        return checks, timings
@@ -0,0 +1,36 @@
+""" Commands to manage the snapshot of the trove classifiers that `slap check` validates classifiers against. """
+
+from __future__ import annotations
+
+from slap.application import Application, Command
+from slap.plugins import ApplicationPlugin
+
+
+class ClassifiersRefreshCommand(Command):
+    """Fetch the latest trove classifiers from PyPI and store them in the user's cache directory.
+
+    The classifiers are taken from the latest release of the <code>trove-classifiers</code> package. The refreshed
+    snapshot is used instead of the snapshot that is shipped with Slap for as long as it is the newer one."""
+
+    name = "classifiers refresh"
+
+    def handle(self) -> int:
+        from slap.util.external.pypi_classifiers import CACHE_FILENAME, refresh_classifiers
+
+        try:
+            database = refresh_classifiers()
+        except (OSError, ValueError) as exc:
+            self.line_error(f"error: could not refresh the classifiers: {exc}", "error")
+            return 1
+        self.line(
+            f"fetched <b>{len(database)}</b> classifiers (<opt>{database.source}</opt>) to <s>{CACHE_FILENAME}</s>"
+        )
+        return 0
+
+
+class ClassifiersPlugin(ApplicationPlugin):
+    def load_configuration(self, app: Application) -> None:
+        return None
+
+    def activate(self, app: Application, config: None) -> None:
+        app.cleo.add(ClassifiersRefreshCommand())
@@ -5,7 +5,7 @@ from typing import Iterable
 
 from slap.application import Application, Command, argument, option
 from slap.plugins import ApplicationPlugin
-from slap.util.external.licenses import get_spdx_license_details, wrap_license_text
+from slap.util.external.licenses import get_spdx_index, get_spdx_license_details, wrap_license_text
 from slap.util.vcs import get_git_author
 
 TEMPLATES = ["poetry", "github"]
@@ -27,6 +27,18 @@ def load_template(name: str) -> Iterable[tuple[str, str]]:
         yield str(filename.relative_to(path)), filename.read_text()
 
 
+def get_license_text(license_id: str) -> str:
+    """
+    Returns the text of the license with the given SPDX ID from the bundled SPDX license index. Licenses that
+    are newer than the index are fetched from spdx.org.
+    """
+
+    index = get_spdx_index()
+    if license_id in index:
+        return index.get_text(license_id)
+    return get_spdx_license_details(license_id).license_text
+
+
 class InitCommandPlugin(Command, ApplicationPlugin):
     """Bootstrap some files for a Python project.
 
@@ -126,7 +138,7 @@ class InitCommandPlugin(Command, ApplicationPlugin):
             )
         for filename, content in load_template(template):
             if filename == "LICENSE":
-                content = get_spdx_license_details(self.option("license")).license_text
+                content = get_license_text(self.option("license"))
                 content = wrap_license_text(content).replace("<year>", str(scope["year"]))
                 content = wrap_license_text(content).replace("<copyright holders>", scope["author_name"])
             else:
@@ -71,8 +71,19 @@ class PublishCommandPlugin(Command, ApplicationPlugin):
 
     def handle(self) -> int:
         from twine.commands.upload import upload
+        from twine.repository import Repository
         from twine.settings import Settings
 
+        from slap.util.http import get_http_client
+
+        class _Settings(Settings):
+            # Twine manages its own session with retries that are suitable for uploads; we only record its timings
+            # with the rest of Slap's HTTP requests.
+            def create_repository(self) -> Repository:
+                repository = super().create_repository()
+                get_http_client().instrument(repository.session)
+                return repository
+
         distributions: list[Path] = []
 
         with contextlib.ExitStack() as stack:
@@ -109,7 +120,7 @@ class PublishCommandPlugin(Command, ApplicationPlugin):
                 self.line("Publishing")
                 kwargs = {option.name.replace("-", "_"): self.option(option.name) for option in self.options}
                 kwargs["repository_name"] = kwargs.pop("repository")
-                settings = Settings(**kwargs)
+                settings = _Settings(**kwargs)
                 upload(settings, [str(d) for d in distributions])
 
         return 0
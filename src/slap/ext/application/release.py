@@ -3,6 +3,7 @@ from __future__ import annotations
 import dataclasses
 import subprocess
 import sys
+import threading
 import typing as t
 from pathlib import Path
 
@@ -12,6 +13,7 @@ from slap.application import Application, Command, argument, option
 from slap.configuration import Configuration
 from slap.plugins import ApplicationPlugin, ReleasePlugin, VersionIncrementingRulePlugin
 from slap.project import Project
+from slap.util.transaction import FileTransaction
 
 if t.TYPE_CHECKING:
     from poetry.core.constraints.version import Version  # type: ignore[import]
@@ -137,6 +139,15 @@ class ReleaseCommandPlugin(Command, ApplicationPlugin):
             "no-branch-check", None, "Do not validate the current Git branch matches the configured release branch."
         ),
         option("no-worktree-check", None, "Do not check the worktree state."),
+        option(
+            "jobs",
+            "j",
+            "The number of <opt>pre-commit</opt> hooks to run concurrently. Defaults to 1. When hooks run "
+            "concurrently, their output is captured and printed in order. If a hook fails, the hooks that did not "
+            "start yet are skipped.",
+            False,
+            default="1",
+        ),
     ]
 
     # TODO (@NiklasRosenstein): Support "git" rule for bumping versions
@@ -176,6 +187,12 @@ class ReleaseCommandPlugin(Command, ApplicationPlugin):
                 "error: <opt>--force</opt> can only be combined with <opt>--tag</opt> and <opt>--push</opt>", "error"
             )
             return 1
+        try:
+            if int(self.option("jobs")) < 1:
+                raise ValueError
+        except ValueError:
+            self.line_error(f'error: invalid value for <opt>-j,--jobs</opt>: "{self.option("jobs")}"', "error")
+            return 1
         if self.option("remote") is not None and not self.option("push"):
             self.line_error("error: <opt>--remote</opt> can only be combined with <opt>--push</opt>", "error")
             return 1
@@ -281,19 +298,24 @@ class ReleaseCommandPlugin(Command, ApplicationPlugin):
         if not self.is_git_repository or self.option("no-worktree-check"):
             return True
 
-        queried_files = {f.resolve() for f in required_files}
-        tracked_files = {Path(f).resolve() for f in self.git.get_files()}
-        if untracked_files := queried_files - tracked_files:
+        from slap.util.vcs import FileStatus, Git
+
+        vcs = self.app.repository.vcs()
+        if not isinstance(vcs, Git):
+            vcs = Git(Path.cwd())
+
+        # Only the queried files are resolved; the tracked files are already normalized paths relative to the root.
+        if untracked_files := sorted({f.resolve() for f in required_files if not vcs.is_tracked(f)}):
             self.line_error("error: some of the files with version references are not tracked by Git", "error")
             for fn in untracked_files:
                 self.line_error(f"  · {fn}", "error")
             return False
 
-        file_status = list(self.git.get_status())
-        if any(f.mode[1] != " " for f in file_status):
+        file_status = list(vcs.iter_changed_files())
+        if any(f.disk != FileStatus.NONE for f in file_status):
             self.line_error("error: found untracked changes in worktree", "error")
             return False
-        if any(f.mode[0] not in " ?" for f in file_status):
+        if any(f.staging not in (FileStatus.NONE, FileStatus.UNKNOWN) for f in file_status):
             self.line(
                 "<fg=yellow>found modified files in the staging area. these files will be committed into "
                 "the release tag.</fg>"
@@ -333,9 +355,13 @@ class ReleaseCommandPlugin(Command, ApplicationPlugin):
                 sys.exit(1)
             return plugin().increment_version(self._get_current_version(version_refs))
 
-    def _bump_version(self, version_refs: list[VersionRef], target_version: Version, dry: bool) -> list[Path]:
-        """Internal. Replaces the version reference in all files with the specified *version*."""
+    def _bump_version(
+        self, version_refs: list[VersionRef], target_version: Version, dry: bool, transaction: FileTransaction
+    ) -> list[Path]:
+        """Internal. Replaces the version reference in all files with the specified *version*. The files are written
+        atomically through the *transaction*, which also backs up the files that release plugins modify."""
 
+        from cleo.io.null_io import NullIO
         from nr.util import Stream
         from nr.util.text import substitute_ranges
 
@@ -348,21 +374,25 @@ class ReleaseCommandPlugin(Command, ApplicationPlugin):
 
         self._show_version_refs(version_refs, str(target_version))
         self.line("")
+        contents: dict[Path, str] = {}
         for filename, refs in Stream(version_refs).groupby(lambda r: r.file):
-            with open(filename) as fp:
-                content = fp.read()
-
-            content = substitute_ranges(
-                content,
+            contents[filename] = substitute_ranges(
+                self._scanner.read(filename),
                 ((ref.start, ref.end, str(target_version)) for ref in refs),
             )
-
             changed_files.append(filename)
-            if not dry:
-                with open(filename, "w") as fp:
-                    fp.write(content)
+
+        if not dry:
+            transaction.write_files(contents)
 
         for plugin in self._load_plugins(self.app.repository):
+            if not dry:
+                # Ask the plugin which files it would modify, to be able to restore them if a later step fails.
+                plugin.io = NullIO()
+                try:
+                    transaction.backup(plugin.create_release(self.app.repository, str(target_version), True))
+                finally:
+                    plugin.io = self.io
             try:
                 changed_files.extend(plugin.create_release(self.app.repository, str(target_version), dry))
             except BaseException:
@@ -371,13 +401,15 @@ class ReleaseCommandPlugin(Command, ApplicationPlugin):
 
         return changed_files
 
-    def _create_tag(self, target_version: str, changed_files: list[Path], dry: bool, force: bool) -> str:
-        """Internal. Used when --tag is specified to create a Git tag."""
+    def _create_tag(
+        self, target_version: str, changed_files: list[Path], dry: bool, force: bool, transaction: FileTransaction
+    ) -> str:
+        """Internal. Used when --tag is specified to create a Git tag. The *transaction* is committed once the
+        changed files have been committed to Git. If the commit fails, the changed files are removed from the index
+        again."""
 
         assert self.is_git_repository
 
-        # TODO (@NiklasRosenstein): If this step errors, revert the changes made by the command so far?
-
         config = self.config[self.app.repository]
 
         if "{version}" not in config.tag_format:
@@ -389,12 +421,79 @@ class ReleaseCommandPlugin(Command, ApplicationPlugin):
 
         if not dry:
             commit_message = config.commit_message.replace("{version}", str(target_version))
-            self.git.add([str(f) for f in changed_files])
-            self.git.commit(commit_message, allow_empty=True)
+            files = [str(f) for f in changed_files]
+            self.git.add(files)
+            try:
+                self.git.commit(commit_message, allow_empty=True)
+            except BaseException:
+                # Unstage the changed files, the caller rolls back the transaction to restore them on disk.
+                if files:
+                    self.git.reset(files=files, quiet=True)
+                raise
+            transaction.commit()
             self.git.tag(tag_name, force=force)
 
         return tag_name
 
+    def _run_pre_commit_hooks(self, jobs: int) -> None:
+        """Internal. Runs the `pre_commit` hooks of all configurations. With more than one job, the hooks run
+        concurrently and their output is captured and printed in order. If a hook fails, hooks that have not started
+        yet are skipped, the output of all hooks that ran is still printed, and a #subprocess.CalledProcessError is
+        raised for the first failed hook."""
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        from cleo.io.io import OutputType
+
+        hooks = [
+            (obj, config.pre_commit)
+            for obj, config in self.config.items()
+            if config.pre_commit and not (isinstance(obj, Project) and obj.directory == self.app.repository.directory)
+        ]
+        if not hooks:
+            return
+
+        self.line("")
+        if self.option("dry") or jobs == 1 or len(hooks) == 1:
+            for obj, command in hooks:
+                self.line(f"running <fg=cyan>$ {command}</fg> hook in <info>{obj.directory}</info>")
+                if not self.option("dry"):
+                    subprocess.run(command, shell=True, check=True, cwd=obj.directory)
+            return
+
+        failed = threading.Event()
+
+        def _run(directory: Path, command: str) -> subprocess.CompletedProcess[bytes] | None:
+            if failed.is_set():
+                return None
+            result = subprocess.run(
+                command, shell=True, cwd=directory, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+            )
+            if result.returncode != 0:
+                failed.set()
+            return result
+
+        error: subprocess.CalledProcessError | None = None
+        skipped = 0
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(_run, obj.directory, command) for obj, command in hooks]
+            for (obj, command), future in zip(hooks, futures):
+                result = future.result()
+                if result is None:
+                    skipped += 1
+                    continue
+                self.line(f"running <fg=cyan>$ {command}</fg> hook in <info>{obj.directory}</info>")
+                self.io.write(result.stdout.decode(errors="replace"), type=OutputType.RAW)
+                if result.returncode != 0:
+                    self.line_error(f"error: hook failed with exit code <b>{result.returncode}</b>", "error")
+                    if error is None:
+                        error = subprocess.CalledProcessError(result.returncode, command, result.stdout)
+
+        if skipped:
+            self.line_error(f"error: skipped <b>{skipped}</b> hook(s) that did not start before a hook failed", "error")
+        if error is not None:
+            raise error
+
     def _push_to_remote(self, tag_name: str, remote: str, dry: bool, force: bool) -> None:
         """Internal. Push the current branch and the tag to the remote repository. Use when `--push` is set."""
 
@@ -409,8 +508,16 @@ class ReleaseCommandPlugin(Command, ApplicationPlugin):
             self.git.push(remote, branch, tag_name, force=force)
 
     def _get_version_refs(self) -> list[VersionRef]:
-        """Extracts all version references in the projects controlled by the application and returns them."""
+        """Extracts all version references in the projects controlled by the application and returns them. Every file
+        is read only once; the contents are kept in #_scanner for #_bump_version()."""
 
+        from slap.release import VersionRefScanner
+
+        self._scanner = VersionRefScanner()
+        with self._scanner.activate():
+            return self._collect_version_refs()
+
+    def _collect_version_refs(self) -> list[VersionRef]:
         from slap.project import Project
         from slap.release import match_version_ref_pattern
 
@@ -481,26 +588,25 @@ class ReleaseCommandPlugin(Command, ApplicationPlugin):
             if self.option("dry"):
                 self.line_error("dry mode enabled, no changes will be committed to disk", "comment")
             target_version = self._get_new_version(version_refs, version)
-            changed_files = self._bump_version(version_refs, target_version, self.option("dry"))
+            jobs = int(self.option("jobs"))
 
-            run_once = False
-            for obj, config in self.config.items():
-                if isinstance(obj, Project) and obj.directory == self.app.repository.directory:
-                    continue
-                if config.pre_commit:
-                    if not run_once:
-                        self.line("")
-                        run_once = True
-                    self.line(f"running <fg=cyan>$ {config.pre_commit}</fg> hook in <info>{obj.directory}</info>")
-                    if not self.option("dry"):
-                        subprocess.run(config.pre_commit, shell=True, check=True, cwd=obj.directory)
-
-            if self.option("tag"):
-                tag_name = self._create_tag(
-                    str(target_version), changed_files, self.option("dry"), self.option("force")
-                )
-                if self.option("push"):
-                    self._push_to_remote(tag_name, self.option("remote"), self.option("dry"), self.option("force"))
+            transaction = FileTransaction()
+            try:
+                changed_files = self._bump_version(version_refs, target_version, self.option("dry"), transaction)
+                self._run_pre_commit_hooks(jobs)
+                tag_name = None
+                if self.option("tag"):
+                    tag_name = self._create_tag(
+                        str(target_version), changed_files, self.option("dry"), self.option("force"), transaction
+                    )
+            except BaseException:
+                if restored := transaction.rollback():
+                    self.line_error(f"error: release failed, restored <b>{len(restored)}</b> file(s)", "error")
+                raise
+            transaction.commit()
+
+            if tag_name is not None and self.option("push"):
+                self._push_to_remote(tag_name, self.option("remote"), self.option("dry"), self.option("force"))
 
         else:
             self.line_error(
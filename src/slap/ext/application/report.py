@@ -26,7 +26,11 @@ class ReportDependenciesCommand(VenvAwareCommand):
             description="A comma-separated list of extra dependencies to include.",
             flag=False,
         ),
-        option("with-license-text", description="Include license text in the output."),
+        option(
+            "with-license-text",
+            description="Include license text in the output, as well as the SPDX license ID that the license name "
+            "of the distribution corresponds to (if any).",
+        ),
     ]
 
     def handle(self) -> int:
@@ -64,10 +68,15 @@ class ReportDependenciesCommand(VenvAwareCommand):
         graph.sort()
         output = t.cast(dict[str, t.Any], databind.json.dump(graph, DistributionGraph))
 
-        # Retrieve the license text from the distributions.
+        # Retrieve the license text from the distributions and map the license name to an SPDX license ID.
         if self.option("with-license-text"):
+            from slap.util.external.licenses import get_spdx_index
+
+            spdx_index = get_spdx_index()
             for dist_name, dist_data in output["metadata"].items():
                 dist = dists_cache[dist_name]
+                license_name = dist_data.get("license_name")
+                dist_data["license_spdx_id"] = spdx_index.normalize(license_name) if license_name else None
                 dist_data["license_text"] = None
                 if dist is not None:
                     for filename in ("LICENSE", "LICENSE.txt", "LICENSE.text", "LICENSE.rst"):
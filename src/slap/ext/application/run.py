@@ -1,18 +1,33 @@
 from __future__ import annotations
 
+import dataclasses
 import logging
 import shlex
 import subprocess as sp
+import threading
+import time
 from pathlib import Path
 from typing import ClassVar
 
-from slap.application import Application, argument
+from slap.application import Application, argument, option
 from slap.ext.application.venv import VenvAwareCommand
 from slap.plugins import ApplicationPlugin
+from slap.project import Project
 
 logger = logging.getLogger(__name__)
 
 
+@dataclasses.dataclass
+class RunResult:
+    """The result of running a command in a project."""
+
+    #: The exit code of the command, or `None` if it was not run because of `--fail-fast`.
+    exit_code: int | None
+
+    #: The wall-clock time in seconds that the command took, or `None` if it was not run.
+    duration: float | None
+
+
 class RunCommandPlugin(VenvAwareCommand, ApplicationPlugin):
     """Run a command in the current active environment. If the command name is an alias
     configured in <code>[tool.slap.run]</code>, run it instead.
@@ -35,6 +50,40 @@ class RunCommandPlugin(VenvAwareCommand, ApplicationPlugin):
             multiple=True,
         )
     ]
+    options = VenvAwareCommand.options + [
+        option(
+            "--changed-since",
+            description="Only run the command in projects that changed since the given revision, and in the projects "
+            "that depend on them. Changes are determined relative to the merge-base of the revision and the "
+            "current commit.",
+            flag=False,
+        ),
+        option(
+            "--jobs",
+            "-j",
+            description="The number of projects to run the command in concurrently when it is run in multiple "
+            "projects. The output of concurrent commands is prefixed with the project ID.",
+            flag=False,
+            default="1",
+        ),
+        option(
+            "--fail-fast",
+            description="Stop running commands after the first one failed and terminate the ones that are still "
+            "running.",
+        ),
+        option(
+            "--json",
+            description="Write the exit code and duration of each command as JSON to the given file, or to stdout with "
+            "<code>--json=-</code>.",
+            flag=False,
+        ),
+        option(
+            "--watch",
+            "-w",
+            description="After running the command, watch the files in the repository for changes and re-run the "
+            "command in the projects affected by them until interrupted.",
+        ),
+    ]
 
     def load_configuration(self, app: Application) -> dict[str, str]:
         config = (app.main_project() or app.repository).raw_config()
@@ -50,40 +99,100 @@ class RunCommandPlugin(VenvAwareCommand, ApplicationPlugin):
         if result != 0:
             return result
 
+        try:
+            jobs = int(self.option("jobs"))
+            if jobs < 1:
+                raise ValueError
+        except ValueError:
+            self.line_error(f'error: invalid value for <opt>-j,--jobs</opt>: "{self.option("jobs")}"', "error")
+            return 1
+
+        changed_since: str | None = self.option("changed-since")
+        try:
+            affected = set(self.app.get_affected_projects(changed_since)) if changed_since is not None else None
+        except ValueError as exc:
+            self.line_error(f"error: {exc}", "error")
+            return 1
+        commands_to_execute, working_dirs, skipped = self._get_commands(affected)
+
+        exit_code = 0
+        if skipped:
+            logger.info("Skipping projects not affected by changes since <val>%s</val>: %s", changed_since, skipped)
+        if skipped and not commands_to_execute:
+            self.line(f'no projects affected by changes since <s>"{changed_since}"</s>', "info")
+        else:
+            exit_code = self._execute(commands_to_execute, working_dirs, jobs)
+
+        if self.option("watch"):
+            return self._watch(jobs)
+        return exit_code
+
+    def _get_commands(self, affected: set[Project] | None) -> tuple[dict[str, str], dict[str, Path], list[str]]:
+        """Return the commands to execute and their working directories by project ID, as well as the IDs of the
+        projects that are skipped because they are not in the *affected* projects."""
+
         main_project = self.app.main_project()
         commands_to_execute = {}
         working_dirs = {}
+        skipped = []
 
         command: list[str] = self.argument("args")
         if main_project and command[0] in self.config:
-            command_string = self.config[command[0]] + " " + _join_args(command[1:])
-            commands_to_execute[main_project.id if main_project else "/"] = command_string
-            working_dirs[main_project.id if main_project else "/"] = Path.cwd()
+            if affected is not None and main_project not in affected:
+                skipped.append(main_project.id)
+            else:
+                command_string = self.config[command[0]] + " " + _join_args(command[1:])
+                commands_to_execute[main_project.id if main_project else "/"] = command_string
+                working_dirs[main_project.id if main_project else "/"] = Path.cwd()
         elif not main_project:
             for project in self.app.configurations(targets_only=True):
                 config = project.raw_config().get("run", {})
                 if command[0] in config:
+                    if affected is not None and isinstance(project, Project) and project not in affected:
+                        skipped.append(project.id)
+                        continue
                     command_string = config[command[0]] + " " + _join_args(command[1:])
                     commands_to_execute[project.id] = command_string
                     working_dirs[project.id] = project.directory
 
-        if not commands_to_execute:
+        if not commands_to_execute and not skipped:
             commands_to_execute["$"] = _join_args(command)
             working_dirs["$"] = Path.cwd()
 
+        return commands_to_execute, working_dirs, skipped
+
+    def _watch(self, jobs: int) -> int:
+        """Re-run the command in the projects affected by changes to the files in the repository until interrupted
+        (see #Application.watch_projects()). A command that is not an alias is re-run on every change."""
+
+        try:
+            self.line("\n<comment>watching for changes ...</comment>")
+            for projects in self.app.watch_projects():
+                self.config = self.load_configuration(self.app)
+                commands_to_execute, working_dirs, _skipped = self._get_commands(set(projects))
+                if commands_to_execute:
+                    self._execute(commands_to_execute, working_dirs, jobs)
+                    self.line("\n<comment>watching for changes ...</comment>")
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    def _execute(self, commands_to_execute: dict[str, str], working_dirs: dict[str, Path], jobs: int) -> int:
+        """Execute the commands, log the results and write them to the `--json` file. Returns the exit code."""
+
         if len(commands_to_execute) > 1:
             level = logging.WARNING
         else:
             level = logging.INFO
 
-        results = {}
-        for key, command_string in commands_to_execute.items():
-            logger.log(level, "(%s) Running command: $ %s", key, command_string)
-            results[key] = sp.call(command_string, shell=True, cwd=working_dirs[key])
+        if jobs == 1 or len(commands_to_execute) == 1:
+            results = self._run_serial(commands_to_execute, working_dirs, level)
+        else:
+            results = self._run_concurrent(commands_to_execute, working_dirs, level, jobs)
 
-        if any(x != 0 for x in results.values()):
+        if any(x.exit_code != 0 for x in results.values()):
             level = logging.WARNING
-            exit_code = results[next(iter(results))] if len(results) == 1 else 127
+            exit_code = results[next(iter(results))].exit_code if len(results) == 1 else 127
             status = "FAILED"
         else:
             level = logging.INFO
@@ -94,11 +203,79 @@ class RunCommandPlugin(VenvAwareCommand, ApplicationPlugin):
             logging.log(level, "Exit code: %s (status: %s)", exit_code, status)
         else:
             logging.log(level, "Multi-run results: (status: %s)", status)
-            for key in results:
-                logging.log(level, "  %s: %s", key, results[key])
+            for key, value in results.items():
+                if value.exit_code is None:
+                    logging.log(level, "  %s: skipped", key)
+                else:
+                    logging.log(level, "  %s: %s (%.2fs)", key, value.exit_code, value.duration)
+
+        if self.option("json"):
+            self._write_json(self.option("json"), results)
 
+        assert exit_code is not None
         return exit_code
 
+    def _run_serial(
+        self, commands_to_execute: dict[str, str], working_dirs: dict[str, Path], level: int
+    ) -> dict[str, RunResult]:
+        results = {key: RunResult(None, None) for key in commands_to_execute}
+        for key, command_string in commands_to_execute.items():
+            logger.log(level, "(%s) Running command: $ %s", key, command_string)
+            tstart = time.perf_counter()
+            exit_code = sp.call(command_string, shell=True, cwd=working_dirs[key])
+            results[key] = RunResult(exit_code, time.perf_counter() - tstart)
+            if exit_code != 0 and self.option("fail-fast"):
+                break
+        return results
+
+    def _run_concurrent(
+        self, commands_to_execute: dict[str, str], working_dirs: dict[str, Path], level: int, jobs: int
+    ) -> dict[str, RunResult]:
+        from concurrent.futures import ThreadPoolExecutor
+
+        from slap.ext.application.test import TestRunner
+
+        lock = threading.Lock()
+        failed = threading.Event()
+        # NOTE: Use the same shell as `subprocess.call(..., shell=True)` in #_run_serial().
+        runners = {
+            key: TestRunner(key, command_string, self.io, working_dirs[key], lock=lock, shell="/bin/sh")
+            for key, command_string in commands_to_execute.items()
+        }
+        results = {key: RunResult(None, None) for key in commands_to_execute}
+
+        def _run(key: str) -> None:
+            if failed.is_set():
+                return
+            logger.log(level, "(%s) Running command: $ %s", key, commands_to_execute[key])
+            exit_code = runners[key].run()
+            results[key] = RunResult(exit_code, runners[key].duration)
+            if exit_code != 0 and self.option("fail-fast"):
+                failed.set()
+                for runner in runners.values():
+                    runner.terminate()
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            try:
+                for future in [executor.submit(_run, key) for key in commands_to_execute]:
+                    future.result()
+            except BaseException:
+                failed.set()
+                for runner in runners.values():
+                    runner.terminate()
+                raise
+
+        return results
+
+    def _write_json(self, filename: str, results: dict[str, RunResult]) -> None:
+        import json
+
+        data = json.dumps({key: dataclasses.asdict(value) for key, value in results.items()}, indent=2)
+        if filename == "-":
+            print(data)
+        else:
+            Path(filename).write_text(data + "\n")
+
 
 def _join_args(args: list[str]) -> str:
     return " ".join(map(shlex.quote, args))
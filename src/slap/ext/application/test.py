@@ -1,5 +1,13 @@
+from __future__ import annotations
+
+import dataclasses
+import functools
 import logging
 import os
+import signal
+import subprocess as sp
+import threading
+import time
 import typing as t
 from pathlib import Path
 
@@ -10,90 +18,319 @@ from slap.ext.application.venv import VenvAwareCommand
 from slap.plugins import ApplicationPlugin
 from slap.project import Project
 
+if t.TYPE_CHECKING:
+    from ptyprocess import PtyProcess  # type: ignore[import]
+
 logger = logging.getLogger(__name__)
+DEFAULT_TIMINGS_FILE = ".slap/test-timings.json"
 
 
 class TestRunner:
+    """Runs a single test command and forwards its output to *io*, optionally prefixed with the test name. Multiple
+    runners may be executed concurrently from different threads if they share the same *lock*, which serializes the
+    writes to *io*. If *buffered* is enabled, the output is collected and written in one block when the test finishes.
+    The command is run with the given *shell*, or with `$SHELL` by default (on Windows, always with `cmd`).
+    """
+
     _colors = ["blue", "cyan", "magenta", "yellow"]
     _prev_color: t.ClassVar[str | None] = None
 
-    def __init__(self, name: str, config: t.Any, io: IO, cwd: Path | None = None, line_prefixing: bool = True) -> None:
+    def __init__(
+        self,
+        name: str,
+        config: t.Any,
+        io: IO,
+        cwd: Path | None = None,
+        line_prefixing: bool = True,
+        buffered: bool = False,
+        lock: threading.Lock | None = None,
+        capture: bool = False,
+        shell: str | None = None,
+    ) -> None:
         assert isinstance(config, str), type(config)
         self.name = name
         self.config = config
         self.io = io
         self.cwd = cwd
         self.line_prefixing = line_prefixing
+        self.buffered = buffered
+        self.lock = lock or threading.Lock()
+        self.capture = capture
+        self.shell = shell
 
-    def run(self) -> int:
-        import subprocess as sp
-        import sys
-        from codecs import getreader
+        #: The wall-clock time in seconds that the last call to #run() took.
+        self.duration: float | None = None
 
-        from cleo.io.io import OutputType  # type: ignore[import]
+        #: The lines of output of the test, without prefix. Only populated if *capture* is enabled.
+        self.output: list[str] = []
 
-        if os.name != "nt":
-            from ptyprocess import PtyProcessUnicode  # type: ignore[import]
-        else:
-            PtyProcessUnicode = None
+        #: Set to `True` by #replay().
+        self.cached = False
+
+        self._process: sp.Popen[bytes] | PtyProcess | None = None
+        self._terminated = False
 
-        color = (
+        self.color = (
             self._colors[0]
             if TestRunner._prev_color is None
             else self._colors[(self._colors.index(TestRunner._prev_color) + 1) % len(self._colors)]
         )
-        TestRunner._prev_color = color
+        TestRunner._prev_color = self.color
+        self._buffer: list[str] = []
+
+    def _write_lines(self, lines: list[str]) -> None:
+        from cleo.io.io import OutputType  # type: ignore[import]
+
+        if self.capture:
+            self.output += lines
+        if self.line_prefixing:
+            prefix = f"<fg={self.color}>{self.name}| </fg>"
+            lines = [prefix + line for line in lines]
+        if self.buffered:
+            self._buffer += lines
+        elif lines:
+            text = "\n".join(lines) + "\n"
+            with self.lock:
+                self.io.write(text, type=OutputType.NORMAL)
+
+    def _flush(self) -> None:
+        from cleo.io.io import OutputType
+
+        if self._buffer:
+            with self.lock:
+                self.io.write("\n".join(self._buffer) + "\n", type=OutputType.NORMAL)
+            self._buffer = []
+
+    def run(self) -> int:
+        tstart = time.perf_counter()
+        try:
+            return self._run()
+        finally:
+            self._flush()
+            self.duration = time.perf_counter() - tstart
+
+    @property
+    def terminated(self) -> bool:
+        """Whether #terminate() was called. The exit code and output of a terminated test are incomplete."""
+
+        return self._terminated
+
+    def terminate(self) -> None:
+        """Terminate the process of the test if it is running, or prevent it from starting if it has not been started
+        yet. This may be called from another thread than the one that called #run()."""
+
+        self._terminated = True
+        if self._process is not None:
+            self._terminate_process(self._process)
+
+    @staticmethod
+    def _terminate_process(process: sp.Popen[bytes] | PtyProcess) -> None:
+        # NOTE: The process is the leader of its own session and process group, so we can reach the processes spawned
+        #   by the shell as well. They may otherwise keep the output pipe open.
+        if os.name == "nt":
+            process.terminate()
+            return
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def replay(self, exit_code: int, output: t.Sequence[str]) -> int:
+        """Write the *output* of a previous run of the test instead of running it and return the *exit_code*."""
+
+        self.cached = True
+        self.duration = 0.0
+        self._write_lines(list(output))
+        self._flush()
+        return exit_code
+
+    def _set_process(self, process: sp.Popen[bytes] | PtyProcess) -> None:
+        self._process = process
+        if self._terminated:
+            self._terminate_process(process)
+
+    def _run(self) -> int:
+        from slap.util.pump import LinePump
+
+        if os.name != "nt":
+            from ptyprocess import PtyProcess  # type: ignore[import]
+        else:
+            PtyProcess = None
 
         if os.name == "nt":
             command = ["cmd", "/k", self.config]
         else:
-            shell = os.getenv("SHELL", "bash")
+            shell = self.shell or os.getenv("SHELL") or "bash"
             command = [shell, "-c", self.config]
         prefix = f"{self.name}| "
 
         logger.info("Running command <subj>%s</subj> in <val>%s</val>", command, self.cwd)
 
+        # NOTE: The output is read in large chunks on a background thread by the #LinePump so that the test process
+        #   does not block on a full pipe or PTY buffer while we format and write the output.
         try:
-            if PtyProcessUnicode is None:
+            if PtyProcess is None:
                 raise OSError
             cols, rows = os.get_terminal_size()
         except OSError:
-            sproc = sp.Popen(command, cwd=self.cwd, stdout=sp.PIPE, stderr=sp.STDOUT)
+            sproc = sp.Popen(command, cwd=self.cwd, stdout=sp.PIPE, stderr=sp.STDOUT, start_new_session=True)
+            self._set_process(sproc)
             assert sproc.stdout
-            stdout = getreader(sys.getdefaultencoding())(sproc.stdout)
-            for line in iter(stdout.readline, ""):
-                line = line.rstrip()
-                if self.line_prefixing:
-                    self.io.write(f"<fg={color}>{prefix}</fg>")
-                self.io.write(line + "\n", type=OutputType.NORMAL)
+            with sproc.stdout:
+                for lines in LinePump(sproc.stdout.fileno()):
+                    self._write_lines(lines)
             sproc.wait()
             assert sproc.returncode is not None
             return sproc.returncode
         else:
-            proc = PtyProcessUnicode.spawn(command, dimensions=(rows, cols - len(prefix)), cwd=self.cwd)
-            while not proc.eof():
-                try:
-                    line = proc.readline().rstrip()
-                except EOFError:
-                    break
-                if self.line_prefixing:
-                    self.io.write(f"<fg={color}>{prefix}</fg>")
-                self.io.write(line + "\n", type=OutputType.NORMAL)
+            proc = PtyProcess.spawn(command, dimensions=(rows, cols - len(prefix)), cwd=self.cwd)
+            self._set_process(proc)
+            for lines in LinePump(proc.fd):
+                self._write_lines(lines)
             proc.wait()
-            assert proc.exitstatus is not None
+            if proc.exitstatus is None:
+                # Killed by a signal, report it the same way as #subprocess.Popen.returncode.
+                assert proc.signalstatus is not None
+                return -proc.signalstatus
             return proc.exitstatus
 
 
+@dataclasses.dataclass
+class TestConfig:
+    """The configuration of a test in `[tool.slap.test]` if it is specified as a table instead of a string."""
+
+    #: The command to run with the system shell.
+    command: str
+
+    #: Glob patterns, relative to the project directory, of the files that the test depends on. If specified, the
+    #: result of the test is cached and replayed for as long as the files, the command and the Python environment
+    #: do not change.
+    inputs: list[str] | None = None
+
+
 class Test(t.NamedTuple):
     project: Project
     name: str
     command: str
+    inputs: tuple[str, ...] | None = None
+
+    @staticmethod
+    def of(project: Project, name: str, config: str | dict[str, t.Any]) -> Test:
+        import databind.json
+
+        if isinstance(config, str):
+            return Test(project, name, config)
+        parsed = databind.json.load(config, TestConfig, filename=f"{project.id}:test.{name}")
+        return Test(project, name, parsed.command, tuple(parsed.inputs) if parsed.inputs is not None else None)
 
     @property
     def id(self) -> str:
         return f"{self.project.id}:{self.name}"
 
 
+class TestCache:
+    """Caches the exit code and output of tests that declare their #Test.inputs. The cache key is derived from the
+    contents of the input files, the test command and the identity of the active Python environment."""
+
+    #: The maximum size of the cache directory in bytes.
+    MAX_SIZE: t.ClassVar[int] = 64 * 1024 * 1024
+
+    def __init__(self, directory: Path) -> None:
+        from slap.util.cache import DirectoryCache
+
+        self._cache = DirectoryCache(directory, self.MAX_SIZE)
+
+    @functools.cached_property
+    def python_identity(self) -> str:
+        """A string that identifies the Python environment that tests are run in, i.e. the `python` on the `PATH`
+        after the Slap-managed virtual environment was activated."""
+
+        from slap.python.environment import PythonEnvironment
+
+        try:
+            env = PythonEnvironment.of("python")
+        except (OSError, sp.CalledProcessError):
+            return ""
+        return f"{env.executable}|{env.prefix}|{env.version}"
+
+    def get_key(self, test: Test) -> str | None:
+        """Return the cache key for the *test*, or `None` if the test can not be cached."""
+
+        from slap.util.cache import fingerprint
+
+        if test.inputs is None:
+            return None
+        directory = test.project.directory
+        files = {path for pattern in test.inputs for path in directory.glob(pattern) if path.is_file()}
+        return fingerprint(test.id, test.command, self.python_identity, files=files, root=directory)
+
+    def load(self, key: str) -> tuple[int, list[str]] | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        return entry["exit_code"], entry["output"]
+
+    def store(self, key: str, exit_code: int, output: list[str]) -> None:
+        self._cache.put(key, {"exit_code": exit_code, "output": output})
+
+
+def load_test_timings(path: Path) -> dict[str, float]:
+    """Load the durations of previous test runs, mapping #Test.id to seconds. Returns an empty dictionary if the file
+    does not exist or is invalid."""
+
+    import json
+
+    try:
+        return {str(k): float(v) for k, v in json.loads(path.read_text()).items()}
+    except FileNotFoundError:
+        return {}
+    except (ValueError, TypeError, AttributeError) as exc:
+        logger.warning("Ignoring invalid test timings file <subj>%s</subj>: %s", path, exc)
+        return {}
+
+
+def save_test_timings(path: Path, timings: t.Mapping[str, float]) -> None:
+    import json
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({k: round(timings[k], 3) for k in sorted(timings)}, indent=2) + "\n")
+
+
+def partition_tests(test_ids: t.Collection[str], num_shards: int, timings: t.Mapping[str, float]) -> list[list[str]]:
+    """Deterministically partition the given test IDs into *num_shards* shards that are balanced by the expected
+    duration of the tests according to *timings*. Each test is assigned to the shard with the smallest total expected
+    duration so far, starting with the longest running tests. Tests without timing data are expected to take the
+    average duration of the tests that have timing data. If there is no timing data at all, the tests are assigned to
+    the shards round-robin in the order of their IDs."""
+
+    assert num_shards >= 1, num_shards
+    shards: list[list[str]] = [[] for _ in range(num_shards)]
+    known = [timings[test_id] for test_id in test_ids if test_id in timings]
+    if not known:
+        for idx, test_id in enumerate(sorted(test_ids)):
+            shards[idx % num_shards].append(test_id)
+        return shards
+
+    default = sum(known) / len(known)
+    totals = [0.0] * num_shards
+    for test_id in sorted(test_ids, key=lambda x: (-timings.get(x, default), x)):
+        idx = min(range(num_shards), key=lambda i: (totals[i], i))
+        shards[idx].append(test_id)
+        totals[idx] += timings.get(test_id, default)
+    return [sorted(shard) for shard in shards]
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parses a shard specification of the form `i/N` where `1 <= i <= N`.
+
+    Raises ValueError: If the specification is invalid."""
+
+    index, sep, count = value.partition("/")
+    if not sep or not index.isdigit() or not count.isdigit() or not 1 <= int(index) <= int(count):
+        raise ValueError(f'invalid shard "{value}", expected "i/N" with 1 <= i <= N')
+    return int(index), int(count)
+
+
 class TestCommandPlugin(VenvAwareCommand, ApplicationPlugin):
     """
     Execute commands configured in <code>[tool.slap.test]</code>.
@@ -145,6 +382,52 @@ class TestCommandPlugin(VenvAwareCommand, ApplicationPlugin):
             flag=False,
             multiple=True,
         ),
+        option(
+            "--jobs",
+            "-j",
+            description="The number of tests to run concurrently. The output of the tests is multiplexed line by line, "
+            "unless <opt>-b,--buffer-output</opt> is specified.",
+            flag=False,
+            default="1",
+        ),
+        option(
+            "--buffer-output",
+            "-b",
+            description="Buffer the output of each test and print it in one block when the test finishes.",
+        ),
+        option(
+            "--changed-since",
+            description="Only run the tests of projects that changed since the given revision, and of the projects "
+            "that depend on them. Changes are determined relative to the merge-base of the revision and the current "
+            "commit.",
+            flag=False,
+        ),
+        option(
+            "--no-cache",
+            description="Run tests that declare their <code>inputs</code> even if a cached result is available.",
+        ),
+        option(
+            "--shard",
+            description="Run only the <code>i</code>-th of <code>N</code> shards of the selected tests, given as "
+            "<code>i/N</code>. The tests are balanced across the shards using the durations from the timings file.",
+            flag=False,
+        ),
+        option(
+            "--timings-file",
+            description="The file that stores the durations of previous test runs. Defaults to "
+            "<code>.slap/test-timings.json</code> in the repository.",
+            flag=False,
+        ),
+        option(
+            "--write-timings",
+            description="Update the timings file with the durations of the tests that were run.",
+        ),
+        option(
+            "--watch",
+            "-w",
+            description="After running the tests, watch the files in the repository for changes and re-run the "
+            "tests of the projects affected by them until interrupted.",
+        ),
     ]
 
     # Hack to set a default value for the flag.
@@ -161,8 +444,8 @@ class TestCommandPlugin(VenvAwareCommand, ApplicationPlugin):
         tests = []
         projects = self.app.get_target_projects(self.option("only"))
         for project in projects:
-            for test_name, command in project.raw_config().get("test", {}).items():
-                tests.append(Test(project, test_name, command))
+            for test_name, config in project.raw_config().get("test", {}).items():
+                tests.append(Test.of(project, test_name, config))
         return tests
 
     def _select_tests(self, name: str) -> set[Test]:
@@ -180,6 +463,17 @@ class TestCommandPlugin(VenvAwareCommand, ApplicationPlugin):
             raise ValueError(f"{name!r} did not match any tests")
         return result
 
+    def _filter_changed(self, tests: t.Iterable[Test]) -> set[Test]:
+        """Keep only the tests of projects affected by changes since the revision given with `--changed-since`.
+
+        Raises ValueError: If the changes can not be determined (see #Application.get_affected_projects())."""
+
+        changed_since: str | None = self.option("changed-since")
+        if changed_since is None:
+            return set(tests)
+        affected = set(self.app.get_affected_projects(changed_since))
+        return {test for test in tests if test.project in affected}
+
     def handle(self) -> int:
         result = super().handle()
         if result != 0:
@@ -188,7 +482,12 @@ class TestCommandPlugin(VenvAwareCommand, ApplicationPlugin):
             if self.argument("test"):
                 self.line_error("error: incompatible arguments (<opt>test</opt> and <opt>-l,--list</opt>)", "error")
                 return 1
-            for test in self.tests:
+            try:
+                tests = self._filter_changed(self.tests)
+            except ValueError as exc:
+                self.line_error(f"error: {exc}", "error")
+                return 1
+            for test in sorted(tests, key=lambda t: t.id):
                 print(test.id)
             return 0
 
@@ -196,39 +495,157 @@ class TestCommandPlugin(VenvAwareCommand, ApplicationPlugin):
             self.line_error("error: no tests configured", "error")
             return 1
 
-        test_names: list[str] = self.argument("test")
-        exclude_tests: list[str] = self.option("exclude")
+        try:
+            jobs = int(self.option("jobs"))
+            if jobs < 1:
+                raise ValueError
+        except ValueError:
+            self.line_error(f'error: invalid value for <opt>-j,--jobs</opt>: "{self.option("jobs")}"', "error")
+            return 1
 
-        if not test_names:
-            tests = set(self.tests)
-        else:
+        if self.option("watch") and self.option("shard"):
+            self.line_error("error: incompatible options (<opt>--watch</opt> and <opt>--shard</opt>)", "error")
+            return 1
+
+        try:
+            tests = self._get_selected_tests()
+        except ValueError as exc:
+            self.line_error(f"error: {exc}", "error")
+            return 1
+
+        timings_file = Path(self.option("timings-file") or self.app.repository.directory / DEFAULT_TIMINGS_FILE)
+
+        if self.option("changed-since") is not None:
+            try:
+                tests = self._filter_changed(tests)
+            except ValueError as exc:
+                self.line_error(f"error: {exc}", "error")
+                return 1
+            if not tests:
+                self.line(f'no tests affected by changes since <s>"{self.option("changed-since")}"</s>', "info")
+                return self._watch(jobs, timings_file) if self.option("watch") else 0
+
+        if self.option("shard"):
             try:
-                tests = {t for a in test_names for t in self._select_tests(a)}
+                shard, num_shards = parse_shard(self.option("shard"))
             except ValueError as exc:
                 self.line_error(f"error: {exc}", "error")
                 return 1
+            shards = partition_tests({t.id for t in tests}, num_shards, load_test_timings(timings_file))
+            tests = {t for t in tests if t.id in shards[shard - 1]}
+            self.line_error(f"running shard {shard}/{num_shards} ({len(tests)} tests)", "info")
+            if not tests:
+                return 0
+
+        exit_code = self._run_tests(tests, jobs, timings_file)
+        return self._watch(jobs, timings_file) if self.option("watch") else exit_code
 
+    def _get_selected_tests(self) -> set[Test]:
+        """Return the tests selected with the `test` argument and the `--exclude` option.
+
+        Raises ValueError: If a test name does not match any test."""
+
+        test_names: list[str] = self.argument("test")
+        exclude_tests: list[str] = self.option("exclude")
+        if not test_names:
+            tests = set(self.tests)
+        else:
+            tests = {t for a in test_names for t in self._select_tests(a)}
         tests -= {t for a in exclude_tests for t in self._select_tests(a)}
+        return tests
 
+    def _watch(self, jobs: int, timings_file: Path) -> int:
+        """Re-run the selected tests of the projects affected by changes to the files in the repository until
+        interrupted (see #Application.watch_projects())."""
+
+        try:
+            self.line("\n<comment>watching for changes ...</comment>")
+            for projects in self.app.watch_projects():
+                try:
+                    tests = {test for test in self._get_selected_tests() if test.project in projects}
+                except ValueError as exc:
+                    self.line_error(f"error: {exc}", "error")
+                    continue
+                if tests:
+                    self._run_tests(tests, jobs, timings_file)
+                    self.line("\n<comment>watching for changes ...</comment>")
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    def _run_tests(self, tests: set[Test], jobs: int, timings_file: Path) -> int:
         if (no_line_prefix := self.option("no-line-prefix")) is NotSet.Value:
-            no_line_prefix = test_names is not None and len(tests) == 1
+            no_line_prefix = self.argument("test") is not None and len(tests) == 1
 
         single_project = len(set(t.project for t in self.tests)) == 1
 
-        results = {}
-        for test in sorted(tests, key=lambda t: t.id):
-            results[test.name if single_project else test.id] = TestRunner(
+        cache = TestCache(self.app.repository.directory / ".slap" / "cache" / "tests")
+        lock = threading.Lock()
+        ordered_tests = sorted(tests, key=lambda t: t.id)
+        runners = [
+            TestRunner(
                 test.name if single_project else test.id,
                 test.command,
                 self.io,
                 test.project.directory,
                 not no_line_prefix,
-            ).run()
+                self.option("buffer-output"),
+                lock,
+                capture=test.inputs is not None,
+            )
+            for test in ordered_tests
+        ]
+
+        def _run_test(test: Test, runner: TestRunner) -> int:
+            key = cache.get_key(test)
+            if key is not None and not self.option("no-cache"):
+                entry = cache.load(key)
+                if entry is not None:
+                    logger.info("Replaying cached result for test <subj>%s</subj>", test.id)
+                    return runner.replay(*entry)
+            exit_code = runner.run()
+            # NOTE: A test that was terminated because of an interrupt or a failed test did not run to completion.
+            if key is not None and not runner.terminated:
+                cache.store(key, exit_code, runner.output)
+            return exit_code
+
+        results: dict[str, int] = {}
+        if jobs == 1:
+            try:
+                for test, runner in zip(ordered_tests, runners):
+                    results[runner.name] = _run_test(test, runner)
+            except BaseException:
+                # NOTE: The tests run in their own session, so they do not receive the SIGINT of a Ctrl-C in the
+                #   terminal and must be terminated explicitly.
+                for runner in runners:
+                    runner.terminate()
+                raise
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                futures = [executor.submit(_run_test, test, runner) for test, runner in zip(ordered_tests, runners)]
+                try:
+                    for runner, future in zip(runners, futures):
+                        results[runner.name] = future.result()
+                except BaseException:
+                    for runner in runners:
+                        runner.terminate()
+                    raise
+
+        if self.option("write-timings"):
+            timings = load_test_timings(timings_file)
+            for test, runner in zip(ordered_tests, runners):
+                if not runner.cached and runner.duration is not None:
+                    timings[test.id] = runner.duration
+            save_test_timings(timings_file, timings)
 
         if len(tests) > 1:
             self.line("\n<comment>test summary:</comment>")
-            for test_name, exit_code in results.items():
+            for runner in runners:
+                exit_code = results[runner.name]
                 color = "green" if exit_code == 0 else "red"
-                self.line(f"  <fg={color}>•</fg> {test_name} (exit code: {exit_code})")
+                timing = "cached" if runner.cached else f"{runner.duration:.2f}s"
+                self.line(f"  <fg={color}>•</fg> {runner.name} (exit code: {exit_code}, {timing})")
 
         return 0 if set(results.values()) == {0} else 1
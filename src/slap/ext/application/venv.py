@@ -4,6 +4,7 @@ import shutil
 import string
 import subprocess as sp
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from nr.python.environment.virtualenv import VirtualEnvInfo, get_current_venv
@@ -72,6 +73,9 @@ USER_INIT_SCRIPTS = {
 
 
 class Venv(VirtualEnvInfo):
+    #: The name of the file in the environment directory in which the Python version string is cached.
+    VERSION_CACHE_FILE: t.ClassVar[str] = ".slap-python-version"
+
     def create(self, python_bin: str) -> None:
         self.path.parent.mkdir(parents=True, exist_ok=True)
         sp.check_call([python_bin, "-m", "venv", self.path])
@@ -79,6 +83,33 @@ class Venv(VirtualEnvInfo):
     def delete(self) -> None:
         shutil.rmtree(self.path)
 
+    def get_python_version(self) -> str:
+        """Returns the Python version string of the environment. The result is cached in the environment directory
+        and keyed on the modification time of the `pyvenv.cfg` file, which changes when the environment is re-created
+        or upgraded, so the interpreter only needs to be invoked if the cache is stale."""
+
+        import json
+
+        cache_file = self.path / self.VERSION_CACHE_FILE
+        try:
+            mtime = (self.path / "pyvenv.cfg").stat().st_mtime_ns
+        except FileNotFoundError:
+            return super().get_python_version()
+
+        try:
+            cached = json.loads(cache_file.read_text())
+        except (FileNotFoundError, ValueError):
+            cached = None
+        if isinstance(cached, dict) and cached.get("mtime") == mtime and isinstance(cached.get("version"), str):
+            return cached["version"]
+
+        version = super().get_python_version()
+        try:
+            cache_file.write_text(json.dumps({"mtime": mtime, "version": version}))
+        except OSError as exc:
+            logger.debug("Could not write Python version cache <val>%s</val>: %s", cache_file, exc)
+        return version
+
 
 class VenvManager:
     def __init__(self, directory: Path | None = None) -> None:
@@ -348,8 +379,13 @@ class VenvCommand(Command):
             return
         self.line(f'{len(venvs)} environment{"s" if len(venvs) != 1 else ""} in <s>"{manager.directory}"</s>', "info")
         maxw = max(len(venv.name) for venv in venvs)
-        for venv in venvs:
-            self.line(f"• {venv.name.ljust(maxw)}  <code>{venv.get_python_version().splitlines()[0]}</code>")
+
+        # Probing the interpreters is dominated by process startup, so we do it concurrently.
+        with ThreadPoolExecutor(max_workers=min(len(venvs), (os.cpu_count() or 1) * 4)) as executor:
+            versions = list(executor.map(Venv.get_python_version, venvs))
+
+        for venv, version in zip(venvs, versions):
+            self.line(f"• {venv.name.ljust(maxw)}  <code>{version.splitlines()[0]}</code>")
 
     def _is_called_from_shadow(self) -> bool:
         return os.getenv("SLAP_SHADOW") == "true"
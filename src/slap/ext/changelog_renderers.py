@@ -0,0 +1,137 @@
+""" Builtin renderers for the `slap changelog export` command. """
+
+from __future__ import annotations
+
+import html
+import json
+import logging
+import re
+import typing as t
+
+from slap.changelog import ChangelogEntry, ChangelogManager, ManagedChangelog
+from slap.plugins import ChangelogRendererPlugin
+
+if t.TYPE_CHECKING:
+    from slap.repository import Issue, PullRequest
+
+logger = logging.getLogger(__name__)
+
+
+def _get_link(manager: ChangelogManager, type: t.Literal["pr", "issue"], ref: str) -> tuple[str, str]:
+    """Internal. Return the URL and the text for a link to the issue or pull request *ref*. If the repository host is
+    unable to parse the reference, a warning is logged and the reference is used as the URL."""
+
+    if not manager.repository_host:
+        return ref, ref
+    try:
+        if type == "pr":
+            item: Issue | PullRequest = manager.repository_host.get_pull_request_by_reference(ref)
+        else:
+            item = manager.repository_host.get_issue_by_reference(ref)
+    except ValueError as exc:
+        logger.warning("%s", exc)
+        return ref, "Link"
+    return item.url, item.id
+
+
+def _html_anchor(manager: ChangelogManager, type: t.Literal["pr", "issue"], ref: str) -> str:
+    if not manager.repository_host:
+        return ref
+    url, text = _get_link(manager, type, ref)
+    return f'<a href="{url}">{text}</a>'
+
+
+class MarkdownChangelogRenderer(ChangelogRendererPlugin):
+    """Renders a Markdown section with an HTML table of the entries per release. This is the same format that is
+    produced by `slap changelog format --markdown`."""
+
+    def render_release(self, manager: ChangelogManager, changelog: ManagedChangelog) -> str:
+        if changelog.version:
+            assert changelog.content.release_date
+            parts = [f"## {changelog.version} ({changelog.content.release_date})\n"]
+        else:
+            parts = ["## Unreleased\n"]
+            if not changelog.exists():
+                return parts[0]
+
+        parts.append("\n<table><tr><th>Type</th><th>Description</th><th>PR</th><th>Issues</th><th>Author</th></tr>\n")
+        for entry in changelog.content.entries:
+            pr_link = _html_anchor(manager, "pr", entry.pr) if entry.pr else ""
+            issues = ", ".join(_html_anchor(manager, "issue", issue) for issue in entry.issues) if entry.issues else ""
+            parts.append(
+                f"  <tr><td>{entry.type.capitalize()}</td><td>\n\n{entry.description}</td>"
+                f'<td>{pr_link}</td><td>{issues}</td><td>{", ".join(entry.get_authors())}</td></tr>\n'
+            )
+        parts.append("</table>\n")
+        return "".join(parts)
+
+
+class HtmlChangelogRenderer(ChangelogRendererPlugin):
+    """Renders a standalone HTML fragment with a `<section>` and table per release. Inline code in descriptions (text
+    enclosed in backticks) is rendered as `<code>`, everything else is escaped."""
+
+    def begin(self, manager: ChangelogManager) -> str:
+        return '<div class="changelog">\n'
+
+    def render_release(self, manager: ChangelogManager, changelog: ManagedChangelog) -> str:
+        if changelog.version:
+            assert changelog.content.release_date
+            title = f"{changelog.version} <small>({changelog.content.release_date})</small>"
+        else:
+            title = "Unreleased"
+        parts = [f'<section class="release">\n<h2>{title}</h2>\n']
+        if changelog.exists():
+            parts.append(
+                "<table>\n<thead><tr><th>Type</th><th>Description</th><th>PR</th><th>Issues</th><th>Author</th></tr>"
+                "</thead>\n<tbody>\n"
+            )
+            parts += (self._render_entry(manager, entry) for entry in changelog.content.entries)
+            parts.append("</tbody>\n</table>\n")
+        parts.append("</section>\n")
+        return "".join(parts)
+
+    def _render_entry(self, manager: ChangelogManager, entry: ChangelogEntry) -> str:
+        def _link(type: t.Literal["pr", "issue"], ref: str) -> str:
+            url, text = _get_link(manager, type, ref)
+            return f'<a href="{html.escape(url)}">{html.escape(text)}</a>'
+
+        description = re.sub(r"`([^`]+)`", r"<code>\1</code>", html.escape(entry.description, quote=False))
+        pr_link = _link("pr", entry.pr) if entry.pr else ""
+        issues = ", ".join(_link("issue", issue) for issue in entry.issues) if entry.issues else ""
+        authors = html.escape(", ".join(entry.get_authors()))
+        return (
+            f"<tr><td>{html.escape(entry.type.capitalize())}</td><td>{description}</td><td>{pr_link}</td>"
+            f"<td>{issues}</td><td>{authors}</td></tr>\n"
+        )
+
+
+class JsonChangelogRenderer(ChangelogRendererPlugin):
+    """Renders a JSON array with one object per release, containing the `version`, `release_date` and `entries`.
+    Each release is written on a single line. References to issues and pull requests are normalized to URLs if the
+    repository host supports it."""
+
+    separator = ",\n"
+
+    def begin(self, manager: ChangelogManager) -> str:
+        return "[\n"
+
+    def render_release(self, manager: ChangelogManager, changelog: ManagedChangelog) -> str:
+        content = changelog.content if changelog.exists() else None
+        entries = []
+        for entry in content.entries if content else []:
+            data: dict[str, t.Any] = {"id": entry.id, "type": entry.type, "description": entry.description}
+            data["authors"] = entry.get_authors()
+            data["pr"] = _get_link(manager, "pr", entry.pr)[0] if entry.pr else None
+            data["issues"] = [_get_link(manager, "issue", issue)[0] for issue in entry.issues or []]
+            entries.append(data)
+        release_date = content.release_date if content else None
+        return json.dumps(
+            {
+                "version": str(changelog.version) if changelog.version else None,
+                "release_date": release_date.isoformat() if release_date else None,
+                "entries": entries,
+            }
+        )
+
+    def end(self, manager: ChangelogManager) -> str:
+        return "\n]\n"
@@ -1,44 +1,90 @@
 import dataclasses
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-from slap.check import Check, CheckResult, check, get_checks
+from slap.changelog import ChangelogManager
+from slap.check import Check, CheckResult, check, get_checks, get_configuration_files
 from slap.ext.application.changelog import get_changelog_manager
 from slap.plugins import CheckPlugin
 from slap.project import Project
 
 
+@dataclasses.dataclass
+class ChangelogValidationResult:
+    """The result of validating a single changelog file, see #validate_changelog_file()."""
+
+    #: The name of the changelog file.
+    filename: str
+
+    #: An error message if the file could not be loaded.
+    error: str | None = None
+
+    #: A list of the IDs of invalid entries and the corresponding error messages.
+    entry_errors: list[tuple[str, str]] = dataclasses.field(default_factory=list)
+
+
+def validate_changelog_file(manager: ChangelogManager, path: Path) -> ChangelogValidationResult:
+    """Load and validate the changelog file at *path*."""
+
+    import tomli
+    from databind.core.converter import ConversionError
+
+    result = ChangelogValidationResult(path.name)
+    try:
+        changelog = manager.load(path)
+    except (tomli.TOMLDecodeError, ConversionError) as exc:
+        result.error = str(exc)
+        return result
+    for entry in changelog.entries:
+        try:
+            manager.validate_entry(entry)
+        except (ConversionError, ValueError) as exc:
+            result.entry_errors.append((entry.id, str(exc)))
+    return result
+
+
 @dataclasses.dataclass
 class ChangelogValidationCheckPlugin(CheckPlugin):
-    """This check plugin validates the structured changelog files, if any.
+    """This check plugin validates the structured changelog files, if any. The files are loaded and validated
+    concurrently in a thread pool.
 
     Plugin ID: `changelog`"""
 
+    #: The maximum number of threads to validate changelog files with. Defaults to the #ThreadPoolExecutor default.
+    max_workers: int | None = None
+
     def get_project_checks(self, project: Project) -> t.Iterable[Check]:
         return get_checks(self, project)
 
+    def get_project_check_inputs(self, project: Project) -> t.Sequence[Path]:
+        manager = get_changelog_manager(project.repository, project)
+        files = get_configuration_files(project, project.repository)
+        if manager.directory.is_dir():
+            files += sorted(path for path in manager.directory.iterdir() if path.suffix == ".toml")
+        return files
+
     @check("validate")
     def _validate_changelogs(self, project: Project) -> tuple[CheckResult, str | None, str | None]:
-        import tomli
-        from databind.core.converter import ConversionError
-
         manager = get_changelog_manager(project.repository, project)
-        bad_files = []
-        bad_changelogs = []
-        count = 0
-        for changelog in manager.all():
-            count += 1
-            try:
-                for entry in changelog.load().entries:
-                    try:
-                        manager.validate_entry(entry)
-                    except (ConversionError, ValueError) as exc:
-                        bad_changelogs.append((changelog.path.name, str(exc), entry.id))
-            except (tomli.TOMLDecodeError, ConversionError) as exc:
-                bad_files.append((changelog.path.name, str(exc)))
-
-        if not count:
+        paths = [changelog.path for changelog in manager.all()]
+        if not paths:
             return CheckResult.SKIPPED, None, None
 
+        results: t.Iterable[ChangelogValidationResult]
+        if len(paths) <= 1:
+            results = [validate_changelog_file(manager, path) for path in paths]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(lambda path: validate_changelog_file(manager, path), paths))
+
+        bad_files = []
+        bad_changelogs = []
+        for result in results:
+            if result.error is not None:
+                bad_files.append((result.filename, result.error))
+            bad_changelogs += [(result.filename, err, entry_id) for entry_id, err in result.entry_errors]
+        count = len(paths)
         return (
             Check.ERROR if bad_changelogs else Check.Result.OK,
             "Broken or invalid changelogs" if bad_changelogs else f"All {count} changelogs are valid.",
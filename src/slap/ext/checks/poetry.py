@@ -1,15 +1,14 @@
 import typing as t
 from pathlib import Path
 
-import requests
 from nr.util import Optional
 from nr.util.fs import get_file_in_directory
 
-from slap.check import Check, CheckResult, check, get_checks
+from slap.check import Check, CheckResult, check, get_checks, get_configuration_files
 from slap.ext.project_handlers.poetry import PoetryProjectHandler
 from slap.plugins import CheckPlugin
 from slap.project import Project
-from slap.util.external.pypi_classifiers import get_classifiers
+from slap.util.external.pypi_classifiers import get_classifier_database, get_classifier_database_path
 
 
 def get_readme_path(project: Project) -> Path | None:
@@ -43,6 +42,20 @@ class PoetryChecksPlugin(CheckPlugin):
                 return
             yield from get_checks(self, project)
 
+    def get_project_check_inputs(self, project: Project) -> t.Sequence[Path]:
+        from slap.util.external.licenses import SPDX_INDEX_FILENAME
+
+        # The readme check also depends on which readme files exist and on the configured readme, which may be
+        # anywhere in the project, see #get_readme_path().
+        readmes = [path for path in Path.cwd().iterdir() if path.name.upper().startswith("README") and path.is_file()]
+        poetry = project.pyproject_toml.value_or({}).get("tool", {}).get("poetry", {})
+        if readme := poetry.get("readme"):
+            readmes += [path for path in (project.directory / readme, Path(readme)) if path.is_file()]
+        # The classifier and license checks depend on the classifier snapshot (which is updated by
+        # `slap classifiers refresh`) and on the SPDX license index.
+        databases = [get_classifier_database_path(), SPDX_INDEX_FILENAME]
+        return get_configuration_files(project) + sorted({path.resolve() for path in readmes}) + databases
+
     @check("readme")
     def get_readme_check(self, project: Project) -> tuple[CheckResult, str]:
         """Checks if Poetry will be able to pick up the right readme file."""
@@ -94,38 +107,52 @@ class PoetryChecksPlugin(CheckPlugin):
             return result, message
 
     @check("classifiers")
-    def get_classifiers_check(self, project: Project) -> tuple[CheckResult, str]:
-        """Checks if all Python package classifiers are valid and recommends to configure them if none are set."""
+    def get_classifiers_check(self, project: Project) -> tuple[CheckResult, str] | tuple[CheckResult, str, str | None]:
+        """Checks if all Python package classifiers are valid and recommends to configure them if none are set. The
+        classifiers are validated against a snapshot of the classifiers accepted by PyPI that is shipped with Slap,
+        and close matches are suggested for invalid ones."""
 
         # TODO: Check for recommended classifier topics (Development State, Environment,
         #       Programming Language, Topic, Typing, etc.)
         classifiers = self.poetry.get("classifiers")  # TODO: Support classifiers in [project]
         if not classifiers:
             return Check.RECOMMENDATION, "Please configure classifiers."
-        else:
-            try:
-                good_classifiers = get_classifiers()
-            except requests.RequestException as exc:
-                return Check.WARNING, f"Could not validate classifiers because list could not be fetched ({exc})"
-            else:
-                bad_classifiers = set(classifiers) - set(good_classifiers)
-                if bad_classifiers:
-                    return Check.ERROR, "Found bad classifiers: " + ",".join(f'<s>"{c}"</s>' for c in bad_classifiers)
-                else:
-                    return Check.OK, "All classifiers are valid."
+
+        database = get_classifier_database()
+        bad_classifiers = [c for c in classifiers if c not in database]
+        if not bad_classifiers:
+            return Check.OK, "All classifiers are valid."
+
+        message = "Found bad classifiers: " + ",".join(f'<s>"{c}"</s>' for c in bad_classifiers)
+        suggestions = []
+        for classifier in bad_classifiers:
+            if matches := database.get_close_matches(classifier, n=1):
+                suggestions.append(f'<s>"{classifier}"</s>: did you mean <s>"{matches[0]}"</s>?')
+        return Check.ERROR, message, "\n".join(suggestions) or None
 
     @check("license")
     def get_license_check(self, project: Project) -> tuple[CheckResult, str]:
         """Checks if package license is a valid SPDX license identifier and recommends to configure a license if
         none is set."""
 
-        from slap.util.external.licenses import get_spdx_licenses
+        from slap.util.external.licenses import get_spdx_index
 
         license = self.poetry.get("license")
         if not license:
             return Check.ERROR, "Missing license"
         else:
-            if license not in get_spdx_licenses():
-                return Check.WARNING, f'License <s>"{license}"</s> is not a known SPDX license identifier.'
+            index = get_spdx_index()
+            info = index.get(license)
+            suggestion = index.normalize(license)
+            if suggestion == license:
+                kind = "identifier" if info else "license expression"
+                return Check.OK, f'License <s>"{license}"</s> is a valid SPDX {kind}.'
+            elif info is None:
+                message = f'License <s>"{license}"</s> is not a known SPDX license identifier or expression.'
+                if suggestion:
+                    message += f' Did you mean <s>"{suggestion}"</s>?'
+                return Check.WARNING, message
+            elif suggestion != info.license_id:
+                return Check.WARNING, f'License <s>"{license}"</s> is deprecated, use <s>"{suggestion}"</s>.'
             else:
-                return Check.OK, f'License <s>"{license}"</s> is a valid SPDX identifier.'
+                return Check.WARNING, f'License <s>"{license}"</s> should be spelled <s>"{info.license_id}"</s>.'
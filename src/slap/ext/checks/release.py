@@ -1,9 +1,10 @@
 import typing as t
+from pathlib import Path
 
 from cleo.io.null_io import NullIO  # type: ignore[import]
 
 from slap.application import Application
-from slap.check import Check, CheckResult, check, get_checks
+from slap.check import Check, CheckResult, check, get_checks, get_configuration_files
 from slap.ext.application.release import ReleaseCommandPlugin
 from slap.ext.release.source_code_version import SourceCodeVersionReferencesPlugin
 from slap.plugins import CheckPlugin
@@ -19,6 +20,16 @@ class ReleaseChecksPlugin(CheckPlugin):
     def get_application_checks(self, app: Application) -> t.Iterable[Check]:
         return get_checks(self, app)
 
+    def get_project_check_inputs(self, project: Project) -> t.Sequence[Path]:
+        files = get_configuration_files(project)
+        for package in project.packages() or []:
+            if package.path.is_file():
+                files.append(package.path)
+            else:
+                paths = (package.path / filename for filename in SourceCodeVersionReferencesPlugin.FILENAMES)
+                files += [path for path in paths if path.is_file()]
+        return files
+
     @check("source-code-version")
     def check_packages_have_source_code_version(self, project: Project) -> tuple[CheckResult, str]:
         """Checks if all Python packages in the project have a version defined in the source code."""
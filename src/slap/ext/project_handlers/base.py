@@ -13,7 +13,12 @@ from setuptools import find_namespace_packages, find_packages
 
 from slap.plugins import ProjectHandlerPlugin
 from slap.project import Package, Project
-from slap.release import VersionRef, match_version_ref_pattern, match_version_ref_pattern_on_lines
+from slap.release import (
+    VersionRef,
+    get_version_ref_scanner,
+    match_version_ref_pattern,
+    match_version_ref_pattern_on_lines,
+)
 
 if t.TYPE_CHECKING:
     from slap.python.dependency import Dependency
@@ -176,10 +181,14 @@ def get_pyproject_interdependency_version_refs(project: Project) -> list[Version
     version numbers should also bump the version number of dependencies between projects in that mono-repository."""
 
     pyproject_file = project.pyproject_toml.path
+    content = get_version_ref_scanner().read(pyproject_file)
+
+    # The expressions below can only match if the project name occurs literally in the file, which is much cheaper
+    # to test than matching the expressions of every project in a large mono-repository.
     other_projects: list[str] = [
         t.cast(str, p.dist_name())
         for p in project.repository.projects()
-        if p.is_python_project and p is not project and p.dist_name()
+        if p.is_python_project and p is not project and p.dist_name() and t.cast(str, p.dist_name()) in content
     ]
 
     refs = []
@@ -7,7 +7,12 @@ import typing as t
 
 from slap.ext.project_handlers.base import BaseProjectHandler, interdependencies_enabled
 from slap.project import Dependencies, Package, Project
-from slap.release import VersionRef, match_version_ref_pattern, match_version_ref_pattern_on_lines
+from slap.release import (
+    VersionRef,
+    get_version_ref_scanner,
+    match_version_ref_pattern,
+    match_version_ref_pattern_on_lines,
+)
 
 if t.TYPE_CHECKING:
     from slap.python.dependency import VersionSpec
@@ -113,10 +118,11 @@ def parse_list_semi(val: str) -> list[str]:
 
 def get_setup_cfg_interdependency_version_refs(project: Project) -> list[VersionRef]:
     setup_cfg = project.directory / "setup.cfg"
+    content = get_version_ref_scanner().read(setup_cfg)
     other_projects: list[str] = [
         t.cast(str, p.dist_name())
         for p in project.repository.projects()
-        if p.is_python_project and p is not project and p.dist_name()
+        if p.is_python_project and p is not project and p.dist_name() and t.cast(str, p.dist_name()) in content
     ]
 
     refs = []
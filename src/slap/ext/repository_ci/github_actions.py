@@ -12,6 +12,7 @@ from git.repo import Repo
 from git.util import Actor
 
 from slap.plugins import RepositoryCIPlugin
+from slap.util.http import get_http_client
 
 logger = logging.getLogger()
 
@@ -52,14 +53,12 @@ class SimpleGithubClient:
 
         self._github_api_url = github_api_url
         self._token = token
-        self._session = requests.Session()
-        self._session.headers.update(
-            {
-                "Accept": "application/vnd.github+json",
-                "X-GitHub-Api-Version": "2022-11-28",
-                "Authorization": f"Bearer {self._token}",
-            }
-        )
+        self._http = get_http_client()
+        self._headers = {
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+            "Authorization": f"Bearer {self._token}",
+        }
 
     def get_pull_request(self, repository: str, pull_request_id: str) -> PullRequest:
         """
@@ -73,7 +72,9 @@ class SimpleGithubClient:
         See https://docs.github.com/en/actions/learn-github-actions/variables for more information.
         """
 
-        response = self._session.get(f"{self._github_api_url}/repos/{repository}/pulls/{pull_request_id}")
+        response = self._http.get(
+            f"{self._github_api_url}/repos/{repository}/pulls/{pull_request_id}", headers=self._headers
+        )
         self._raise_for_status(response)
         data = response.json()
 
@@ -88,7 +89,9 @@ class SimpleGithubClient:
         Fetches the comments on a GitHub Pull Request.
         """
 
-        response = self._session.get(f"{self._github_api_url}/repos/{repository}/issues/{pull_request_id}/comments")
+        response = self._http.get(
+            f"{self._github_api_url}/repos/{repository}/issues/{pull_request_id}/comments", headers=self._headers
+        )
         self._raise_for_status(response)
         data = response.json()
 
@@ -105,7 +108,9 @@ class SimpleGithubClient:
         Deletes a comment on a GitHub Pull Request.
         """
 
-        response = self._session.delete(f"{self._github_api_url}/repos/{repository}/issues/comments/{comment_id}")
+        response = self._http.delete(
+            f"{self._github_api_url}/repos/{repository}/issues/comments/{comment_id}", headers=self._headers
+        )
         self._raise_for_status(response)
 
     def create_pr_comment(self, repository: str, pull_request_id: str, body: str) -> Comment:
@@ -113,9 +118,10 @@ class SimpleGithubClient:
         Creates a comment on a GitHub Pull Request.
         """
 
-        response = self._session.post(
+        response = self._http.post(
             f"{self._github_api_url}/repos/{repository}/issues/{pull_request_id}/comments",
             json={"body": body},
+            headers=self._headers,
         )
         self._raise_for_status(response)
         data = response.json()
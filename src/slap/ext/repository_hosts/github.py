@@ -1,26 +1,181 @@
 import dataclasses
 import functools
+import hashlib
 import logging
+import os
 import re
+import threading
+import time
+import typing as t
 from pathlib import Path
 
 import requests
 
 from slap.changelog import is_url
 from slap.repository import Issue, PullRequest, Repository, RepositoryHost
+from slap.util.cache import DirectoryCache
+from slap.util.http import get_http_client
 
 logger = logging.getLogger(__name__)
 
 
+#: The directory in which the email address to GitHub username mapping is cached across invocations.
+USERNAME_CACHE_DIRECTORY = Path("~/.local/slap/cache/github-users").expanduser()
+
+
+class GithubUsernameResolver:
+    """Resolves email addresses to GitHub usernames with the GitHub user search API. Requests are sent with the
+    shared HTTP client (see #slap.util.http) and are authenticated with the `GITHUB_TOKEN` environment variable if it
+    is set, which raises the rate limit considerably. Results are cached on disk, including email addresses that do
+    not match any user, so that repeated invocations of Slap do not query the API again until the entry expires.
+
+    :param api_base_url: The base URL of the GitHub API, e.g. `https://api.github.com`.
+    :param cache: The cache to store resolved usernames in. Pass `None` to disable the persistent cache.
+    :param ttl: The time in seconds after which a resolved username is looked up again.
+    :param negative_ttl: The time in seconds after which an email address without a matching user is looked up
+        again. This is shorter than the *ttl* because the user may add the email address to their account.
+    :param timeout: The timeout in seconds for each request.
+    """
+
+    #: The default number of seconds to keep a resolved username in the cache.
+    DEFAULT_TTL: t.ClassVar[int] = 7 * 24 * 60 * 60
+
+    #: The default number of seconds to remember that an email address has no matching user.
+    DEFAULT_NEGATIVE_TTL: t.ClassVar[int] = 24 * 60 * 60
+
+    def __init__(
+        self,
+        api_base_url: str,
+        cache: DirectoryCache | None = None,
+        ttl: float = DEFAULT_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        timeout: float = 10,
+    ) -> None:
+        self.api_base_url = api_base_url.rstrip("/")
+        self.cache = cache
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.timeout = timeout
+        self._memory: dict[str, str | None] = {}
+        self._lock = threading.Lock()
+        self._headers = {"Accept": "application/vnd.github+json"}
+        if token := os.getenv("GITHUB_TOKEN"):
+            self._headers["Authorization"] = f"token {token}"
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(api_base_url={self.api_base_url!r})"
+
+    def _get_cache_key(self, email: str) -> str:
+        return hashlib.sha256(f"{self.api_base_url}\0{email.lower()}".encode()).hexdigest()
+
+    def _get_cached(self, email: str) -> tuple[bool, str | None]:
+        with self._lock:
+            if email in self._memory:
+                return True, self._memory[email]
+        if self.cache is None:
+            return False, None
+        entry = self.cache.get(self._get_cache_key(email))
+        if not isinstance(entry, dict) or "time" not in entry:
+            return False, None
+        if entry["time"] + (self.ttl if entry["login"] else self.negative_ttl) < time.time():
+            return False, None
+        with self._lock:
+            self._memory[email] = entry["login"]
+        return True, entry["login"]
+
+    def _set_cached(self, email: str, login: str | None) -> None:
+        with self._lock:
+            self._memory[email] = login
+        if self.cache is not None:
+            self.cache.put(self._get_cache_key(email), {"login": login, "time": time.time()})
+
+    def _fetch(self, email: str) -> str | None:
+        logger.debug("Looking up GitHub username for <val>%s</val>", email)
+        # Conditional requests that are answered with `304 Not Modified` do not count towards GitHub's rate limit.
+        response = get_http_client().get(
+            f"{self.api_base_url}/search/users",
+            cache=True,
+            params={"q": f"{email} in:email"},
+            headers=self._headers,
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        items = response.json()["items"]
+        return items[0]["login"] if items else None
+
+    def resolve(self, email: str) -> str | None:
+        """Return the username of the GitHub user with the given *email* address, or `None` if there is no such
+        user. Errors from the API are propagated and are not cached."""
+
+        assert email, "no email address"
+        found, login = self._get_cached(email)
+        if not found:
+            login = self._fetch(email)
+            self._set_cached(email, login)
+        return login
+
+    def resolve_many(self, emails: t.Iterable[str], max_workers: int = 4) -> dict[str, str | None]:
+        """Resolve multiple email addresses at once. Every distinct email address is looked up at most once and
+        cache misses are fetched concurrently over the pooled session. Email addresses that could not be looked up
+        due to an error are logged and map to `None`, but they are not cached."""
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        result: dict[str, str | None] = {}
+        missing: list[str] = []
+        for email in dict.fromkeys(emails):
+            found, result[email] = self._get_cached(email)
+            if not found:
+                missing.append(email)
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as executor:
+                futures = {email: executor.submit(self._fetch, email) for email in missing}
+            for email, future in futures.items():
+                try:
+                    result[email] = future.result()
+                except requests.RequestException as exc:
+                    logger.warning("unable to look up GitHub username for %s (reason: %s)", email, exc)
+                    continue
+                self._set_cached(email, result[email])
+
+        return result
+
+
 @functools.lru_cache()
+def get_username_resolver(api_base_url: str) -> GithubUsernameResolver:
+    """Return the #GithubUsernameResolver for the given API, shared across the process and cached on disk in the
+    #USERNAME_CACHE_DIRECTORY."""
+
+    return GithubUsernameResolver(api_base_url, DirectoryCache(USERNAME_CACHE_DIRECTORY, max_size=1024 * 1024))
+
+
 def github_get_username_from_email(api_base_url: str, email: str) -> str | None:
-    assert email, "no email address"
-    response = requests.get(f"{api_base_url}/search/users", params={"q": email})
-    response.raise_for_status()
-    results = response.json()
-    if not results["items"]:
-        return None
-    return results["items"][0]["login"]
+    return get_username_resolver(api_base_url).resolve(email)
+
+
+#: Matches issue and pull request URLs, capturing the domain, owner, repository name and issue number.
+_ISSUE_URL_REGEX = re.compile(r"https?://([\w\-\.]+)/(?:|.+/)([\w\-\.\_]+)/([\w\-\.\_]+)/(?:pulls?|issues)/(\d+)")
+
+
+@functools.lru_cache(maxsize=4096)
+def _get_issue_shortform(repo: str, issue_url: str) -> str:
+    """Internal. Returns the shortform of an issue or pull request URL relative to the GitHub repository *repo*, see
+    #GithubRepositoryHost.repo. The result is memoized, as the same URLs are normalized repeatedly when validating
+    changelogs."""
+
+    match = _ISSUE_URL_REGEX.search(issue_url)
+    if match:
+        domain, owner, repo_name, issue_id = match.groups()
+        if domain == "github.com" and repo == (owner + "/" + repo_name):
+            return issue_id
+        elif repo == (domain + "/" + owner + "/" + repo_name):
+            return issue_id
+        result = owner + "/" + repo_name + "#" + issue_id
+        if domain != "github.com":
+            result = domain + "/" + result
+        return result
+    raise ValueError(f"invalid issue URL: {issue_url!r}")
 
 
 @dataclasses.dataclass
@@ -49,28 +204,21 @@ class GithubRepositoryHost(RepositoryHost):
         return parts[-2], parts[-1]
 
     def _get_issue_shortform(self, issue_url: str) -> str:
-        match = re.search(
-            r"https?://([\w\-\.]+)/(?:|.+/)([\w\-\.\_]+)/([\w\-\.\_]+)/(?:pulls?|issues)/(\d+)", issue_url
-        )
-        if match:
-            domain, owner, repo, issue_id = match.groups()
-            if domain == "github.com" and self.repo == (owner + "/" + repo):
-                return issue_id
-            elif self.repo == (domain + "/" + owner + "/" + repo):
-                return issue_id
-            result = owner + "/" + repo + "#" + issue_id
-            if domain != "github.com":
-                result = domain + "/" + result
-            return result
-        raise ValueError(f"invalid issue URL: {issue_url!r}")
+        return _get_issue_shortform(self.repo, issue_url)
 
     def get_username(self, repository: Repository) -> str | None:
         vcs = repository.vcs()
         assert vcs
         email = vcs.get_author().email
+        if not email:
+            return None
         username = github_get_username_from_email(self._get_api_url(), email)
         return ("@" + username) if username else None
 
+    def get_usernames_by_email(self, emails: t.Sequence[str]) -> dict[str, str | None]:
+        usernames = get_username_resolver(self._get_api_url()).resolve_many(emails)
+        return {email: ("@" + username) if username else None for email, username in usernames.items()}
+
     def get_issue_by_reference(self, issue_reference: str) -> Issue:
         issue_reference = issue_reference.lstrip("#")
         if issue_reference.isnumeric():
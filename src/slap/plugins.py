@@ -12,6 +12,7 @@ if t.TYPE_CHECKING:
     from poetry.core.constraints.version import Version  # type: ignore[import]
 
     from slap.application import IO, Application
+    from slap.changelog import ChangelogManager, ManagedChangelog
     from slap.check import Check
     from slap.project import Dependencies, Package, Project
     from slap.python.dependency import Dependency
@@ -129,6 +130,13 @@ class CheckPlugin(abc.ABC):
     def get_application_checks(self, app: Application) -> t.Iterable[Check]:
         return []
 
+    def get_project_check_inputs(self, project: Project) -> t.Sequence[Path] | None:
+        """Return the files that the results of #get_project_checks() depend on. As long as none of these files
+        change, `slap check` reuses the results of a previous run instead of running the checks again. The default
+        implementation returns `None`, which means that the checks are always run."""
+
+        return None
+
 
 class ReleasePlugin(abc.ABC):
     """This plugin type provides additional references to the project's version number allowing `slap release` to
@@ -165,6 +173,41 @@ class VersionIncrementingRulePlugin(abc.ABC):
         ...
 
 
+class ChangelogRendererPlugin(abc.ABC):
+    """This plugin type renders changelogs in a specific output format for the `slap changelog export` command. The
+    builtin renderers are implemented in #slap.ext.changelog_renderers.
+
+    Releases are rendered one at a time with #render_release() and written joined by the #separator, preceded by the
+    output of #begin() and followed by the output of #end(). With `slap changelog export --incremental`, the output of
+    #render_release() is reused for releases whose changelog file did not change, so it must not depend on anything
+    but the changelog and the #ChangelogManager.
+    """
+
+    ENTRYPOINT = "slap.plugins.changelog_renderer"
+
+    #: The string that is written between two releases.
+    separator: t.ClassVar[str] = "\n"
+
+    #: The version of the renderer's output. Increment it when the output of #render_release() changes, so that
+    #: releases rendered by a previous version are not reused by `slap changelog export --incremental`.
+    version: t.ClassVar[int] = 1
+
+    def begin(self, manager: ChangelogManager) -> str:
+        """Return the text that is written before the first release."""
+
+        return ""
+
+    @abc.abstractmethod
+    def render_release(self, manager: ChangelogManager, changelog: ManagedChangelog) -> str:
+        """Render a single release. The *changelog* may be the unreleased changelog, in which case its `version` is
+        `None`. Note that the unreleased changelog may not exist."""
+
+    def end(self, manager: ChangelogManager) -> str:
+        """Return the text that is written after the last release."""
+
+        return ""
+
+
 class RepositoryCIPlugin(abc.ABC):
     """This plugin type can be used with the `slap changelog update-pr -use <plugin_name>` option. It provides all the
     details derivable from the environment (e.g. environment variables available from CI builds) that can be used to
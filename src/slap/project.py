@@ -86,20 +86,26 @@ class Project(Configuration):
     dependencies: Once[Dependencies]
 
     def __init__(self, repository: Repository, directory: Path) -> None:
-        super().__init__(directory)
-        from nr.util.functional import Once
-
         from slap.util.toml_file import TomlFile
 
+        super().__init__(directory)
         self.repository = repository
         self.usercfg = TomlFile(Path("~/.config/slap/config.toml").expanduser())
-        self.handler = Once(self._get_project_handler)
-        self.config = Once(self._get_project_configuration)
-        self.packages = Once(self._get_packages)
-        self.readme = Once(self._get_readme)
-        self.dependencies = Once(self._get_dependencies)
-        self.dist_name = Once(self._get_dist_name)
-        self.version = Once(self._get_version)
+
+    def reload(self) -> None:
+        from nr.util.functional import Once
+
+        from slap.util.profiling import traced
+
+        super().reload()
+        directory = str(self.directory)
+        self.handler = Once(traced(self._get_project_handler, "Project.handler", "project", project=directory))
+        self.config = Once(traced(self._get_project_configuration, "Project.config", "project", project=directory))
+        self.packages = Once(traced(self._get_packages, "Project.packages", "project", project=directory))
+        self.readme = Once(traced(self._get_readme, "Project.readme", "project", project=directory))
+        self.dependencies = Once(traced(self._get_dependencies, "Project.dependencies", "project", project=directory))
+        self.dist_name = Once(traced(self._get_dist_name, "Project.dist_name", "project", project=directory))
+        self.version = Once(traced(self._get_version, "Project.version", "project", project=directory))
 
     def _get_project_configuration(self) -> ProjectConfig:
         """Loads the project-level configuration."""
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import contextlib
+import contextvars
 import dataclasses
+import functools
+import os
 import re
 import typing as t
 from pathlib import Path
@@ -9,6 +13,54 @@ from nr.util.generic import T
 from nr.util.singleton import NotSet
 
 
+class VersionRefScanner:
+    """Reads files and matches version reference patterns in their contents. While a scanner is active (see
+    #activate()), #match_version_ref_pattern() and #match_version_ref_pattern_on_lines() read every file only once
+    through the scanner, no matter how many patterns are matched against it. The buffers that the version references
+    were matched in can be retrieved with #read() to substitute the new version into them."""
+
+    def __init__(self) -> None:
+        self._buffers: dict[Path, str] = {}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(files={len(self._buffers)})"
+
+    def read(self, filename: Path) -> str:
+        """Return the contents of the file, reading it only on first access."""
+
+        key = Path(os.path.abspath(filename))
+        if key not in self._buffers:
+            with open(filename) as fp:
+                self._buffers[key] = fp.read()
+        return self._buffers[key]
+
+    @contextlib.contextmanager
+    def activate(self) -> t.Iterator[VersionRefScanner]:
+        """Make this the scanner that is used by the `match_version_ref_pattern*()` functions in the context."""
+
+        token = _current_scanner.set(self)
+        try:
+            yield self
+        finally:
+            _current_scanner.reset(token)
+
+
+_current_scanner: contextvars.ContextVar[VersionRefScanner | None] = contextvars.ContextVar(
+    "_current_scanner", default=None
+)
+
+
+def get_version_ref_scanner() -> VersionRefScanner:
+    """Return the active #VersionRefScanner, or a new one (that is not activated) if there is no active scanner."""
+
+    return _current_scanner.get() or VersionRefScanner()
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_pattern(pattern: str) -> re.Pattern[str]:
+    return re.compile(pattern, re.M | re.S)
+
+
 @t.overload
 def match_version_ref_pattern(filename: Path, pattern: str) -> VersionRef:
     ...
@@ -29,16 +81,15 @@ def match_version_ref_pattern(filename: Path, pattern: str, fallback: NotSet | T
       pattern: The regular expression that contains at least one capturing group.
     """
 
-    compiled_pattern = re.compile(pattern, re.M | re.S)
+    compiled_pattern = _compile_pattern(pattern)
     if not compiled_pattern.groups:
         raise ValueError(
             f"pattern must contain at least one capturing group (filename: {filename!r}, pattern: {pattern!r})"
         )
 
-    with open(filename) as fp:
-        match = compiled_pattern.search(fp.read())
-        if match:
-            return VersionRef(filename, match.start(1), match.end(1), match.group(1), match.group(0))
+    match = compiled_pattern.search(get_version_ref_scanner().read(filename))
+    if match:
+        return VersionRef(filename, match.start(1), match.end(1), match.group(1), match.group(0))
 
     if fallback is not NotSet.Value:
         return fallback
@@ -49,9 +100,9 @@ def match_version_ref_pattern_on_lines(filename: Path, pattern: str) -> list[Ver
     """Like #match_version_ref_pattern(), but returns all matches, but matches it on a line-by-line basis. The
     *pattern* must have a `version` group. The pattern is compiled with #re.M and #re.S flags."""
 
-    compiled_pattern = re.compile(pattern, re.M | re.S)
+    compiled_pattern = _compile_pattern(pattern)
     refs = []
-    for match in re.finditer(compiled_pattern, filename.read_text()):
+    for match in compiled_pattern.finditer(get_version_ref_scanner().read(filename)):
         refs.append(
             VersionRef(
                 file=filename,
@@ -9,6 +9,7 @@ from databind.core.settings import Union
 from nr.util.functional import Once
 
 from slap.configuration import Configuration
+from slap.util.profiling import traced
 
 if t.TYPE_CHECKING:
     from slap.plugins import RepositoryHandlerPlugin
@@ -51,6 +52,15 @@ class RepositoryHost(abc.ABC):
         """
         ...
 
+    def get_usernames_by_email(self, emails: t.Sequence[str]) -> dict[str, str | None]:
+        """
+        :param emails: A list of email addresses to resolve, possibly containing duplicates.
+        :return: A mapping of each email address to the username, or `None` if the username could not be resolved.
+            The default implementation cannot resolve any usernames.
+        """
+
+        return {email: None for email in emails}
+
     @abc.abstractmethod
     def get_issue_by_reference(self, issue_reference: str) -> Issue:
         ...
@@ -81,9 +91,14 @@ class Repository(Configuration):
 
     def __init__(self, directory: Path) -> None:
         super().__init__(directory)
+        self.vcs = Once(traced(self._get_vcs, "Repository.vcs", "repository"))
+
+    def reload(self) -> None:
+        """Reloads the repository configuration. This also discards the #projects, so they are created anew."""
+
+        super().reload()
         self._handler = Once(self._get_repository_handler)
-        self.projects = Once(self._get_projects)
-        self.vcs = Once(self._get_vcs)
+        self.projects = Once(traced(self._get_projects, "Repository.projects", "repository"))
         self.host = Once(self._get_repository_host)
 
     @property
@@ -152,6 +167,39 @@ class Repository(Configuration):
 
         return list(topological_sort(graph, sorting_key=lambda p: p.id))
 
+    def get_projects_affected_by(self, files: t.Iterable[Path]) -> list[Project]:
+        """Return the projects that contain any of the given *files*, plus all projects that depend on them directly or
+        transitively (see #Project.get_interdependencies()). The result is in topological order. Files that are not
+        located in any project directory are ignored. If projects are nested, a file belongs to the innermost one."""
+
+        projects = self.projects()
+        directories = sorted(
+            ((project.directory.resolve(), project) for project in projects),
+            key=lambda x: len(x[0].parts),
+            reverse=True,
+        )
+
+        affected: set[Project] = set()
+        for file in files:
+            for directory, project in directories:
+                if file.is_relative_to(directory):
+                    affected.add(project)
+                    break
+
+        dependents: dict[Project, list[Project]] = {project: [] for project in projects}
+        for project in projects:
+            for dependency in project.get_interdependencies(projects):
+                dependents[dependency].append(project)
+
+        queue = list(affected)
+        while queue:
+            for dependent in dependents[queue.pop()]:
+                if dependent not in affected:
+                    affected.add(dependent)
+                    queue.append(dependent)
+
+        return [project for project in self.get_projects_ordered() if project in affected]
+
     def _get_vcs(self) -> Vcs | None:
         from nr.util.optional import Optional
 
@@ -0,0 +1,96 @@
+""" A simple on-disk cache for JSON serializable values, used by Slap to store results in the `.slap/cache/` directory
+of a repository. """
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import typing as t
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class DirectoryCache:
+    """Stores JSON serializable values in one file per key in the given *directory*. After every write, the least
+    recently used entries are evicted until the total size of the entries does not exceed *max_size* bytes. Reading
+    an entry marks it as recently used. Writes are atomic, so the cache can be used from multiple threads and
+    processes at the same time."""
+
+    #: The default maximum size of the cache directory in bytes.
+    DEFAULT_MAX_SIZE: t.ClassVar[int] = 64 * 1024 * 1024
+
+    def __init__(self, directory: Path, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.directory = directory
+        self.max_size = max_size
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(directory="{self.directory}")'
+
+    def _get_path(self, key: str) -> Path:
+        if not re.fullmatch(r"[\w.-]+", key):
+            raise ValueError(f"invalid cache key: {key!r}")
+        return self.directory / (key + ".json")
+
+    def get(self, key: str) -> t.Any | None:
+        """Return the value stored under the given *key*, or `None` if there is no such entry."""
+
+        path = self._get_path(key)
+        try:
+            value = json.loads(path.read_text())
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            return None
+        return value
+
+    def put(self, key: str, value: t.Any) -> None:
+        """Store the *value* under the given *key* and evict old entries if the cache exceeds its maximum size."""
+
+        path = self._get_path(key)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmpname = tempfile.mkstemp(dir=self.directory, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as fp:
+                json.dump(value, fp)
+            os.replace(tmpname, path)
+        except BaseException:
+            os.unlink(tmpname)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache does not exceed its maximum size."""
+
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                entries.append((path.stat(), path))
+            except FileNotFoundError:
+                pass
+
+        total_size = sum(stat.st_size for stat, _ in entries)
+        for stat, path in sorted(entries, key=lambda x: x[0].st_mtime):
+            if total_size <= self.max_size:
+                break
+            logger.debug("Evicting cache entry <val>%s</val>", path)
+            path.unlink(missing_ok=True)
+            total_size -= stat.st_size
+
+
+def fingerprint(*values: str, files: t.Iterable[Path] = (), root: Path | None = None) -> str:
+    """Compute a hex digest over the given string *values* and the paths and contents of the given *files*. The order
+    of the *files* does not matter. If a *root* is given, the file paths are hashed relative to it."""
+
+    hasher = hashlib.sha256()
+    for value in values:
+        hasher.update(value.encode())
+        hasher.update(b"\0")
+    for file in sorted(files):
+        hasher.update(str(file.relative_to(root) if root else file).encode())
+        hasher.update(b"\0")
+        hasher.update(hashlib.sha256(file.read_bytes()).digest())
+    return hasher.hexdigest()
@@ -1,5 +1,9 @@
 """
-Scraper for [SPDX][1].
+Scraper for [SPDX][1], and an offline index of the SPDX licenses that is shipped with Slap (see #SpdxLicenseIndex).
+
+The index can be rebuilt from the latest SPDX license list with
+
+    $ python -m slap.util.external.licenses --build-index
 
   [1]: https://spdx.org/licenses/
 """
@@ -7,11 +11,21 @@ Scraper for [SPDX][1].
 from __future__ import annotations
 
 import dataclasses
+import functools
+import json
+import mmap
+import re
+import struct
 import typing as t
+import zlib
+from pathlib import Path
 
-import requests
 from databind.core.settings import Alias
 
+from slap.util.http import get_http_client
+
+SPDX_LICENSES_URL = "https://raw.githubusercontent.com/spdx/license-list-data/master/json/licenses.json"
+
 
 @dataclasses.dataclass
 class SpdxLicense:
@@ -28,7 +42,7 @@ class SpdxLicense:
     def get_details(self) -> SpdxLicenseDetails:
         import databind.json
 
-        response = requests.get(self.details_url)
+        response = get_http_client().get(self.details_url, cache=True)
         response.raise_for_status()
         return databind.json.load(response.json(), SpdxLicenseDetails)
 
@@ -61,13 +75,12 @@ def wrap_license_text(license_text: str, width: int = 79) -> str:
             words: list[str] = []
             length = -1
             for word in line:
-                if length + 1 + len(word) >= width:
+                if words and length + 1 + len(word) >= width:
                     lines.append(" ".join(words))
                     words = []
                     length = -1
-                else:
-                    words.append(word)
-                    length += len(word) + 1
+                words.append(word)
+                length += len(word) + 1
             if words:
                 lines.append(" ".join(words))
         else:
@@ -80,10 +93,9 @@ def get_spdx_licenses() -> dict[str, SpdxLicense]:
 
     import databind.json
 
-    url = "https://raw.githubusercontent.com/spdx/license-list-data/master/json/licenses.json"
-    response = requests.get(url)
+    response = get_http_client().get(SPDX_LICENSES_URL, cache=True)
     response.raise_for_status()
-    licenses = databind.json.load(response.json()["licenses"], list[SpdxLicense], filename=url)
+    licenses = databind.json.load(response.json()["licenses"], list[SpdxLicense], filename=SPDX_LICENSES_URL)
     return {line.license_id: line for line in licenses}
 
 
@@ -93,11 +105,247 @@ def get_spdx_license_details(license_id: str) -> SpdxLicenseDetails:
     import databind.json
 
     url = f"https://spdx.org/licenses/{license_id}.json"
-    response = requests.get(url)
+    response = get_http_client().get(url, cache=True)
     response.raise_for_status()
     return databind.json.load(response.json(), SpdxLicenseDetails, filename=url)
 
 
+SPDX_INDEX_FILENAME = Path(__file__).parent / "data" / "spdx-licenses.bin"
+
+
+@dataclasses.dataclass(frozen=True)
+class SpdxLicenseInfo:
+    """The metadata of an SPDX license in the #SpdxLicenseIndex."""
+
+    license_id: str
+    name: str
+    is_osi_approved: bool
+    is_fsf_libre: bool | None
+    is_deprecated_license_id: bool
+
+
+class SpdxLicenseIndex:
+    """A compact, read-only index of SPDX licenses stored in a single file that is memory-mapped. The metadata of all
+    licenses is loaded when the index is opened, but the license texts are only decompressed when they are requested
+    with #get_text(). License IDs are matched case-insensitively, as required by the SPDX specification.
+
+    The file starts with #MAGIC, followed by the length of the header as a 32-bit big-endian integer and the
+    zlib-compressed JSON header. The header contains the version of the license list, the location of the shared
+    compression dictionary and of the compressed text of every license, relative to the end of the header. Texts are
+    compressed individually with zlib using the shared dictionary, which consists of phrases that are common to many
+    licenses; identical texts are stored only once."""
+
+    MAGIC: t.ClassVar[bytes] = b"SLAPSPDX"
+
+    def __init__(self, path: Path = SPDX_INDEX_FILENAME) -> None:
+        self.path = path
+        with path.open("rb") as fp:
+            self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[: len(self.MAGIC)] != self.MAGIC:
+            raise ValueError(f'"{path}" is not an SPDX license index')
+        offset = len(self.MAGIC) + 4
+        (header_length,) = struct.unpack(">I", self._mmap[len(self.MAGIC) : offset])
+        header = json.loads(zlib.decompress(self._mmap[offset : offset + header_length]))
+        self._data_offset = offset + header_length
+        self.version: str = header["version"]
+        self._dictionary: tuple[int, int] = tuple(header["dictionary"])  # type: ignore[assignment]
+        self._licenses: dict[str, tuple[SpdxLicenseInfo, int, int]] = {}
+        for license_id, name, osi, fsf, deprecated, text_offset, text_length in header["licenses"]:
+            info = SpdxLicenseInfo(license_id, name, osi, fsf, deprecated)
+            self._licenses[license_id.lower()] = (info, text_offset, text_length)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(path="{self.path}", version={self.version!r})'
+
+    def __contains__(self, license_id: object) -> bool:
+        return isinstance(license_id, str) and license_id.lower() in self._licenses
+
+    def __iter__(self) -> t.Iterator[SpdxLicenseInfo]:
+        return (info for info, _, _ in self._licenses.values())
+
+    def __len__(self) -> int:
+        return len(self._licenses)
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def _read(self, offset: int, length: int) -> bytes:
+        start = self._data_offset + offset
+        return self._mmap[start : start + length]
+
+    def get(self, license_id: str) -> SpdxLicenseInfo | None:
+        """Return the metadata of the license with the given ID, or `None` if it is not an SPDX license ID."""
+
+        entry = self._licenses.get(license_id.lower())
+        return entry[0] if entry else None
+
+    def get_text(self, license_id: str) -> str:
+        """Return the text of the license with the given ID.
+
+        Raises KeyError: If *license_id* is not an SPDX license ID."""
+
+        _, offset, length = self._licenses[license_id.lower()]
+        decompressor = zlib.decompressobj(zdict=self._zdict)
+        return (decompressor.decompress(self._read(offset, length)) + decompressor.flush()).decode()
+
+    @functools.cached_property
+    def _zdict(self) -> bytes:
+        return self._read(*self._dictionary)
+
+    @functools.cached_property
+    def _replacements(self) -> dict[str, str]:
+        """Maps deprecated license IDs (lowercase) to the ID of the non-deprecated license with the same name, e.g.
+        `GPL-3.0` to `GPL-3.0-only`. Like in SPDX, an ID without a version qualifier refers to the "only" variant
+        (e.g. `AGPL-3.0` to `AGPL-3.0-only`). Deprecated IDs without a replacement are mapped to themselves."""
+
+        current = {info.name: info.license_id for info in self if not info.is_deprecated_license_id}
+        return {
+            info.license_id.lower(): current.get(info.name) or current.get(f"{info.name} only") or info.license_id
+            for info in self
+            if info.is_deprecated_license_id
+        }
+
+    def _get_current_id(self, license_id: str) -> str:
+        info = self.get(license_id)
+        assert info is not None, license_id
+        return self._replacements.get(info.license_id.lower(), info.license_id)
+
+    @functools.cached_property
+    def _aliases(self) -> dict[str, str]:
+        aliases: dict[str, str] = {}
+        # Non-deprecated licenses take precedence, and IDs take precedence over names.
+        licenses = sorted(self, key=lambda info: info.is_deprecated_license_id)
+        for attr in ("license_id", "name"):
+            for info in licenses:
+                aliases.setdefault(_get_license_alias_key(getattr(info, attr)), self._get_current_id(info.license_id))
+        return aliases
+
+    def normalize(self, value: str) -> str | None:
+        """Return the SPDX license ID for a free-form license *value*, such as the `License` field in the metadata of
+        a Python distribution. The value is matched against the IDs and names of the licenses, ignoring case,
+        punctuation and filler words (e.g. `Apache License, Version 2.0` matches `Apache-2.0`). A parenthesized
+        abbreviation, as in `Mozilla Public License 2.0 (MPL 2.0)`, is tried as well. SPDX license expressions that
+        consist only of license IDs are returned with the IDs in their canonical case. Deprecated license IDs are
+        replaced by the current ID of the same license, if there is one (e.g. `GPL-3.0` by `GPL-3.0-only`). Returns
+        `None` if the value does not match any license."""
+
+        value = value.strip()
+        if value in self:
+            return self._get_current_id(value)
+
+        tokens = re.findall(r"[()]|[^\s()]+", value)
+        if len(tokens) > 1 and all(token in self or token.upper() in ("AND", "OR", "(", ")") for token in tokens):
+            expression = " ".join(self._get_current_id(token) if token in self else token.upper() for token in tokens)
+            return expression.replace("( ", "(").replace(" )", ")")
+
+        candidates = [value]
+        if match := re.fullmatch(r"(.*?)\s*\((.*)\)", value):
+            candidates += [match.group(1), match.group(2)]
+        for candidate in candidates:
+            if license_id := self._aliases.get(_get_license_alias_key(candidate)):
+                return license_id
+        return None
+
+    @staticmethod
+    def build(path: Path, version: str, licenses: t.Iterable[tuple[SpdxLicenseInfo, str]]) -> None:
+        """Build an index file from the given licenses and their texts."""
+
+        licenses = sorted(licenses, key=lambda x: x[0].license_id.lower())
+        zdict = _build_compression_dictionary([text for _, text in licenses])
+        data = bytearray(zdict)
+        texts: dict[str, tuple[int, int]] = {}
+        header_licenses = []
+        for info, text in licenses:
+            if text not in texts:
+                compressor = zlib.compressobj(9, zdict=zdict)
+                compressed = compressor.compress(text.encode()) + compressor.flush()
+                texts[text] = (len(data), len(compressed))
+                data += compressed
+            header_licenses.append(
+                [
+                    info.license_id,
+                    info.name,
+                    info.is_osi_approved,
+                    info.is_fsf_libre,
+                    info.is_deprecated_license_id,
+                    *texts[text],
+                ]
+            )
+
+        header = {"version": version, "dictionary": [0, len(zdict)], "licenses": header_licenses}
+        compressed_header = zlib.compress(json.dumps(header, separators=(",", ":")).encode(), 9)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as fp:
+            fp.write(SpdxLicenseIndex.MAGIC)
+            fp.write(struct.pack(">I", len(compressed_header)))
+            fp.write(compressed_header)
+            fp.write(data)
+
+
+def _get_license_alias_key(value: str) -> str:
+    # "Apache License, Version 2.0" -> "apache 2", "GPLv3+" -> "gpl 3 or later"
+    value = value.lower().replace("+", " or later ")
+    value = re.sub(r"(?<=[a-z])v(?=\d)", " ", value)
+    tokens = re.findall(r"[a-z]+|\d+", value)
+    tokens = [token for token in tokens if token not in ("the", "license", "licence", "version", "v")]
+    tokens = [token for i, token in enumerate(tokens) if not (token == "0" and i > 0 and tokens[i - 1].isdigit())]
+    return " ".join(tokens)
+
+
+def _build_compression_dictionary(texts: t.Sequence[str], size: int = 32768) -> bytes:
+    """Build a zlib dictionary from the sentences that occur in the most licenses. zlib can reference data in the
+    dictionary like previously seen data, which greatly improves the compression of individual license texts."""
+
+    import collections
+
+    counter: collections.Counter[str] = collections.Counter()
+    for text in set(texts):
+        counter.update({s for s in re.split(r"(?<=[.;:])\s+|\n+", text) if 20 < len(s) < 400})
+
+    sentences: list[str] = []
+    total = 0
+    for sentence, count in sorted(counter.items(), key=lambda x: (-x[1] * len(x[0]), x[0])):
+        if count < 3:
+            break
+        if total + len(sentence) + 1 <= size:
+            sentences.append(sentence)
+            total += len(sentence) + 1
+
+    # zlib prefers data at the end of the dictionary, so the most valuable sentences go last.
+    return "\n".join(reversed(sentences)).encode()
+
+
+@functools.lru_cache(maxsize=None)
+def get_spdx_index() -> SpdxLicenseIndex:
+    """Return the SPDX license index that is shipped with Slap, opening it on first use."""
+
+    return SpdxLicenseIndex()
+
+
+def fetch_spdx_index_entries() -> tuple[str, list[tuple[SpdxLicenseInfo, str]]]:
+    """Fetch the version of the SPDX license list, and the metadata and text of every license in it."""
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    response = get_http_client().get(SPDX_LICENSES_URL, cache=True)
+    response.raise_for_status()
+    data = response.json()
+
+    def _fetch(license: dict[str, t.Any]) -> tuple[SpdxLicenseInfo, str]:
+        details = get_spdx_license_details(license["licenseId"])
+        info = SpdxLicenseInfo(
+            license["licenseId"],
+            license["name"],
+            license["isOsiApproved"],
+            license.get("isFsfLibre"),
+            license["isDeprecatedLicenseId"],
+        )
+        return info, details.license_text
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        return data["licenseListVersion"], list(executor.map(_fetch, data["licenses"]))
+
+
 if __name__ == "__main__":
     import argparse
 
@@ -107,8 +355,13 @@ if __name__ == "__main__":
     parser.add_argument("-l", "--list", action="store_true")
     parser.add_argument("license", nargs="?")
     parser.add_argument("-w", "--wrap", type=int, default=80)
+    parser.add_argument("--build-index", action="store_true", help="rebuild the bundled SPDX license index")
     args = parser.parse_args()
-    if args.list:
+    if args.build_index:
+        version, entries = fetch_spdx_index_entries()
+        SpdxLicenseIndex.build(SPDX_INDEX_FILENAME, version, entries)
+        print(f"Built index of {len(entries)} licenses (version {version})")
+    elif args.list:
         for key, value in sorted(get_spdx_licenses().items()):
             print(f'{colored(key, attrs=["bold"])}: {value.name}')
     elif args.license:
@@ -1,56 +1,253 @@
-import datetime
+""" Offline database of the trove classifiers accepted by PyPI.
+
+A compressed snapshot of the classifiers is shipped with Slap, so validating classifiers needs no network access. The
+snapshot can be updated from the latest release of the [trove-classifiers][1] package on PyPI with
+
+    $ slap classifiers refresh
+
+which stores the new snapshot in the user's cache directory. Both snapshots record the version of the package that
+they were created from, and the newer one is used, so a snapshot refreshed by the user does not shadow the bundled
+snapshot of a later Slap release. To update the snapshot that is shipped with Slap, run
+
+    $ python -m slap.util.external.pypi_classifiers --refresh --bundled
+
+  [1]: https://pypi.org/project/trove-classifiers/
+"""
+
+from __future__ import annotations
+
+import difflib
+import functools
+import gzip
 import logging
 import os
-import time
+import typing as t
+from pathlib import Path
 
-import requests
-
-CACHE_FILENAME = os.path.expanduser("~/.local/slap/classifiers-cache.txt")
-CACHE_TTL = 60 * 60 * 24 * 7  # 7 days
-CLASSIFIERS_URL = "https://pypi.org/pypi?%3Aaction=list_classifiers"
+BUNDLED_FILENAME = Path(__file__).parent / "data" / "classifiers.txt.gz"
+CACHE_FILENAME = Path("~/.local/slap/classifiers.txt.gz").expanduser()
+TROVE_CLASSIFIERS_URL = "https://pypi.org/pypi/trove-classifiers/json"
+SEPARATOR = " :: "
 logger = logging.getLogger(__name__)
-_runtime_cache: list[str] | None = None
+
+
+class ClassifierDatabase:
+    """A set of trove classifiers that can be tested for membership in constant time. The classifiers are also
+    arranged in a trie by their ` :: ` separated segments, which is used to list the classifiers under a prefix and
+    to suggest close matches for invalid classifiers."""
+
+    def __init__(self, classifiers: t.Iterable[str], source: str | None = None) -> None:
+        self.classifiers = frozenset(classifiers)
+        self.source = source
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(len={len(self)}, source={self.source!r})"
+
+    @property
+    def version(self) -> tuple[int, ...] | None:
+        """The version of the `trove-classifiers` package that the classifiers were taken from, see #parse_version()."""
+
+        return parse_version(self.source)
+
+    def __contains__(self, classifier: object) -> bool:
+        return classifier in self.classifiers
+
+    def __len__(self) -> int:
+        return len(self.classifiers)
+
+    def __iter__(self) -> t.Iterator[str]:
+        return iter(sorted(self.classifiers))
+
+    @functools.cached_property
+    def _trie(self) -> dict[str, dict]:
+        trie: dict[str, dict] = {}
+        for classifier in self.classifiers:
+            node = trie
+            for segment in classifier.split(SEPARATOR):
+                node = node.setdefault(segment, {})
+        return trie
+
+    def _find_node(self, segments: t.Sequence[str]) -> dict[str, dict] | None:
+        node = self._trie
+        for segment in segments:
+            if segment not in node:
+                return None
+            node = node[segment]
+        return node
+
+    def get_children(self, prefix: str) -> list[str]:
+        """Return the sorted classifiers, or partial classifiers, one segment below the given *prefix*. An empty
+        *prefix* returns the top-level categories (e.g. `Development Status`)."""
+
+        segments = prefix.split(SEPARATOR) if prefix else []
+        node = self._find_node(segments)
+        if node is None:
+            return []
+        return [SEPARATOR.join([*segments, child]) for child in sorted(node)]
+
+    def get_close_matches(self, classifier: str, n: int = 3) -> list[str]:
+        """Return up to *n* valid classifiers that are similar to the given (invalid) *classifier*. Segments are
+        matched one by one through the trie, first exactly, then ignoring case and finally by similarity, so that a
+        typo in one segment does not prevent finding the right classifier."""
+
+        segments = [segment.strip() for segment in classifier.split("::")]
+        node = self._trie
+        matched: list[str] = []
+        match: str | None
+        for segment in segments:
+            if segment in node:
+                match = segment
+            else:
+                by_case = {key.lower(): key for key in node}
+                match = by_case.get(segment.lower()) or next(
+                    iter(difflib.get_close_matches(segment, list(node), n=1, cutoff=0.6)), ""
+                )
+            if not match:
+                break
+            matched.append(match)
+            node = node[match]
+
+        prefix = SEPARATOR.join(matched)
+        candidates = [c for c in self.classifiers if c.startswith(prefix)] if matched else list(self.classifiers)
+        return difflib.get_close_matches(classifier, candidates, n=n, cutoff=0.0 if matched else 0.6)
+
+    @staticmethod
+    def read_source(path: Path) -> str | None:
+        """Read only the source from the header of a snapshot written with #save()."""
+
+        with gzip.open(path, "rt", encoding="utf-8") as fp:
+            line = fp.readline()
+        return line[1:].strip() if line.startswith("#") else None
+
+    @staticmethod
+    def load(path: Path) -> ClassifierDatabase:
+        """Load a snapshot written with #save(). Lines starting with `#` are comments."""
+
+        with gzip.open(path, "rt", encoding="utf-8") as fp:
+            lines = [line.rstrip("\n") for line in fp]
+        source = next((line[1:].strip() for line in lines if line.startswith("#")), None)
+        return ClassifierDatabase((line for line in lines if line and not line.startswith("#")), source)
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        # A fixed mtime keeps the compressed file reproducible.
+        with gzip.GzipFile(tmp, "wb", mtime=0) as fp:
+            if self.source:
+                fp.write(f"# {self.source}\n".encode())
+            fp.write("".join(f"{classifier}\n" for classifier in self).encode())
+        os.replace(tmp, path)
+
+
+def parse_version(source: str | None) -> tuple[int, ...] | None:
+    """Parse the version from the source of a snapshot created by #fetch_classifiers(), e.g. `trove-classifiers
+    2024.10.21.16`. Returns `None` if the source does not contain a version."""
+
+    if not source or not source.startswith("trove-classifiers "):
+        return None
+    parts = source.rpartition(" ")[2].split(".")
+    if not all(part.isdigit() for part in parts):
+        return None
+    return tuple(map(int, parts))
+
+
+def get_classifier_database_path() -> Path:
+    """Return the path of the snapshot that #get_classifier_database() loads. A snapshot refreshed with
+    #refresh_classifiers() is preferred over the snapshot bundled with Slap, unless the bundled snapshot was created
+    from a newer version of the `trove-classifiers` package."""
+
+    path = BUNDLED_FILENAME
+    if CACHE_FILENAME.is_file():
+        try:
+            cached_version = parse_version(ClassifierDatabase.read_source(CACHE_FILENAME))
+        except (OSError, EOFError, ValueError) as exc:
+            logger.warning("Ignoring invalid classifier snapshot <val>%s</val>: %s", CACHE_FILENAME, exc)
+        else:
+            bundled_version = parse_version(ClassifierDatabase.read_source(BUNDLED_FILENAME))
+            if cached_version is not None and (bundled_version is None or cached_version > bundled_version):
+                path = CACHE_FILENAME
+    return path
+
+
+@functools.lru_cache(maxsize=None)
+def get_classifier_database() -> ClassifierDatabase:
+    """Return the classifier database, loading it on first use from the snapshot returned by
+    #get_classifier_database_path()."""
+
+    path = get_classifier_database_path()
+    logger.debug("Loading trove classifiers from <val>%s</val>", path)
+    return ClassifierDatabase.load(path)
 
 
 def get_classifiers(force_refresh: bool = False) -> list[str]:
-    """
-    Loads the classifiers list from PyPI. Once loaded, the classifiers are cached on disk and
-    in memory. The cache on disk is valid for a maxmium of seven days. Specify the *force_refresh*
-    argument to ignore any caches.
-    """
-
-    global _runtime_cache
-    if not force_refresh and _runtime_cache is not None:
-        return list(_runtime_cache)
-
-    def _load_cachefile():
-        global _runtime_cache
-        with open(CACHE_FILENAME) as fp:
-            _runtime_cache = [x.rstrip("\n") for x in fp]
-        return list(_runtime_cache)
-
-    has_cachefile = not force_refresh and os.path.isfile(CACHE_FILENAME)
-    if has_cachefile and (time.time() - os.path.getmtime(CACHE_FILENAME)) < CACHE_TTL:
-        return _load_cachefile()
+    """Returns the sorted list of valid trove classifiers. If *force_refresh* is `True`, the classifiers are first
+    updated from PyPI (see #refresh_classifiers()). Prefer #get_classifier_database() for membership tests."""
+
+    if force_refresh:
+        refresh_classifiers()
+    return list(get_classifier_database())
+
+
+def fetch_classifiers() -> ClassifierDatabase:
+    """Fetch the classifiers from the latest release of the `trove-classifiers` package on PyPI.
+
+    Raises ValueError: If the response of PyPI or the wheel of the package does not look as expected."""
+
+    import ast
+    import io
+    import zipfile
+    from urllib.parse import urljoin
+
+    from slap.util.http import get_http_client
+
+    http = get_http_client()
+    response = http.get(TROVE_CLASSIFIERS_URL, cache=True, timeout=10)
+    response.raise_for_status()
+    release = response.json()
     try:
-        classifiers = requests.get(CLASSIFIERS_URL, timeout=1).text.split("\n")
-    except requests.exceptions.ReadTimeout as exc:
-        if has_cachefile:
-            cache_timestamp = datetime.datetime.fromtimestamp(os.path.getmtime(CACHE_FILENAME))
-            message = " Falling back to cached classifiers (timestamp: {})".format(cache_timestamp)
-        else:
-            message = " Returning no classifiers. Subsequent classifier validation might raise."
-        logger.warning('Error retrieving classifiers from "%s" (%s).%s', CLASSIFIERS_URL, exc, message)
-        if has_cachefile:
-            return _load_cachefile()
-        _runtime_cache = []
-        return []
+        version = release["info"]["version"]
+        wheel_url = next((url["url"] for url in release["urls"] if url["packagetype"] == "bdist_wheel"), None)
+    except (KeyError, TypeError) as exc:
+        raise ValueError(f"unexpected response from {response.url}: {exc!r}")
+    if wheel_url is None:
+        raise ValueError(f"no wheel found in the release of {response.url}")
+    wheel_url = urljoin(response.url, wheel_url)
+    response = http.get(wheel_url, cache=True)
+    response.raise_for_status()
+
     try:
-        os.makedirs(os.path.dirname(CACHE_FILENAME), exist_ok=True)
-        with open(CACHE_FILENAME, "w") as fp:
-            fp.writelines((x + "\n" for x in classifiers))
-    except BaseException:
-        logger.exception("Unable to write classifiers cache file.")
-
-    _runtime_cache = classifiers
-    return list(classifiers)
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            module = ast.parse(archive.read("trove_classifiers/__init__.py"))
+    except (KeyError, SyntaxError, zipfile.BadZipFile) as exc:
+        raise ValueError(f"unexpected wheel {wheel_url}: {exc}")
+    for node in module.body:
+        if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            if node.target.id == "sorted_classifiers" and node.value is not None:
+                classifiers = ast.literal_eval(node.value)
+                return ClassifierDatabase(classifiers, f"trove-classifiers {version}")
+    raise ValueError(f"no classifiers found in {wheel_url}")
+
+
+def refresh_classifiers(path: Path = CACHE_FILENAME) -> ClassifierDatabase:
+    """Fetch the latest classifiers (see #fetch_classifiers()) and store them as a snapshot in the given *path*."""
+
+    database = fetch_classifiers()
+    database.save(path)
+    get_classifier_database.cache_clear()
+    return database
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--refresh", action="store_true", help="fetch the latest classifiers from PyPI")
+    parser.add_argument("--bundled", action="store_true", help="with --refresh, update the bundled snapshot")
+    parser.add_argument("prefix", nargs="?", default="", help="list the classifiers under this prefix")
+    args = parser.parse_args()
+    if args.refresh:
+        database = refresh_classifiers(BUNDLED_FILENAME if args.bundled else CACHE_FILENAME)
+        print(f"Fetched {len(database)} classifiers ({database.source})")
+    else:
+        for classifier in get_classifier_database().get_children(args.prefix):
+            print(classifier)
@@ -0,0 +1,229 @@
+""" The HTTP client shared by Slap's network integrations (GitHub, PyPI, SPDX). It pools connections per host, retries
+idempotent requests with an exponential backoff and caches `GET` responses that carry an `ETag` or `Last-Modified`
+header on disk, so that repeated requests are answered from the cache after a `304 Not Modified` response. """
+
+from __future__ import annotations
+
+import base64
+import dataclasses
+import functools
+import hashlib
+import logging
+import threading
+import time
+import typing as t
+from pathlib import Path
+from urllib.parse import urlparse
+
+from slap.util.cache import DirectoryCache
+
+if t.TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+#: The directory in which the shared #HttpClient caches responses.
+CACHE_DIRECTORY = Path("~/.local/slap/cache/http").expanduser()
+
+#: Headers that describe the encoding of the response body on the wire, which the cached body does not have anymore.
+_UNCACHED_HEADERS = frozenset(["content-encoding", "content-length", "transfer-encoding", "connection"])
+
+
+@dataclasses.dataclass
+class HostMetrics:
+    """Request statistics for a single host, see #HttpClient.metrics."""
+
+    #: The number of requests sent to the host, including conditional requests but not including retries.
+    requests: int = 0
+
+    #: The total time in seconds spent waiting for responses from the host.
+    seconds: float = 0.0
+
+    #: The number of conditional requests that were answered with `304 Not Modified`.
+    not_modified: int = 0
+
+    #: The number of requests that failed with an exception after all retries.
+    errors: int = 0
+
+
+class HttpClient:
+    """A thin wrapper around a #requests.Session that adds retries, a default timeout, conditional caching and
+    per-host timing metrics. It is safe to use the client from multiple threads.
+
+    :param cache: The cache for responses to `GET` requests with `cache=True`. If `None`, responses are not cached.
+    :param retries: The number of times a failed idempotent request is retried. Retries are performed on connection
+        errors and on `429` and `5xx` status codes, honoring the `Retry-After` header.
+    :param backoff_factor: The backoff factor for retries; the n-th retry waits `backoff_factor * 2 ** (n - 1)`
+        seconds.
+    :param timeout: The default timeout in seconds for requests.
+    :param pool_maxsize: The maximum number of connections kept alive per host.
+    """
+
+    def __init__(
+        self,
+        cache: DirectoryCache | None = None,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeout: float = 30,
+        pool_maxsize: int = 16,
+    ) -> None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.cache = cache
+        self.timeout = timeout
+        self.metrics: dict[str, HostMetrics] = {}
+        self._lock = threading.Lock()
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(cache={self.cache!r})"
+
+    def _get_metrics(self, url: str) -> HostMetrics:
+        host = urlparse(url).netloc
+        with self._lock:
+            return self.metrics.setdefault(host, HostMetrics())
+
+    def _record(self, url: str, seconds: float, not_modified: bool = False, error: bool = False) -> None:
+        metrics = self._get_metrics(url)
+        with self._lock:
+            metrics.requests += 1
+            metrics.seconds += seconds
+            metrics.not_modified += not_modified
+            metrics.errors += error
+
+    def instrument(self, session: requests.Session) -> None:
+        """Record the timing of the requests sent with another *session* in the #metrics of this client. This is
+        used for sessions that are managed by third-party libraries (e.g. Twine)."""
+
+        def _hook(response: requests.Response, *args: t.Any, **kwargs: t.Any) -> None:
+            self._record(response.url, response.elapsed.total_seconds(), not_modified=response.status_code == 304)
+
+        session.hooks["response"].append(_hook)
+
+    def request(self, method: str, url: str, **kwargs: t.Any) -> requests.Response:
+        """Send a request with the pooled session. Accepts the same arguments as #requests.Session.request()."""
+
+        kwargs.setdefault("timeout", self.timeout)
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception:
+            self._record(url, time.perf_counter() - start, error=True)
+            raise
+        self._record(url, time.perf_counter() - start, not_modified=response.status_code == 304)
+        return response
+
+    def get(self, url: str, cache: bool = False, **kwargs: t.Any) -> requests.Response:
+        """Send a `GET` request. If *cache* is enabled and a response for the same URL, query parameters and
+        request headers was cached before, the request is made conditional on the cached response's `ETag` and
+        `Last-Modified` headers. If the server responds with `304 Not Modified`, the cached response is returned
+        instead. Successful responses with either of the two headers are cached."""
+
+        if not cache or self.cache is None:
+            return self.request("GET", url, **kwargs)
+
+        import requests
+
+        prepared = self.session.prepare_request(
+            requests.Request("GET", url, params=kwargs.get("params"), headers=kwargs.get("headers"))
+        )
+        assert prepared.url is not None
+        key = hashlib.sha256(
+            "\0".join([prepared.url, *(f"{k}:{v!r}" for k, v in sorted(prepared.headers.items()))]).encode()
+        ).hexdigest()
+        entry = self.cache.get(key)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if isinstance(entry, dict):
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self.request("GET", url, headers=headers, **kwargs)
+        if response.status_code == 304 and isinstance(entry, dict):
+            logger.debug("Using cached response for <val>%s</val>", url)
+            return _restore_response(entry, response)
+
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        if response.status_code == 200 and (etag or last_modified):
+            self.cache.put(
+                key,
+                {
+                    "url": response.url,
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "headers": {k: v for k, v in response.headers.items() if k.lower() not in _UNCACHED_HEADERS},
+                    "encoding": response.encoding,
+                    "content": base64.b64encode(response.content).decode("ascii"),
+                },
+            )
+        return response
+
+    def post(self, url: str, **kwargs: t.Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def delete(self, url: str, **kwargs: t.Any) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def log_metrics(self) -> None:
+        """Log the #metrics of every host that received requests at the debug level."""
+
+        with self._lock:
+            metrics = sorted(self.metrics.items())
+        for host, value in metrics:
+            logger.debug(
+                "HTTP <val>%s</val>: %d request(s) in %.2fs, %d not modified, %d error(s)",
+                host,
+                value.requests,
+                value.seconds,
+                value.not_modified,
+                value.errors,
+            )
+
+
+def _restore_response(entry: dict[str, t.Any], not_modified: requests.Response) -> requests.Response:
+    """Internal. Create a response from a cache *entry* for a request that was answered with `304 Not Modified`."""
+
+    import requests
+    from requests.structures import CaseInsensitiveDict
+
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = "OK"
+    response.url = entry["url"]
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    for header in ("Date", "ETag", "Last-Modified", "Cache-Control", "Expires"):
+        if header in not_modified.headers:
+            response.headers[header] = not_modified.headers[header]
+    response.encoding = entry["encoding"]
+    response.request = not_modified.request
+    response.elapsed = not_modified.elapsed
+    response._content = base64.b64decode(entry["content"])
+    return response
+
+
+@functools.lru_cache(maxsize=None)
+def get_http_client() -> HttpClient:
+    """Return the #HttpClient that is shared across Slap, caching responses in the #CACHE_DIRECTORY. The metrics
+    of the client are logged when the process exits."""
+
+    import atexit
+
+    client = HttpClient(DirectoryCache(CACHE_DIRECTORY))
+    atexit.register(client.log_metrics)
+    return client
@@ -0,0 +1,238 @@
+""" Lightweight timing spans for the main phases of a Slap command, enabled with the `--profile` and `--trace-out`
+options. Spans are only recorded while a #Profiler is active, otherwise #span() and #traced() have next to no
+overhead. """
+
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import functools
+import json
+import os
+import subprocess
+import threading
+import time
+import typing as t
+from pathlib import Path
+
+T = t.TypeVar("T")
+
+#: The profiler that is currently recording spans, see #Profiler.start().
+_active: Profiler | None = None
+
+
+@dataclasses.dataclass
+class Span:
+    """A timed section of the execution, see #Profiler."""
+
+    #: The name of the span. Spans with the same name are aggregated in the #Profiler.summary().
+    name: str
+
+    #: The category of the span, e.g. `plugins`, `project` or `subprocess`.
+    category: str
+
+    #: The start of the span in seconds, relative to the start of the profiler.
+    start: float
+
+    #: The duration of the span in seconds.
+    duration: float
+
+    #: The ID of the thread that recorded the span.
+    thread_id: int
+
+    #: Additional details about the span, e.g. the command line of a subprocess.
+    args: dict[str, t.Any] = dataclasses.field(default_factory=dict)
+
+
+@dataclasses.dataclass
+class SpanSummary:
+    """The aggregated timing of all spans with the same name, see #Profiler.summary()."""
+
+    name: str
+    category: str
+    calls: int
+    total: float
+    max: float
+
+
+class Profiler:
+    """Records timing spans from any thread. While the profiler is active (see #start()), every subprocess that is
+    started via #subprocess.Popen is recorded as a span from its launch until its exit status is retrieved."""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._unpatch: t.Callable[[], None] | None = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(spans={len(self.spans)})"
+
+    def start(self) -> None:
+        """Make this the active profiler, so that #span() and #traced() record spans into it."""
+
+        global _active
+        _active = self
+        self._unpatch = _patch_popen(self)
+
+    def stop(self) -> None:
+        """Stop recording spans."""
+
+        global _active
+        if _active is self:
+            _active = None
+        if self._unpatch is not None:
+            self._unpatch()
+            self._unpatch = None
+
+    def add(self, name: str, category: str, start: float, end: float, **args: t.Any) -> None:
+        """Record a span between the given #time.perf_counter() values."""
+
+        span = Span(name, category, start - self._origin, end - start, threading.get_ident(), args)
+        with self._lock:
+            self.spans.append(span)
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str, **args: t.Any) -> t.Iterator[None]:
+        """Record the execution of the context as a span."""
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, category, start, time.perf_counter(), **args)
+
+    def elapsed(self) -> float:
+        """Return the number of seconds since the profiler was created."""
+
+        return time.perf_counter() - self._origin
+
+    def summary(self) -> list[SpanSummary]:
+        """Aggregate the spans by name, sorted by their total duration in descending order. Note that the durations
+        of nested spans are included in the durations of their parents."""
+
+        result: dict[str, SpanSummary] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            summary = result.get(span.name)
+            if summary is None:
+                summary = result[span.name] = SpanSummary(span.name, span.category, 0, 0.0, 0.0)
+            summary.calls += 1
+            summary.total += span.duration
+            summary.max = max(summary.max, span.duration)
+        return sorted(result.values(), key=lambda s: s.total, reverse=True)
+
+    def format_summary(self, limit: int = 40) -> str:
+        """Format the #summary() as a table with at most *limit* rows."""
+
+        lines = [f"{'category':<12} {'calls':>6} {'total':>9} {'max':>9}  name"]
+        for summary in self.summary()[:limit]:
+            lines.append(
+                f"{summary.category:<12} {summary.calls:>6} {summary.total:>8.3f}s {summary.max:>8.3f}s  {summary.name}"
+            )
+        return "\n".join(lines)
+
+    def write_chrome_trace(self, path: Path) -> None:
+        """Write the spans to *path* in the Chrome trace event format, which can be viewed in `chrome://tracing` or
+        with Perfetto."""
+
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+        events = [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round(span.start * 1e6, 3),
+                "dur": round(span.duration * 1e6, 3),
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": span.args,
+            }
+            for span in spans
+        ]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+
+
+def get_profiler() -> Profiler | None:
+    """Return the active #Profiler, if any."""
+
+    return _active
+
+
+@contextlib.contextmanager
+def span(name: str, category: str, **args: t.Any) -> t.Iterator[None]:
+    """Record the execution of the context as a span if a #Profiler is active."""
+
+    profiler = _active
+    if profiler is None:
+        yield
+    else:
+        with profiler.span(name, category, **args):
+            yield
+
+
+def traced(func: t.Callable[[], T], name: str, category: str, **args: t.Any) -> t.Callable[[], T]:
+    """Wrap the function without arguments *func*, recording every call as a span if a #Profiler is active. This is
+    used for the suppliers of #nr.util.functional.Once values."""
+
+    @functools.wraps(func)
+    def wrapper() -> T:
+        profiler = _active
+        if profiler is None:
+            return func()
+        with profiler.span(name, category, **args):
+            return func()
+
+    return wrapper
+
+
+def _patch_popen(profiler: Profiler) -> t.Callable[[], None]:
+    """Internal. Patch #subprocess.Popen to record every subprocess as a span in the *profiler*, from its launch until
+    its exit status is retrieved by #subprocess.Popen.wait() or #subprocess.Popen.poll(). Returns a function that
+    reverts the patch."""
+
+    original_init = subprocess.Popen.__init__
+    original_wait = subprocess.Popen.wait
+    original_poll = subprocess.Popen.poll
+
+    def _record(process: subprocess.Popen[t.Any]) -> None:
+        if process.returncode is None:
+            return
+        start = process.__dict__.pop("_slap_profiler_start", None)
+        if start is not None:
+            args = process.args
+            argv = [os.fsdecode(args)] if isinstance(args, (str, bytes, os.PathLike)) else list(map(os.fsdecode, args))
+            program = os.path.basename(argv[0].split()[0]) if argv and argv[0].split() else "?"
+            command = " ".join(argv)
+            profiler.add(f"subprocess {program}", "subprocess", start, time.perf_counter(), command=command[:500])
+
+    def __init__(self: subprocess.Popen[t.Any], *args: t.Any, **kwargs: t.Any) -> None:
+        self._slap_profiler_start = time.perf_counter()  # type: ignore[attr-defined]
+        original_init(self, *args, **kwargs)
+
+    def wait(self: subprocess.Popen[t.Any], timeout: float | None = None) -> int:
+        try:
+            return original_wait(self, timeout)
+        finally:
+            _record(self)
+
+    def poll(self: subprocess.Popen[t.Any]) -> int | None:
+        try:
+            return original_poll(self)
+        finally:
+            _record(self)
+
+    subprocess.Popen.__init__ = __init__  # type: ignore[assignment]
+    subprocess.Popen.wait = wait  # type: ignore[assignment]
+    subprocess.Popen.poll = poll  # type: ignore[assignment]
+
+    def unpatch() -> None:
+        subprocess.Popen.__init__ = original_init  # type: ignore[assignment]
+        subprocess.Popen.wait = original_wait  # type: ignore[assignment]
+        subprocess.Popen.poll = original_poll  # type: ignore[assignment]
+
+    return unpatch
@@ -0,0 +1,86 @@
+""" Helpers to forward the output of subprocesses line by line without letting a slow consumer throttle the process. """
+
+from __future__ import annotations
+
+import codecs
+import os
+import queue
+import threading
+import typing as t
+
+
+class LinePump:
+    """Reads from a file descriptor (usually a pipe or the master side of a PTY) in large chunks on a background
+    thread, splits the data into lines incrementally and hands them to the consumer in batches via a bounded queue.
+    This keeps the OS buffer of the file descriptor drained while the consumer is busy formatting and writing output,
+    so the process that produces the output does not block on a full buffer. Only once *max_queued* batches are
+    pending does the reader stop reading.
+
+    Lines are returned without their line terminator and trailing whitespace. Reading stops at the end of the file or
+    when the read fails with an #OSError, which is how the end of the output is signaled on a Linux PTY.
+
+    Example:
+
+    ```py
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    for lines in LinePump(proc.stdout.fileno()):
+        sys.stdout.write("".join(f"prefix| {line}\\n" for line in lines))
+    proc.wait()
+    ```
+    """
+
+    def __init__(self, fd: int, encoding: str = "utf-8", chunk_size: int = 65536, max_queued: int = 64) -> None:
+        self.fd = fd
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self._queue: queue.Queue[list[str] | None] = queue.Queue(max_queued)
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._read, name=f"LinePump-{fd}", daemon=True)
+        self._thread.start()
+
+    def _read(self) -> None:
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        pending = ""
+        try:
+            while True:
+                try:
+                    data = os.read(self.fd, self.chunk_size)
+                except OSError:
+                    data = b""
+                if not data:
+                    break
+                lines = (pending + decoder.decode(data)).split("\n")
+                pending = lines.pop()
+                if lines:
+                    self._queue.put([line.rstrip() for line in lines])
+            pending += decoder.decode(b"", final=True)
+            if pending:
+                self._queue.put([pending.rstrip()])
+        except BaseException as exc:
+            self._error = exc
+        finally:
+            self._queue.put(None)
+
+    def __iter__(self) -> t.Iterator[list[str]]:
+        """Yields batches of lines until the end of the output is reached. Batches that have queued up while the
+        consumer was busy are combined into one."""
+
+        done = False
+        while not done:
+            batch = self._queue.get()
+            if batch is None:
+                break
+            while True:
+                try:
+                    more = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    done = True
+                    break
+                batch += more
+            yield batch
+
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
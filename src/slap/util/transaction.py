@@ -0,0 +1,159 @@
+""" Transactional writes to multiple files, used by `slap release` to bump version numbers across a repository without
+leaving it in a half-updated state if something fails along the way. """
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class FileTransaction:
+    """Writes files atomically and keeps backups of their original contents until the transaction is committed, so
+    that all files can be restored with #rollback() if a later step fails.
+
+    New contents are first staged into temporary files next to their targets (in parallel) and synced to disk, and
+    only moved into place once all of them have been staged successfully. Files that are modified by other means
+    (e.g. by plugins) can be registered with #backup() before they are changed.
+
+    When used as a context manager, the transaction is committed if the block exits normally and rolled back if it
+    raises an exception.
+
+    :param max_workers: The maximum number of threads to stage files and backups with.
+    """
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        self.max_workers = max_workers
+        self._backups: dict[Path, Path | None] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(files={len(self._backups)})"
+
+    def __enter__(self) -> FileTransaction:
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *args: t.Any) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    def _map(self, func: t.Callable[[Path], t.Any], files: t.Collection[Path]) -> list[t.Any]:
+        if len(files) <= 1:
+            return [func(file) for file in files]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(func, files))
+
+    def _backup(self, file: Path) -> None:
+        with self._lock:
+            if file in self._backups:
+                return
+            self._backups[file] = None
+        if file.exists():
+            fd, backup = tempfile.mkstemp(dir=file.parent, prefix=f".{file.name}.", suffix=".bak")
+            os.close(fd)
+            shutil.copy2(file, backup)
+            with self._lock:
+                self._backups[file] = Path(backup)
+
+    def backup(self, files: t.Iterable[Path]) -> None:
+        """Keep a copy of the current contents of the given *files*, so they can be restored by #rollback(). Files
+        that do not exist yet will be removed on rollback. Files that are already backed up are skipped."""
+
+        self._map(self._backup, [Path(os.path.abspath(file)) for file in files])
+
+    def write_files(self, contents: t.Mapping[Path, str]) -> None:
+        """Replace the contents of multiple files atomically. The files are backed up, then the new *contents* are
+        staged and synced to disk in parallel, and finally renamed into place. If staging any of the files fails,
+        none of the files are changed."""
+
+        files = {Path(os.path.abspath(file)): content for file, content in contents.items()}
+        self.backup(files)
+
+        def _stage(file: Path) -> Path:
+            fd, tmpname = tempfile.mkstemp(dir=file.parent, prefix=f".{file.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as fp:
+                    fp.write(files[file])
+                    fp.flush()
+                    os.fsync(fp.fileno())
+                if file.exists():
+                    shutil.copymode(file, tmpname)
+            except BaseException:
+                os.unlink(tmpname)
+                raise
+            return Path(tmpname)
+
+        staged: dict[Path, Path] = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {file: executor.submit(_stage, file) for file in files}
+            for file, future in futures.items():
+                if future.exception() is None:
+                    staged[file] = future.result()
+            for future in futures.values():
+                future.result()  # Re-raise the first error, if any.
+        except BaseException:
+            for tmpname in staged.values():
+                tmpname.unlink(missing_ok=True)
+            raise
+
+        for file, tmpname in staged.items():
+            os.replace(tmpname, file)
+        _sync_directories({file.parent for file in staged})
+
+    def rollback(self) -> list[Path]:
+        """Restore all files that were written or backed up in the transaction to their original state and return
+        the list of restored files. Files that did not exist before are removed."""
+
+        restored = []
+        errors = []
+        for file, backup in self._backups.items():
+            try:
+                if backup is None:
+                    if file.exists():
+                        file.unlink()
+                        restored.append(file)
+                else:
+                    os.replace(backup, file)
+                    restored.append(file)
+            except OSError as exc:
+                logger.error("Unable to restore <val>%s</val>: %s", file, exc)
+                errors.append(exc)
+        self._backups.clear()
+        if errors:
+            raise errors[0]
+        return restored
+
+    def commit(self) -> None:
+        """Discard the backups. After this, the changes can no longer be rolled back."""
+
+        for backup in self._backups.values():
+            if backup is not None:
+                backup.unlink(missing_ok=True)
+        self._backups.clear()
+
+
+def _sync_directories(directories: t.Iterable[Path]) -> None:
+    """Internal. Sync the given directories to disk so that renames within them are persisted. This is a no-op on
+    platforms that cannot open directories (i.e. Windows)."""
+
+    for directory in directories:
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
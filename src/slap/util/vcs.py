@@ -1,8 +1,12 @@
 import abc
 import dataclasses
 import enum
+import os
 import re
+import subprocess as sp
+import threading
 import typing as t
+import weakref
 from pathlib import Path
 
 from nr.util.functional import Consumer
@@ -73,10 +77,26 @@ class Vcs(abc.ABC):
         """Return the status of all files in the version control repository that have been changed or are unknown to the
         VCS (and not ignored)."""
 
+    @abc.abstractmethod
+    def get_changed_files_since(self, revision: str) -> t.Sequence[Path]:
+        """Return the absolute paths of all files that differ between the given revision and the working tree,
+        including uncommitted changes and files that are unknown to the VCS (and not ignored). If the history of the
+        current checkout diverged from the *revision* (e.g. a feature branch compared to `origin/main`), the files
+        are compared with the common ancestor, so that changes made only in the *revision* are not included.
+
+        Raises ValueError: If the *revision* does not exist."""
+
     @abc.abstractmethod
     def get_file_contents(self, file: Path, revision: str) -> bytes | None:
         """Return the contents of the file in a given revision. Return `None` if the file does not exist."""
 
+    def get_files_contents(self, files: t.Sequence[Path], revision: str) -> dict[Path, bytes | None]:
+        """Return the contents of multiple files in a given revision, mapping every file to `None` if it does not
+        exist. The default implementation calls #get_file_contents() for each file; implementations should override
+        it if they can retrieve the files more efficiently in bulk."""
+
+        return {file: self.get_file_contents(file, revision) for file in files}
+
     @abc.abstractmethod
     def commit_files(
         self,
@@ -101,18 +121,99 @@ class Vcs(abc.ABC):
         ...
 
 
+class GitCatFile:
+    """Wraps a long-lived `git cat-file --batch` process to read objects from a Git repository without spawning a new
+    process for every object. The process is started on first use and can be used from multiple threads.
+
+    :param directory: The directory in which to run the process. Object names of the form `<revision>:<path>` are
+        resolved relative to the root of the repository.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._process: sp.Popen[bytes] | None = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}("{self.directory}")'
+
+    def _get_process(self) -> sp.Popen[bytes]:
+        if self._process is None or self._process.poll() is not None:
+            self._process = sp.Popen(["git", "cat-file", "--batch"], cwd=self.directory, stdin=sp.PIPE, stdout=sp.PIPE)
+            weakref.finalize(self, _terminate_process, self._process)
+        return self._process
+
+    def read(self, object_name: str) -> tuple[str, bytes] | None:
+        """Return the type and contents of the object with the given name (e.g. a SHA or `<revision>:<path>`), or
+        `None` if the object does not exist."""
+
+        if "\n" in object_name:
+            raise ValueError(f"object name must not contain a newline: {object_name!r}")
+
+        with self._lock:
+            process = self._get_process()
+            assert process.stdin is not None and process.stdout is not None
+            process.stdin.write(object_name.encode() + b"\n")
+            process.stdin.flush()
+            header = process.stdout.readline()
+            if not header:
+                raise RuntimeError(f"git cat-file --batch exited unexpectedly with code {process.wait()}")
+            fields = header.split()
+            if len(fields) != 3:  # "<name> missing" or "<name> ambiguous"
+                return None
+            size = int(fields[2])
+            contents = process.stdout.read(size + 1)[:size]
+        return fields[1].decode(), contents
+
+    def close(self) -> None:
+        """Terminate the process, if it is running. It is restarted on the next call to #read()."""
+
+        with self._lock:
+            if self._process is not None:
+                _terminate_process(self._process)
+                self._process = None
+
+
+def _terminate_process(process: sp.Popen[bytes]) -> None:
+    if process.poll() is None:
+        assert process.stdin is not None
+        process.stdin.close()
+        process.wait()
+    if process.stdout is not None:
+        process.stdout.close()
+
+
+def _iter_nul_separated(command: list[str], cwd: Path) -> t.Iterator[str]:
+    """Run the *command* and yield the NUL separated records from its output while it is still running. Raises a
+    #subprocess.CalledProcessError if the command fails."""
+
+    with sp.Popen(command, cwd=cwd, stdout=sp.PIPE, bufsize=0) as process:
+        assert process.stdout is not None
+        buffer = b""
+        while chunk := process.stdout.read(64 * 1024):
+            *records, buffer = (buffer + chunk).split(b"\0")
+            for record in records:
+                yield os.fsdecode(record)
+        if buffer:
+            yield os.fsdecode(buffer)
+    if process.returncode != 0:
+        raise sp.CalledProcessError(process.returncode, command)
+
+
 class Git(Vcs):
     def __init__(self, directory: Path) -> None:
         self._git = _Git(directory)
-        assert self._git.get_toplevel() is not None, f"Not a Git repository: {directory}"
+        toplevel = self._git.get_toplevel()
+        assert toplevel is not None, f"Not a Git repository: {directory}"
+        self._toplevel = Path(toplevel)
+        self._cat_file = GitCatFile(self._toplevel)
+        self._tracked_paths: frozenset[str] | None = None
 
     def __repr__(self) -> str:
         return f'Git("{self._git.path}")'
 
     def get_toplevel(self) -> Path:
-        toplevel = self._git.get_toplevel()
-        assert toplevel is not None
-        return Path(toplevel)
+        return self._toplevel
 
     def get_web_url(self) -> str | None:
         remote = next((r for r in self._git.remotes() if r.name == "origin"), None)
@@ -144,22 +245,136 @@ class Git(Vcs):
     def get_author(self) -> Author:
         return get_git_author(self._git.path)
 
+    def iter_files(self) -> t.Iterator[Path]:
+        """Yield the paths of all files tracked by Git under the working directory, streamed from `git ls-files`."""
+
+        for name in _iter_nul_separated(["git", "ls-files", "-z"], self._git.path):
+            yield self._git.path / name
+
     def get_all_files(self) -> t.Sequence[Path]:
-        return [self._git.path / f for f in self._git.get_files()]
+        return list(self.iter_files())
+
+    def get_tracked_paths(self) -> frozenset[str]:
+        """Return the paths of all files tracked by Git relative to the repository root, in POSIX format. The set is
+        computed once and cached until #clear_cache() is called."""
+
+        if self._tracked_paths is None:
+            command = ["git", "ls-files", "-z", "--full-name"]
+            self._tracked_paths = frozenset(_iter_nul_separated(command, self._toplevel))
+        return self._tracked_paths
+
+    def is_tracked(self, file: Path) -> bool:
+        """Return `True` if the *file* is tracked by Git. Symlinks in the path of the *file* are resolved first."""
+
+        path = self._get_repository_path(file.resolve())
+        return path is not None and path in self.get_tracked_paths()
+
+    def clear_cache(self) -> None:
+        """Clear the set of tracked files cached by #get_tracked_paths()."""
+
+        self._tracked_paths = None
+
+    def iter_changed_files(self) -> t.Iterator[FileInfo]:
+        """Yield the status of all changed and untracked files, streamed from `git status --porcelain=v2`. The paths
+        are relative to the repository root."""
+
+        records = _iter_nul_separated(["git", "status", "--porcelain=v2", "-z"], self._toplevel)
+        for record in records:
+            kind = record[:1]
+            if kind == "?":
+                yield FileInfo(Path(record[2:]), FileStatus.UNKNOWN, FileStatus.UNKNOWN)
+                continue
+            elif kind == "1":
+                fields = record.split(" ", 8)
+            elif kind == "2":
+                fields = record.split(" ", 9)
+                next(records)  # The original path of the renamed or copied file.
+            elif kind == "u":
+                fields = record.split(" ", 10)
+            else:  # Ignored files or headers.
+                continue
+            yield FileInfo(Path(fields[-1]), self._git_file_status(fields[1][0]), self._git_file_status(fields[1][1]))
 
     def get_changed_files(self) -> t.Sequence[FileInfo]:
-        result = []
-        for file in self._git.get_status():
-            result.append(
-                FileInfo(Path(file.filename), self._git_file_status(file.mode[0]), self._git_file_status(file.mode[1]))
-            )
-        return result
+        return list(self.iter_changed_files())
 
-    def get_file_contents(self, file: Path, revision: str) -> bytes | None:
+    def get_changed_files_since(self, revision: str) -> t.Sequence[Path]:
+        toplevel = self.get_toplevel()
+        if self._cat_file.read(f"{revision}^{{tree}}") is None:
+            raise ValueError(f"invalid Git revision: {revision!r}")
         try:
-            return self._git.get_file_contents(str(file), revision)
-        except FileNotFoundError:
+            base = self._git.check_output(["git", "merge-base", revision, "HEAD"], stderr=sp.DEVNULL)
+            revision = base.decode().strip()
+        except sp.CalledProcessError:
+            # There is no common ancestor (or no HEAD commit yet), compare with the revision itself.
+            pass
+        output = self._git.check_output(["git", "diff", "--name-only", "--no-renames", "-z", revision, "--"])
+        files = {toplevel / f for f in output.decode().split("\0") if f}
+        files |= {toplevel / f.path for f in self.get_changed_files() if f.disk == FileStatus.UNKNOWN}
+        return sorted(files)
+
+    def _get_repository_path(self, file: Path) -> str | None:
+        """Return the path of the *file* relative to the repository root, or `None` if it is outside the repository.
+        Relative paths are resolved against the working directory of the repository (like Git would). Symlinks in the
+        parent directories are resolved, as the toplevel reported by Git is always a real path."""
+
+        path = os.path.join(self._git.path, file)
+        path = os.path.join(os.path.realpath(os.path.dirname(path)), os.path.basename(path))
+        path = os.path.relpath(path, self.get_toplevel())
+        if path == os.pardir or path.startswith(os.pardir + os.sep):
             return None
+        return Path(path).as_posix()
+
+    def get_file_contents(self, file: Path, revision: str) -> bytes | None:
+        """Return the contents of the *file* in the given *revision*, read through a long-lived `git cat-file --batch`
+        process. Raises a #ValueError if the *revision* does not exist."""
+
+        path = self._get_repository_path(file)
+        if path is None or "\n" in path:
+            try:
+                return self._git.get_file_contents(str(file), revision)
+            except FileNotFoundError:
+                return None
+
+        result = self._cat_file.read(f"{revision}:{path}")
+        if result is None:
+            if self._cat_file.read(f"{revision}^{{tree}}") is None:
+                raise ValueError(f"invalid Git revision: {revision!r}")
+            return None
+        type_, contents = result
+        return contents if type_ == "blob" else None
+
+    def get_files_contents(self, files: t.Sequence[Path], revision: str) -> dict[Path, bytes | None]:
+        """Resolves all *files* in the given *revision* with a single `git ls-tree` call and then reads the blobs
+        through a long-lived `git cat-file --batch` process. Raises a #ValueError if the *revision* does not exist."""
+
+        if self._cat_file.read(f"{revision}^{{tree}}") is None:
+            raise ValueError(f"invalid Git revision: {revision!r}")
+
+        paths = {file: self._get_repository_path(file) for file in files}
+        blobs: dict[str, str] = {}
+        queried = sorted({path for path in paths.values() if path is not None})
+        # Chunk the paths to stay below the command-line length limit.
+        for offset in range(0, len(queried), 1000):
+            output = sp.check_output(
+                ["git", "ls-tree", "-r", "-z", "--full-tree", revision, "--", *queried[offset : offset + 1000]],
+                cwd=self.get_toplevel(),
+            )
+            for record in output.decode().split("\0"):
+                if record:
+                    info, _, name = record.partition("\t")
+                    _mode, type_, sha = info.split(" ")
+                    if type_ == "blob":
+                        blobs[name] = sha
+
+        result: dict[Path, bytes | None] = {}
+        for file, path in paths.items():
+            if path is None:
+                result[file] = self.get_file_contents(file, revision)
+                continue
+            obj = self._cat_file.read(blobs[path]) if path in blobs else None
+            result[file] = obj[1] if obj else None
+        return result
 
     def commit_files(
         self,
@@ -176,6 +391,7 @@ class Git(Vcs):
     ) -> None:
         # TODO (@NiklasRosenstein): Capture stdout from Git subprocess and redirect to log_line().
         self._git.add([str(f.resolve()) for f in files])
+        self.clear_cache()
 
         commit_command = ["git"]
         if email:
@@ -205,8 +421,12 @@ class Git(Vcs):
     def _git_file_status(mode: str) -> FileStatus:
         return {
             " ": FileStatus.NONE,
+            ".": FileStatus.NONE,
             "A": FileStatus.ADDED,
+            "C": FileStatus.ADDED,
             "M": FileStatus.MODIFIED,
+            "T": FileStatus.MODIFIED,
+            "U": FileStatus.MODIFIED,
             "R": FileStatus.RENAMED,
             "D": FileStatus.DELETED,
             "?": FileStatus.UNKNOWN,
@@ -214,8 +434,6 @@ class Git(Vcs):
 
 
 def get_git_author(path: Path | None = None) -> Author:
-    import subprocess as sp
-
     git = _Git(path)
     try:
         name = git.get_config("user.name") or git.get_config("user.name", global_=True)
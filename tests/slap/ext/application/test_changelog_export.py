@@ -0,0 +1,34 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from slap.ext.application.changelog import _open_output
+
+
+def test__open_output__applies_umask_to_new_files(tmp_path: Path) -> None:
+    path = tmp_path / "docs" / "changelog.md"
+    umask = os.umask(0o022)
+    try:
+        with _open_output(path, 1024) as fp:
+            fp.write("# Changelog\n")
+    finally:
+        os.umask(umask)
+    assert path.read_text() == "# Changelog\n"
+    assert path.stat().st_mode & 0o777 == 0o644
+    assert os.listdir(path.parent) == ["changelog.md"]
+
+
+def test__open_output__keeps_mode_of_existing_file_and_removes_temporary_file_on_error(tmp_path: Path) -> None:
+    path = tmp_path / "changelog.md"
+    path.write_text("old\n")
+    path.chmod(0o640)
+    with _open_output(path, 1024) as fp:
+        fp.write("new\n")
+    assert path.stat().st_mode & 0o777 == 0o640
+
+    with pytest.raises(RuntimeError), _open_output(path, 1024) as fp:
+        fp.write("broken\n")
+        raise RuntimeError
+    assert path.read_text() == "new\n"
+    assert os.listdir(tmp_path) == ["changelog.md"]
@@ -0,0 +1,164 @@
+import threading
+import typing as t
+from pathlib import Path
+
+import pytest
+from cleo.testers.command_tester import CommandTester  # type: ignore[import]
+
+from slap.application import Application
+from slap.check import Check, CheckResult, get_configuration_files
+from slap.ext.application.check import CheckCommandPlugin, CheckConfig
+from slap.plugins import CheckPlugin
+from slap.project import Project
+
+
+class CountingCheckPlugin(CheckPlugin):
+    calls = 0
+
+    def get_project_checks(self, project: Project) -> t.Iterable[Check]:
+        CountingCheckPlugin.calls += 1
+        yield Check("config", CheckResult.OK, "looks good")
+
+    def get_project_check_inputs(self, project: Project) -> t.Sequence[Path]:
+        return get_configuration_files(project)
+
+
+def test__CheckCommandPlugin__reuses_cached_results_until_inputs_change(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pyproject = '[build-system]\nbuild-backend = "poetry.core.masonry.api"\n[tool.poetry]\nname = "foo"\n'
+    (tmp_path / "pyproject.toml").write_text(pyproject)
+    monkeypatch.chdir(tmp_path)
+
+    app = Application(tmp_path)
+    project = Project(app.repository, tmp_path)
+    monkeypatch.setattr(app, "get_target_projects", lambda *a, **kw: [project])
+    monkeypatch.setattr(Project, "is_python_project", True)
+
+    command = CheckCommandPlugin(app)
+    command.activate(app, {project: CheckConfig(plugins=["counting"])})
+    command._plugins["counting"] = CountingCheckPlugin
+    tester = CommandTester(command)
+
+    tester.execute("--show-skipped")
+    assert CountingCheckPlugin.calls == 1
+    assert "(cached)" not in tester.io.fetch_output()
+
+    tester.execute("--show-skipped")
+    assert CountingCheckPlugin.calls == 1
+    assert "counting:config  OK             — looks good (cached)" in tester.io.fetch_output()
+
+    tester.execute("--no-cache")
+    assert CountingCheckPlugin.calls == 2
+
+    (tmp_path / "pyproject.toml").write_text(pyproject + 'version = "1.0.0"\n')
+    tester.execute("--show-skipped")
+    assert CountingCheckPlugin.calls == 3
+
+
+class VersionCheckPlugin(CheckPlugin):
+    def get_project_checks(self, project: Project) -> t.Iterable[Check]:
+        versions = {other.dist_name(): other.version() for other in project.repository.projects()}
+        yield Check("versions", CheckResult.OK, str(versions))
+
+
+def test__CheckCommandPlugin__computes_project_values_before_checking_concurrently(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pyproject = (
+        '[build-system]\nbuild-backend = "poetry.core.masonry.api"\n[tool.poetry]\nname = "{name}"\nversion = "1.0.0"\n'
+    )
+    (tmp_path / "slap.toml").write_text("")
+    for name in ("a", "b", "c"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "pyproject.toml").write_text(pyproject.format(name=name))
+    monkeypatch.chdir(tmp_path)
+
+    # #nr.util.functional.Once is not thread-safe, so the values must be computed before the thread pool starts.
+    threads = set()
+    get_version = Project._get_version
+
+    def _get_version(self: Project) -> t.Optional[str]:
+        threads.add(threading.current_thread())
+        return get_version(self)
+
+    monkeypatch.setattr(Project, "_get_version", _get_version)
+    app = Application(tmp_path)
+    projects = app.repository.projects()
+    command = CheckCommandPlugin(app)
+    command.activate(app, {project: CheckConfig(plugins=["versions"]) for project in projects})
+    command._plugins["versions"] = VersionCheckPlugin
+    tester = CommandTester(command)
+
+    assert tester.execute("--no-cache -j 3") == 0
+    assert "{'a': '1.0.0', 'b': '1.0.0', 'c': '1.0.0'}" in tester.io.fetch_output()
+    assert threads == {threading.main_thread()}
+
+
+def test__PoetryChecksPlugin__check_inputs_include_configured_readme(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from slap.ext.checks.poetry import PoetryChecksPlugin
+
+    pyproject = '[tool.poetry]\nname = "foo"\nreadme = "docs/README.md"\n'
+    (tmp_path / "foo" / "docs").mkdir(parents=True)
+    (tmp_path / "foo" / "docs" / "README.md").write_text("# foo\n")
+    (tmp_path / "foo" / "pyproject.toml").write_text(pyproject)
+    monkeypatch.chdir(tmp_path)
+
+    app = Application(tmp_path)
+    project = Project(app.repository, tmp_path / "foo")
+    inputs = PoetryChecksPlugin().get_project_check_inputs(project)
+    assert (tmp_path / "foo" / "docs" / "README.md").resolve() in inputs
+
+
+def test__PoetryChecksPlugin__check_inputs_include_refreshed_classifiers_and_license_index(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from slap.ext.checks.poetry import PoetryChecksPlugin
+    from slap.util.external import pypi_classifiers
+    from slap.util.external.licenses import SPDX_INDEX_FILENAME
+
+    (tmp_path / "foo").mkdir()
+    (tmp_path / "foo" / "pyproject.toml").write_text('[tool.poetry]\nname = "foo"\n')
+    monkeypatch.chdir(tmp_path)
+    project = Project(Application(tmp_path).repository, tmp_path / "foo")
+
+    inputs = PoetryChecksPlugin().get_project_check_inputs(project)
+    assert pypi_classifiers.BUNDLED_FILENAME in inputs
+    assert SPDX_INDEX_FILENAME in inputs
+
+    # A snapshot from a newer trove-classifiers version is used instead of the bundled one, so it is an input, too.
+    snapshot = tmp_path / "classifiers.gz"
+    pypi_classifiers.ClassifierDatabase(["Typing :: Typed"], "trove-classifiers 9999.1.1").save(snapshot)
+    monkeypatch.setattr(pypi_classifiers, "CACHE_FILENAME", snapshot)
+    inputs = PoetryChecksPlugin().get_project_check_inputs(project)
+    assert snapshot in inputs
+    assert pypi_classifiers.BUNDLED_FILENAME not in inputs
+
+
+@pytest.mark.parametrize(
+    "license,result,description",
+    [
+        ("MIT", CheckResult.OK, 'License <s>"MIT"</s> is a valid SPDX identifier.'),
+        ("MIT OR Apache-2.0", CheckResult.OK, 'License <s>"MIT OR Apache-2.0"</s> is a valid SPDX license expression.'),
+        (
+            "mit or apache-2.0",
+            CheckResult.WARNING,
+            'License <s>"mit or apache-2.0"</s> is not a known SPDX license identifier or expression. '
+            'Did you mean <s>"MIT OR Apache-2.0"</s>?',
+        ),
+        ("GPL-3.0", CheckResult.WARNING, 'License <s>"GPL-3.0"</s> is deprecated, use <s>"GPL-3.0-only"</s>.'),
+        ("mit", CheckResult.WARNING, 'License <s>"mit"</s> should be spelled <s>"MIT"</s>.'),
+    ],
+)
+def test__PoetryChecksPlugin__license_check(
+    tmp_path: Path, license: str, result: CheckResult, description: str
+) -> None:
+    from slap.ext.checks.poetry import PoetryChecksPlugin
+
+    (tmp_path / "pyproject.toml").write_text('[tool.poetry]\nname = "foo"\n')
+    plugin = PoetryChecksPlugin()
+    plugin.poetry = {"license": license}
+    check = plugin.get_license_check(Project(Application(tmp_path).repository, tmp_path))
+    assert (check.result, check.description) == (result, description)
@@ -0,0 +1,125 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+from cleo.testers.command_tester import CommandTester  # type: ignore[import]
+
+from slap.application import Application
+from slap.ext.application.release import ReleaseCommandPlugin
+
+PYPROJECT = """
+[build-system]
+build-backend = "poetry.core.masonry.api"
+[tool.poetry]
+name = "{name}"
+version = "0.1.0"
+packages = [{{ include = "{name}" }}]
+[tool.slap.release]
+pre-commit = "{hook}"
+"""
+
+
+def test__ReleaseCommandPlugin__concurrent_pre_commit_hooks_fail(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    hooks = {
+        "a": "sleep 0.2; echo hook a",
+        "b": "echo hook b; exit 3",
+        "c": "touch ../c-ran",
+    }
+    (tmp_path / "slap.toml").write_text("")
+    for name, hook in hooks.items():
+        (tmp_path / name / name).mkdir(parents=True)
+        (tmp_path / name / name / "__init__.py").write_text('__version__ = "0.1.0"\n')
+        (tmp_path / name / "pyproject.toml").write_text(PYPROJECT.format(name=name, hook=hook))
+    monkeypatch.chdir(tmp_path)
+
+    app = Application(tmp_path)
+    command = ReleaseCommandPlugin(app)
+    command.load_configuration(app)
+    tester = CommandTester(command)
+
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        tester.execute("1.0.0 -j 2")
+    assert excinfo.value.returncode == 3
+
+    output = tester.io.fetch_output()
+    assert output.index("hook in " + str(tmp_path / "a")) < output.index("hook a\n")
+    assert output.index("hook a\n") < output.index("hook in " + str(tmp_path / "b")) < output.index("hook b\n")
+    assert "hook in " + str(tmp_path / "c") not in output
+    assert not (tmp_path / "c-ran").exists()
+
+    errors = tester.io.fetch_error()
+    assert "error: hook failed with exit code 3" in errors
+    assert "error: skipped 1 hook(s) that did not start before a hook failed" in errors
+    assert "error: release failed, restored 6 file(s)" in errors
+    for name in hooks:
+        assert 'version = "0.1.0"' in (tmp_path / name / "pyproject.toml").read_text()
+        assert (tmp_path / name / name / "__init__.py").read_text() == '__version__ = "0.1.0"\n'
+
+
+def test__ReleaseCommandPlugin__concurrent_pre_commit_hooks_report_hooks_finished_after_failure(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    hooks = {
+        "a": "echo hook a; exit 3",
+        "b": "sleep 0.2; echo hook b; exit 4",
+        "c": "touch ../c-ran",
+    }
+    (tmp_path / "slap.toml").write_text("")
+    for name, hook in hooks.items():
+        (tmp_path / name / name).mkdir(parents=True)
+        (tmp_path / name / name / "__init__.py").write_text('__version__ = "0.1.0"\n')
+        (tmp_path / name / "pyproject.toml").write_text(PYPROJECT.format(name=name, hook=hook))
+    monkeypatch.chdir(tmp_path)
+
+    app = Application(tmp_path)
+    command = ReleaseCommandPlugin(app)
+    command.load_configuration(app)
+    tester = CommandTester(command)
+
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        tester.execute("1.0.0 -j 2")
+    assert excinfo.value.returncode == 3
+
+    output = tester.io.fetch_output()
+    assert output.index("hook a\n") < output.index("hook in " + str(tmp_path / "b")) < output.index("hook b\n")
+    assert not (tmp_path / "c-ran").exists()
+
+    errors = tester.io.fetch_error()
+    assert "error: hook failed with exit code 3" in errors
+    assert "error: hook failed with exit code 4" in errors
+    assert "error: skipped 1 hook(s) that did not start before a hook failed" in errors
+
+
+def test__ReleaseCommandPlugin__failed_commit_unstages_changed_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "__init__.py").write_text('__version__ = "0.1.0"\n')
+    (tmp_path / "pyproject.toml").write_text(PYPROJECT.format(name="pkg", hook="true"))
+    git = ["git", "-c", "user.name=x", "-c", "user.email=x@x"]
+    subprocess.check_call(["git", "init", "-q", "-b", "develop"], cwd=tmp_path)
+    subprocess.check_call(["git", "add", "."], cwd=tmp_path)
+    subprocess.check_call(git + ["commit", "-qm", "first"], cwd=tmp_path)
+    hook = tmp_path / ".git" / "hooks" / "pre-commit"
+    hook.write_text("#!/bin/sh\nexit 1\n")
+    hook.chmod(0o755)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GIT_AUTHOR_NAME", "x")
+    monkeypatch.setenv("GIT_AUTHOR_EMAIL", "x@x")
+    monkeypatch.setenv("GIT_COMMITTER_NAME", "x")
+    monkeypatch.setenv("GIT_COMMITTER_EMAIL", "x@x")
+
+    app = Application(tmp_path)
+    command = ReleaseCommandPlugin(app)
+    command.load_configuration(app)
+    tester = CommandTester(command)
+
+    with pytest.raises(subprocess.CalledProcessError):
+        tester.execute("1.0.0 --tag")
+
+    assert "error: release failed, restored 2 file(s)" in tester.io.fetch_error()
+    assert (tmp_path / "pkg" / "__init__.py").read_text() == '__version__ = "0.1.0"\n'
+    assert subprocess.check_output(["git", "status", "--porcelain"], cwd=tmp_path, text=True) == ""
+    assert subprocess.check_output(["git", "tag"], cwd=tmp_path, text=True) == ""
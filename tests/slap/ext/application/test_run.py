@@ -0,0 +1,35 @@
+from pathlib import Path
+
+import pytest
+from cleo.testers.command_tester import CommandTester  # type: ignore[import]
+
+from slap.application import Application
+from slap.ext.application.run import RunCommandPlugin
+
+PYPROJECT = """
+[build-system]
+build-backend = "poetry.core.masonry.api"
+[tool.poetry]
+name = "{name}"
+[tool.slap.run]
+shell = "echo $0 > shell.txt"
+"""
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test__RunCommandPlugin__uses_the_same_shell_with_and_without_jobs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, jobs: str
+) -> None:
+    (tmp_path / "slap.toml").write_text("")
+    for name in "ab":
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "pyproject.toml").write_text(PYPROJECT.format(name=name))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SHELL", "bash")
+
+    app = Application(tmp_path)
+    command = RunCommandPlugin(app)
+    command.config = command.load_configuration(app)
+    assert CommandTester(command).execute(f"--no-venv-check -j {jobs} shell") == 0
+    for name in "ab":
+        assert (tmp_path / name / "shell.txt").read_text() == "/bin/sh\n"
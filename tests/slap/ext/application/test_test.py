@@ -0,0 +1,147 @@
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from cleo.io.buffered_io import BufferedIO  # type: ignore[import]
+from cleo.testers.command_tester import CommandTester  # type: ignore[import]
+from pytest import raises
+
+from slap.application import Application
+from slap.ext.application.test import (
+    TestCommandPlugin as _TestCommandPlugin,
+    TestRunner as _TestRunner,
+    load_test_timings,
+    parse_shard,
+    partition_tests,
+)
+from slap.project import Project
+
+
+def test__partition_tests__round_robin_without_timings() -> None:
+    assert partition_tests({"c", "a", "d", "b", "e"}, 2, {}) == [["a", "c", "e"], ["b", "d"]]
+
+
+def test__partition_tests__balanced_by_timings() -> None:
+    timings = {"a": 10.0, "b": 6.0, "c": 5.0, "d": 1.0}
+    assert partition_tests(timings.keys(), 2, timings) == [["a", "d"], ["b", "c"]]
+
+    # Tests without timings are expected to take the average time (5.5s here).
+    assert partition_tests({"a", "b", "c", "d", "new"}, 3, timings) == [["a"], ["b", "d"], ["c", "new"]]
+
+
+def test__parse_shard() -> None:
+    assert parse_shard("1/8") == (1, 8)
+    for value in ["0/8", "9/8", "1", "a/b", "-1/2"]:
+        with raises(ValueError):
+            parse_shard(value)
+
+
+def _is_running(pid: int) -> bool:
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except FileNotFoundError:
+        return False
+    return stat.rpartition(")")[2].split()[0] != "Z"
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="requires procfs")
+def test__TestCommandPlugin__terminates_serial_test_on_interrupt(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pid_file = tmp_path / "pid"
+    (tmp_path / "pyproject.toml").write_text(
+        '[build-system]\nbuild-backend = "poetry.core.masonry.api"\n[tool.poetry]\nname = "foo"\n'
+        f'[tool.slap.test]\nsleep = "echo $$ > {pid_file}; exec sleep 30"\n'
+    )
+    monkeypatch.chdir(tmp_path)
+    app = Application(tmp_path)
+    project = Project(app.repository, tmp_path)
+    monkeypatch.setattr(app, "get_target_projects", lambda *a, **kw: [project])
+
+    def _interrupt() -> None:
+        deadline = time.perf_counter() + 10
+        while not pid_file.exists() or not pid_file.read_text().strip():
+            if time.perf_counter() > deadline:
+                return
+            time.sleep(0.01)
+        signal.pthread_kill(threading.main_thread().ident or 0, signal.SIGINT)
+
+    command = _TestCommandPlugin(app)
+    command.load_configuration(app)
+    thread = threading.Thread(target=_interrupt)
+    thread.start()
+    # NOTE: Cleo turns the #KeyboardInterrupt into exit code 1.
+    assert CommandTester(command).execute("--no-venv-check") == 1
+    thread.join()
+
+    pid = int(pid_file.read_text())
+    deadline = time.perf_counter() + 5
+    while _is_running(pid) and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    assert not _is_running(pid)
+
+
+def test__load_test_timings__ignores_invalid_file(tmp_path: Path) -> None:
+    path = tmp_path / "timings.json"
+    assert load_test_timings(path) == {}
+    path.write_text('{"a:test": 1.5}')
+    assert load_test_timings(path) == {"a:test": 1.5}
+    for content in ["{", "[]", '{"a:test": "slow"}']:
+        path.write_text(content)
+        assert load_test_timings(path) == {}
+
+
+def test__TestRunner__concurrent_buffered_output_is_not_interleaved(tmp_path: Path) -> None:
+    io = BufferedIO()
+    lock = threading.Lock()
+    command = "for i in 1 2 3 4 5; do echo {name}-$i; sleep 0.01; done"
+    runners = [_TestRunner(name, command.format(name=name), io, tmp_path, buffered=True, lock=lock) for name in "ab"]
+    threads = [threading.Thread(target=runner.run) for runner in runners]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    lines = io.fetch_output().splitlines()
+    assert len(lines) == 10
+    blocks = [lines[:5], lines[5:]]
+    assert sorted(block[0].partition("|")[0] for block in blocks) == ["a", "b"]
+    for block in blocks:
+        name = block[0].partition("|")[0]
+        assert block == [f"{name}| {name}-{i}" for i in range(1, 6)]
+    for runner in runners:
+        assert runner.duration is not None and runner.duration >= 0.05
+
+
+def test__TestCommandPlugin__does_not_cache_interrupted_tests(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    started = tmp_path / "started"
+    (tmp_path / "pyproject.toml").write_text(
+        '[build-system]\nbuild-backend = "poetry.core.masonry.api"\n[tool.poetry]\nname = "foo"\n'
+        f'[tool.slap.test.sleep]\ncommand = "touch {started}; exec sleep 30"\ninputs = ["pyproject.toml"]\n'
+        '[tool.slap.test.quick]\ncommand = "true"\ninputs = ["pyproject.toml"]\n'
+    )
+    monkeypatch.chdir(tmp_path)
+    app = Application(tmp_path)
+    project = Project(app.repository, tmp_path)
+    monkeypatch.setattr(app, "get_target_projects", lambda *a, **kw: [project])
+
+    def _interrupt() -> None:
+        deadline = time.perf_counter() + 10
+        while not started.exists() and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        signal.pthread_kill(threading.main_thread().ident or 0, signal.SIGINT)
+
+    command = _TestCommandPlugin(app)
+    command.load_configuration(app)
+    thread = threading.Thread(target=_interrupt)
+    thread.start()
+    assert CommandTester(command).execute("--no-venv-check -j 2") == 1
+    thread.join()
+
+    # Only the result of the test that completed before the interrupt is cached.
+    cache_dir = tmp_path / ".slap" / "cache" / "tests"
+    assert len([path for path in cache_dir.iterdir() if not path.name.startswith(".")]) == 1
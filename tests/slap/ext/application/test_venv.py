@@ -0,0 +1,23 @@
+import os
+import sys
+from pathlib import Path
+
+from slap.ext.application.venv import Venv
+
+
+def test__Venv__get_python_version__is_cached_by_pyvenv_cfg_mtime(tmp_path: Path) -> None:
+    venv = Venv(tmp_path / "env")
+    venv.create(sys.executable)
+    version = venv.get_python_version()
+    assert version == sys.version
+
+    # A cache hit must not invoke the interpreter.
+    cache_file = venv.path / Venv.VERSION_CACHE_FILE
+    cache_file.write_text(cache_file.read_text().replace(sys.version, "cached"))
+    assert venv.get_python_version() == "cached"
+
+    # Touching the `pyvenv.cfg` invalidates the cache.
+    cfg = venv.path / "pyvenv.cfg"
+    stat = cfg.stat()
+    os.utime(cfg, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert venv.get_python_version() == version
@@ -0,0 +1,93 @@
+import json
+import threading
+import typing as t
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from slap.ext.repository_hosts.github import GithubRepositoryHost, GithubUsernameResolver
+from slap.util.cache import DirectoryCache
+
+USERS = {"alice@example.org": "alice", "bob@example.org": "bob"}
+
+
+@pytest.fixture
+def github_api() -> t.Iterator[tuple[str, list[str]]]:
+    """A local stand-in for the GitHub user search API. Yields the base URL and the list of queried emails."""
+
+    queries: list[str] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            assert url.path == "/search/users"
+            email = parse_qs(url.query)["q"][0].split()[0]
+            queries.append(email)
+            items = [{"login": USERS[email]}] if email in USERS else []
+            body = json.dumps({"total_count": len(items), "items": items}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: t.Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}", queries
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test__GithubUsernameResolver__caches_results_on_disk(github_api: tuple[str, list[str]], tmp_path: Path) -> None:
+    url, queries = github_api
+    resolver = GithubUsernameResolver(url, DirectoryCache(tmp_path))
+    assert resolver.resolve("alice@example.org") == "alice"
+    assert resolver.resolve("nobody@example.org") is None
+    assert resolver.resolve("alice@example.org") == "alice"
+    assert queries == ["alice@example.org", "nobody@example.org"]
+
+    # A new resolver reads the positive and negative results from the cache.
+    resolver = GithubUsernameResolver(url, DirectoryCache(tmp_path))
+    assert resolver.resolve("alice@example.org") == "alice"
+    assert resolver.resolve("nobody@example.org") is None
+    assert len(queries) == 2
+
+    # Expired entries are looked up again.
+    resolver = GithubUsernameResolver(url, DirectoryCache(tmp_path), negative_ttl=-1)
+    assert resolver.resolve("nobody@example.org") is None
+    assert len(queries) == 3
+
+
+def test__GithubUsernameResolver__resolve_many(github_api: tuple[str, list[str]], tmp_path: Path) -> None:
+    url, queries = github_api
+    resolver = GithubUsernameResolver(url, DirectoryCache(tmp_path))
+    assert resolver.resolve("alice@example.org") == "alice"
+
+    emails = ["alice@example.org", "bob@example.org", "nobody@example.org"] * 10
+    assert resolver.resolve_many(emails) == {
+        "alice@example.org": "alice",
+        "bob@example.org": "bob",
+        "nobody@example.org": None,
+    }
+    assert sorted(queries) == ["alice@example.org", "bob@example.org", "nobody@example.org"]
+
+
+def test__GithubRepositoryHost__get_issue_by_reference() -> None:
+    host = GithubRepositoryHost("owner/repo")
+    assert host.get_issue_by_reference("#12").url == "https://github.com/owner/repo/issues/12"
+    assert host.get_issue_by_reference("https://github.com/owner/repo/pull/12").shortform == "#12"
+    assert host.get_issue_by_reference("https://github.com/other/repo/issues/3").shortform == "other/repo#3"
+    assert host.get_issue_by_reference("https://ghe.io/owner/repo/issues/3").shortform == "ghe.io/owner/repo#3"
+    assert (
+        GithubRepositoryHost("ghe.io/owner/repo").get_issue_by_reference("https://ghe.io/owner/repo/issues/3").id == "3"
+    )
+    with pytest.raises(ValueError):
+        host.get_issue_by_reference("https://github.com/owner/repo")
@@ -0,0 +1,45 @@
+import json
+from pathlib import Path
+
+from slap.changelog import ChangelogManager
+from slap.ext.changelog_renderers import HtmlChangelogRenderer, JsonChangelogRenderer
+from slap.ext.repository_hosts.github import GithubRepositoryHost
+
+
+def _get_manager(tmp_path: Path) -> ChangelogManager:
+    (tmp_path / "1.0.0.toml").write_text(
+        'release-date = "2022-01-01"\n[[entries]]\nid = "a"\ntype = "fix"\ndescription = "Fix `<b>`"\n'
+        'author = "@x"\npr = "12"\n'
+    )
+    return ChangelogManager(tmp_path, GithubRepositoryHost("owner/repo"))
+
+
+def test__HtmlChangelogRenderer(tmp_path: Path) -> None:
+    manager = _get_manager(tmp_path)
+    text = HtmlChangelogRenderer().render_release(manager, manager.all()[0])
+    assert "<h2>1.0.0 <small>(2022-01-01)</small></h2>" in text
+    assert "<td>Fix <code>&lt;b&gt;</code></td>" in text
+    assert '<a href="https://github.com/owner/repo/issues/12">12</a>' in text
+
+
+def test__JsonChangelogRenderer(tmp_path: Path) -> None:
+    manager = _get_manager(tmp_path)
+    renderer = JsonChangelogRenderer()
+    releases = [renderer.render_release(manager, changelog) for changelog in manager.all()]
+    data = json.loads(renderer.begin(manager) + renderer.separator.join(releases) + renderer.end(manager))
+    assert data == [
+        {
+            "version": "1.0.0",
+            "release_date": "2022-01-01",
+            "entries": [
+                {
+                    "id": "a",
+                    "type": "fix",
+                    "description": "Fix `<b>`",
+                    "authors": ["@x"],
+                    "pr": "https://github.com/owner/repo/issues/12",
+                    "issues": [],
+                }
+            ],
+        }
+    ]
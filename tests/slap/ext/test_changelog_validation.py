@@ -0,0 +1,39 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from slap.application import Application
+from slap.check import CheckResult
+from slap.ext.checks import changelog
+from slap.ext.checks.changelog import ChangelogValidationCheckPlugin
+
+PYPROJECT = '[build-system]\nbuild-backend = "poetry.core.masonry.api"\n[tool.poetry]\nname = "foo"\n'
+ENTRY = '[[entries]]\nid = "{id}"\ntype = "{type}"\ndescription = "Change"\nauthor = "@x"\n'
+
+
+def test__ChangelogValidationCheckPlugin__validates_files_concurrently(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "pyproject.toml").write_text(PYPROJECT)
+    (tmp_path / ".changelog").mkdir()
+    (tmp_path / ".changelog" / "1.0.0.toml").write_text(ENTRY.format(id="a", type="fix"))
+    (tmp_path / ".changelog" / "1.1.0.toml").write_text(ENTRY.format(id="b", type="nonsense"))
+    (tmp_path / ".changelog" / "_unreleased.toml").write_text(ENTRY.format(id="c", type="feature"))
+    monkeypatch.chdir(tmp_path)
+    project = Application(tmp_path).repository.projects()[0]
+
+    # The validation of every file waits until all three files are being validated.
+    barrier = threading.Barrier(3, timeout=5)
+    validate_changelog_file = changelog.validate_changelog_file
+
+    def _validate(manager, path):  # type: ignore[no-untyped-def]
+        barrier.wait()
+        return validate_changelog_file(manager, path)
+
+    monkeypatch.setattr(changelog, "validate_changelog_file", _validate)
+
+    check = ChangelogValidationCheckPlugin(max_workers=3)._validate_changelogs(project)
+    assert check.result == CheckResult.ERROR
+    assert check.description == "Broken or invalid changelogs"
+    assert check.details == '<i>1.1.0.toml</i>: id=<fg=yellow>"b"</fg>: invalid change type: nonsense'
@@ -0,0 +1,44 @@
+import json
+from pathlib import Path
+
+import pytest
+from cleo.io.inputs.argv_input import ArgvInput  # type: ignore[import]
+from cleo.io.outputs.buffered_output import BufferedOutput  # type: ignore[import]
+
+from slap.application import CleoApplication, Command
+from slap.util.profiling import span
+
+
+class NoopCommand(Command):
+    name = "noop"
+
+    def handle(self) -> int:
+        with span("noop", "command"):
+            pass
+        return 0
+
+
+def _run(*argv: str) -> tuple[int, str]:
+    app = CleoApplication(lambda io: None, "slap")
+    app.auto_exits(False)
+    app.add(NoopCommand())
+    error_output = BufferedOutput()
+    exit_code = app.run(ArgvInput(["slap", *argv]), BufferedOutput(), error_output)
+    return exit_code, error_output.fetch()
+
+
+@pytest.mark.parametrize("form", ["equals", "separate"])
+def test__CleoApplication__trace_out(tmp_path: Path, form: str) -> None:
+    trace = tmp_path / "trace.json"
+    argv = [f"--trace-out={trace}"] if form == "equals" else ["--trace-out", str(trace)]
+    exit_code, errors = _run(*argv, "noop")
+    assert exit_code == 0
+    assert "Trace written to" in errors
+    names = {event["name"] for event in json.loads(trace.read_text())["traceEvents"]}
+    assert {"command noop", "noop"} <= names
+
+
+def test__CleoApplication__trace_out__reports_unwritable_file(tmp_path: Path) -> None:
+    exit_code, errors = _run(f"--trace-out={tmp_path}", "noop")
+    assert exit_code == 0
+    assert "error: could not write trace" in errors
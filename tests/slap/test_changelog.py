@@ -0,0 +1,100 @@
+import datetime
+from pathlib import Path
+
+import pytest
+from databind.core.converter import ConversionError
+
+from slap.changelog import (
+    Changelog,
+    ChangelogEntry,
+    ChangelogManager,
+    ChangelogSearchIndex,
+    dump_changelog,
+    load_changelog,
+)
+from slap.util.cache import DirectoryCache
+
+
+def test__ChangelogManager__index__sorts_and_updates_changed_files(tmp_path: Path) -> None:
+    directory = tmp_path / ".changelog"
+    directory.mkdir()
+    for version in ("0.9.0", "0.10.0", "1.0.0"):
+        (directory / f"{version}.toml").write_text(
+            f'release-date = "2022-01-01"\n[[entries]]\nid = "{version}"\ntype = "fix"\ndescription = "x"\n'
+        )
+    (directory / "_unreleased.toml").write_text('[[entries]]\nid = "a"\n\n[[entries]]\nid = "b"\n')
+
+    cache = DirectoryCache(tmp_path / "cache")
+    manager = ChangelogManager(directory, None, index_cache=cache)
+    assert [c.path.name for c in manager.all()] == ["_unreleased.toml", "1.0.0.toml", "0.10.0.toml", "0.9.0.toml"]
+    index = manager.index()
+    assert index["_unreleased.toml"].version is None
+    assert index["_unreleased.toml"].entry_ids == ["a", "b"]
+    assert index["0.10.0.toml"].release_date == "2022-01-01"
+
+    # A new manager reads the index from the cache and only re-indexes files that changed.
+    (directory / "_unreleased.toml").write_text('[[entries]]\nid = "c"\n')
+    (directory / "0.9.0.toml").unlink()
+    (directory / "0.11.0.toml").write_text('release-date = "2022-02-01"\n')
+    manager = ChangelogManager(directory, None, index_cache=cache)
+    assert [c.path.name for c in manager.all()] == ["_unreleased.toml", "1.0.0.toml", "0.11.0.toml", "0.10.0.toml"]
+    assert manager.index()["_unreleased.toml"].entry_ids == ["c"]
+    assert manager.all()[1].content.entries[0].id == "1.0.0"
+
+
+def test__load_changelog__fast_path_and_fallback() -> None:
+    data = {
+        "release-date": "2022-01-02",
+        "entries": [{"id": "a", "type": "fix", "description": "x", "authors": ["@a", "@b"], "pr": "12"}],
+    }
+    changelog = Changelog([ChangelogEntry("a", "fix", "x", authors=["@a", "@b"], pr="12")], datetime.date(2022, 1, 2))
+    assert load_changelog(data) == changelog
+    assert dump_changelog(changelog) == data
+    assert dump_changelog(Changelog()) == {}
+
+    # Data that the fast path does not understand is converted (or rejected) by databind.
+    assert load_changelog({"release-date": datetime.datetime(2022, 1, 2)}).release_date == datetime.datetime(2022, 1, 2)
+    with pytest.raises(ConversionError, match="extra keys"):
+        load_changelog({"entries": [{"id": "a", "type": "fix", "description": "x", "foo": 1}]})
+    with pytest.raises(ConversionError, match="missing required field"):
+        load_changelog({"entries": [{"id": "a", "type": "fix"}]})
+    with pytest.raises(ConversionError, match="expected str"):
+        load_changelog({"entries": [{"id": 1, "type": "fix", "description": "x"}]})
+
+
+def test__ChangelogSearchIndex__search(tmp_path: Path) -> None:
+    manager = ChangelogManager(tmp_path / ".changelog", None, index_cache=DirectoryCache(tmp_path / "cache"))
+    manager.version("2.0.0").save(
+        Changelog(
+            [
+                ChangelogEntry("a", "breaking change", "Remove the `foo` API", authors=["@alice", "@bob"]),
+                ChangelogEntry("b", "fix", "Fix foo", author="@bob", issues=["https://github.com/o/r/issues/12"]),
+            ],
+            datetime.date(2022, 2, 1),
+        )
+    )
+    manager.version("1.0.0").save(
+        Changelog(
+            [ChangelogEntry("c", "fix", "Fix bar", author="@alice", pr="https://github.com/o/r/pull/3")],
+            datetime.date(2022, 1, 1),
+        )
+    )
+
+    def search(*query: str) -> list[str]:
+        return [result.entry.id for result in ChangelogSearchIndex(manager).search(query)]
+
+    assert search("foo") == ["a", "b"]
+    assert search("FOO", "author:alice") == ["a"]
+    assert search("type:fix") == ["b", "c"]
+    assert search("type:fix", "since:2.0") == ["b"]
+    assert search("issue:#12") == search("issue:https://github.com/o/r/issues/12") == ["b"]
+    assert search("pr:3") == ["c"]
+    assert search("baz") == []
+
+    # Changed files are re-indexed.
+    manager.version("1.0.0").save(
+        Changelog([ChangelogEntry("d", "fix", "Fix baz", author="@carol")], datetime.date(2022, 1, 1))
+    )
+    assert search("baz") == ["d"]
+    with pytest.raises(ValueError):
+        search()
@@ -0,0 +1,20 @@
+from pathlib import Path
+
+from slap.release import VersionRefScanner, match_version_ref_pattern, match_version_ref_pattern_on_lines
+
+
+def test__VersionRefScanner__reads_each_file_once(tmp_path: Path) -> None:
+    filename = tmp_path / "pyproject.toml"
+    filename.write_text('version = "1.0.0"\nfoo = "^1.0.0"\nbar = "^1.0.0"\n')
+
+    with VersionRefScanner().activate() as scanner:
+        ref = match_version_ref_pattern(filename, r'^version\s*=\s*"(.*?)"')
+        assert (ref.start, ref.end, ref.value) == (11, 16, "1.0.0")
+
+        # Changes on disk are not seen while the scanner is active.
+        filename.write_text("")
+        refs = match_version_ref_pattern_on_lines(filename, r'^\w+\s*=\s*"\^(?P<version>.*?)"')
+        assert [r.value for r in refs] == ["1.0.0", "1.0.0"]
+        assert scanner.read(filename).startswith('version = "1.0.0"')
+
+    assert match_version_ref_pattern(filename, r"^version = (.*)$", None) is None
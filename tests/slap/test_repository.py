@@ -0,0 +1,44 @@
+from pathlib import Path
+
+from slap.repository import Repository
+
+PYPROJECT_TEMPLATE = """
+[build-system]
+requires = ["poetry-core"]
+build-backend = "poetry.core.masonry.api"
+
+[tool.poetry]
+name = "{name}"
+version = "0.1.0"
+description = ""
+authors = ["John Doe <john@doe.org>"]
+
+[tool.poetry.dependencies]
+python = "^3.10"
+{dependencies}
+"""
+
+
+def _make_project(directory: Path, name: str, dependencies: str = "") -> None:
+    (directory / name / "src" / name).mkdir(parents=True)
+    (directory / name / "src" / name / "__init__.py").touch()
+    (directory / name / "pyproject.toml").write_text(PYPROJECT_TEMPLATE.format(name=name, dependencies=dependencies))
+
+
+def test__Repository__get_projects_affected_by__includes_dependent_projects(tmp_path: Path) -> None:
+    (tmp_path / "slap.toml").touch()
+    _make_project(tmp_path, "a")
+    _make_project(tmp_path, "b", 'a = "^0.1.0"')
+    _make_project(tmp_path, "c", 'b = "^0.1.0"')
+    _make_project(tmp_path, "d")
+
+    repository = Repository(tmp_path)
+    root = tmp_path.resolve()
+
+    def affected(*files: str) -> list[str]:
+        return [p.id for p in repository.get_projects_affected_by([root / f for f in files])]
+
+    assert affected("a/src/a/__init__.py") == ["a", "b", "c"]
+    assert affected("b/pyproject.toml") == ["b", "c"]
+    assert sorted(affected("d/README.md", "c/src/c/__init__.py")) == ["c", "d"]
+    assert affected("README.md") == []
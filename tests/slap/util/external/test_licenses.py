@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import pytest
+
+from slap.util.external.licenses import SpdxLicenseIndex, SpdxLicenseInfo, get_spdx_index, wrap_license_text
+
+
+def test__get_spdx_index__contains_common_licenses() -> None:
+    index = get_spdx_index()
+    assert "MIT" in index
+    assert "apache-2.0" in index
+    assert "NOT-A-LICENSE" not in index
+    assert index.get("mit") == SpdxLicenseInfo("MIT", "MIT License", True, True, False)
+    assert index.get_text("MIT").startswith("MIT License\n")
+    assert "Version 2.0, January 2004" in index.get_text("Apache-2.0")
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("MIT", "MIT"),
+        ("MIT License", "MIT"),
+        ("Apache License, Version 2.0", "Apache-2.0"),
+        ("GPLv3", "GPL-3.0-only"),
+        ("GPLv3+", "GPL-3.0-or-later"),
+        ("GPL-3.0", "GPL-3.0-only"),
+        ("AGPL-3.0", "AGPL-3.0-only"),
+        ("wxWindows", "wxWindows"),
+        ("Mozilla Public License 2.0 (MPL 2.0)", "MPL-2.0"),
+        ("mit or apache-2.0", "MIT OR Apache-2.0"),
+        ("GPL-2.0+ OR MIT", "GPL-2.0-or-later OR MIT"),
+        ("BSD License", None),
+        ("UNKNOWN", None),
+    ],
+)
+def test__SpdxLicenseIndex__normalize(value: str, expected: str | None) -> None:
+    assert get_spdx_index().normalize(value) == expected
+
+
+def test__SpdxLicenseIndex__build(tmp_path: Path) -> None:
+    text = "Permission is hereby granted to do anything with this software.\n"
+    licenses = [
+        (SpdxLicenseInfo("Foo-1.0", "Foo License 1.0", True, None, False), text),
+        (SpdxLicenseInfo("Foo", "Foo License", False, False, True), text),
+        (SpdxLicenseInfo("Bar", "Bar License", False, True, False), "Bar.\n"),
+    ]
+    SpdxLicenseIndex.build(tmp_path / "index.bin", "1.0", licenses)
+
+    index = SpdxLicenseIndex(tmp_path / "index.bin")
+    assert index.version == "1.0"
+    assert sorted(info.license_id for info in index) == ["Bar", "Foo", "Foo-1.0"]
+    assert index.get_text("foo") == index.get_text("Foo-1.0") == text
+    assert index.get_text("Bar") == "Bar.\n"
+    assert index.normalize("Foo License, Version 1.0") == "Foo-1.0"
+    with pytest.raises(KeyError):
+        index.get_text("Baz")
+    index.close()
+
+
+def test__wrap_license_text__keeps_all_words() -> None:
+    text = get_spdx_index().get_text("MIT")
+    wrapped = wrap_license_text(text)
+    assert wrapped.split() == text.split()
+    assert max(len(line) for line in wrapped.splitlines()) < 79
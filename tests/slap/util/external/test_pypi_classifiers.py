@@ -0,0 +1,111 @@
+from pathlib import Path
+
+import pytest
+
+from slap.util.external import pypi_classifiers
+from slap.util.external.pypi_classifiers import ClassifierDatabase, get_classifier_database, parse_version
+
+CLASSIFIERS = [
+    "Development Status :: 3 - Alpha",
+    "Development Status :: 4 - Beta",
+    "License :: OSI Approved :: MIT License",
+    "Programming Language :: Python :: 3.10",
+    "Programming Language :: Python :: 3.11",
+]
+
+
+def test__get_classifier_database__loads_bundled_snapshot() -> None:
+    database = get_classifier_database()
+    assert "Programming Language :: Python :: 3" in database
+    assert "Programming Language :: Python :: 2.8" not in database
+    assert database.source and database.source.startswith("trove-classifiers ")
+
+
+def test__ClassifierDatabase__get_children() -> None:
+    database = ClassifierDatabase(CLASSIFIERS)
+    assert database.get_children("") == ["Development Status", "License", "Programming Language"]
+    assert database.get_children("Programming Language :: Python") == [
+        "Programming Language :: Python :: 3.10",
+        "Programming Language :: Python :: 3.11",
+    ]
+    assert database.get_children("Topic") == []
+
+
+def test__ClassifierDatabase__get_close_matches() -> None:
+    database = ClassifierDatabase(CLASSIFIERS)
+    assert database.get_close_matches("Programming Language :: Pyhton :: 3.10", n=1) == [
+        "Programming Language :: Python :: 3.10"
+    ]
+    assert database.get_close_matches("license :: osi approved :: MIT", n=1) == [
+        "License :: OSI Approved :: MIT License"
+    ]
+    assert database.get_close_matches("Something else entirely") == []
+
+
+def test__ClassifierDatabase__save_and_load(tmp_path: Path) -> None:
+    ClassifierDatabase(CLASSIFIERS, "test").save(tmp_path / "classifiers.txt.gz")
+    database = ClassifierDatabase.load(tmp_path / "classifiers.txt.gz")
+    assert list(database) == CLASSIFIERS
+    assert database.source == "test"
+
+
+def test__parse_version() -> None:
+    assert parse_version("trove-classifiers 2024.10.21.16") == (2024, 10, 21, 16)
+    assert parse_version("trove-classifiers latest") is None
+    assert parse_version("test") is None
+    assert parse_version(None) is None
+
+
+@pytest.mark.parametrize(
+    "bundled,cached,expected",
+    [
+        ("trove-classifiers 2024.1.1", "trove-classifiers 2024.10.1", "cached"),
+        ("trove-classifiers 2024.10.1", "trove-classifiers 2024.1.1", "bundled"),
+        ("trove-classifiers 2024.1.1", "trove-classifiers 2024.1.1", "bundled"),
+        ("trove-classifiers 2024.1.1", None, "bundled"),
+        (None, "trove-classifiers 2024.1.1", "cached"),
+    ],
+)
+def test__get_classifier_database__loads_newer_snapshot(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, bundled: str | None, cached: str | None, expected: str
+) -> None:
+    ClassifierDatabase(["Bundled"], bundled).save(tmp_path / "bundled.txt.gz")
+    ClassifierDatabase(["Cached"], cached).save(tmp_path / "cached.txt.gz")
+    monkeypatch.setattr(pypi_classifiers, "BUNDLED_FILENAME", tmp_path / "bundled.txt.gz")
+    monkeypatch.setattr(pypi_classifiers, "CACHE_FILENAME", tmp_path / "cached.txt.gz")
+    get_classifier_database.cache_clear()
+    try:
+        assert list(get_classifier_database()) == [expected.capitalize()]
+    finally:
+        get_classifier_database.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "release",
+    [
+        {"info": {"version": "2024.1.1"}, "urls": [{"url": "x.tar.gz", "packagetype": "sdist"}]},
+        {"info": {"version": "2024.1.1"}},
+        [],
+    ],
+)
+def test__fetch_classifiers__raises_ValueError_for_unexpected_response(
+    monkeypatch: pytest.MonkeyPatch, release: object
+) -> None:
+    from slap.util import http
+
+    class _Response:
+        url = pypi_classifiers.TROVE_CLASSIFIERS_URL
+
+        def raise_for_status(self) -> None:
+            pass
+
+        def json(self) -> object:
+            return release
+
+    class _Client:
+        def get(self, url: str, **kwargs: object) -> _Response:
+            return _Response()
+
+    monkeypatch.setattr(http, "get_http_client", _Client)
+    with pytest.raises(ValueError):
+        pypi_classifiers.fetch_classifiers()
@@ -0,0 +1,32 @@
+import os
+from pathlib import Path
+
+from slap.util.cache import DirectoryCache, fingerprint
+
+
+def test__DirectoryCache__evicts_least_recently_used_entries(tmp_path: Path) -> None:
+    cache = DirectoryCache(tmp_path, max_size=250)
+    for idx, key in enumerate(["a", "b", "c"]):
+        cache.put(key, "x" * 100)
+        os.utime(tmp_path / f"{key}.json", (idx, idx))
+
+    # Only two entries fit into the cache, so writing "c" evicted "a", the least recently used one.
+    assert cache.get("a") is None
+    assert cache.get("b") == "x" * 100  # Marks "b" as recently used.
+    cache.put("d", "x" * 100)
+    assert cache.get("b") is not None
+    assert cache.get("c") is None
+    assert cache.get("d") is not None
+
+
+def test__fingerprint__depends_on_file_contents_but_not_order(tmp_path: Path) -> None:
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "b.txt").write_text("b")
+    files = [tmp_path / "a.txt", tmp_path / "b.txt"]
+
+    digest = fingerprint("cmd", files=files, root=tmp_path)
+    assert digest == fingerprint("cmd", files=reversed(files), root=tmp_path)
+    assert digest != fingerprint("other cmd", files=files, root=tmp_path)
+
+    (tmp_path / "b.txt").write_text("B")
+    assert digest != fingerprint("cmd", files=files, root=tmp_path)
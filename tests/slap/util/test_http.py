@@ -0,0 +1,76 @@
+import threading
+import typing as t
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from slap.util.cache import DirectoryCache
+from slap.util.http import HttpClient
+
+
+@pytest.fixture
+def server() -> t.Iterator[tuple[str, list[tuple[str, int]]]]:
+    """A local server that serves `/data` with an `ETag` and fails the first request to `/flaky`. Yields the base URL
+    and the list of requested paths with the status codes that were returned."""
+
+    log: list[tuple[str, int]] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path == "/data" and self.headers.get("If-None-Match") == '"v1"':
+                status, body = 304, b""
+            elif self.path == "/data":
+                status, body = 200, b"hello"
+            elif self.path == "/flaky" and not any(path == "/flaky" for path, _ in log):
+                status, body = 503, b""
+            else:
+                status, body = 200, b"ok"
+            log.append((self.path, status))
+            self.send_response(status)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: t.Any) -> None:
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_address[1]}", log
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test__HttpClient__get__uses_cached_response_if_not_modified(
+    server: tuple[str, list[tuple[str, int]]], tmp_path: Path
+) -> None:
+    url, log = server
+    client = HttpClient(DirectoryCache(tmp_path))
+    assert client.get(f"{url}/data", cache=True).text == "hello"
+
+    response = HttpClient(DirectoryCache(tmp_path)).get(f"{url}/data", cache=True)
+    assert response.status_code == 200
+    assert response.text == "hello"
+    assert log == [("/data", 200), ("/data", 304)]
+
+    # Without caching, the request is not conditional.
+    assert client.get(f"{url}/data").text == "hello"
+    assert log[-1] == ("/data", 200)
+
+
+def test__HttpClient__retries_and_records_metrics(server: tuple[str, list[tuple[str, int]]]) -> None:
+    url, log = server
+    client = HttpClient(backoff_factor=0)
+    assert client.get(f"{url}/flaky").text == "ok"
+    assert log == [("/flaky", 503), ("/flaky", 200)]
+
+    metrics = client.metrics[url.partition("://")[2]]
+    assert metrics.requests == 1
+    assert metrics.errors == 0
+    assert metrics.seconds > 0
@@ -0,0 +1,37 @@
+import json
+import subprocess as sp
+import sys
+from pathlib import Path
+
+from slap.util.profiling import Profiler, get_profiler, span, traced
+
+
+def test__Profiler__records_spans_subprocesses_and_writes_chrome_trace(tmp_path: Path) -> None:
+    supplier = traced(lambda: 42, "supplier", "test", key="value")
+    assert supplier() == 42  # Not recorded, no profiler is active.
+
+    profiler = Profiler()
+    profiler.start()
+    try:
+        assert get_profiler() is profiler
+        with span("outer", "test"):
+            assert supplier() == 42
+            assert supplier() == 42
+        sp.check_call([sys.executable, "-c", "pass"])
+    finally:
+        profiler.stop()
+
+    assert get_profiler() is None
+    with span("ignored", "test"):
+        sp.check_call([sys.executable, "-c", "pass"])
+
+    summary = {s.name: s for s in profiler.summary()}
+    assert summary.keys() == {"outer", "supplier", f"subprocess {Path(sys.executable).name}"}
+    assert summary["supplier"].calls == 2
+    assert summary["outer"].total >= summary["supplier"].total
+
+    profiler.write_chrome_trace(tmp_path / "trace.json")
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert [event["name"] for event in events][:3] == ["supplier", "supplier", "outer"]
+    assert events[0]["ph"] == "X"
+    assert events[0]["args"] == {"key": "value"}
@@ -0,0 +1,14 @@
+import os
+
+from slap.util.pump import LinePump
+
+
+def test__LinePump__splits_chunks_into_lines() -> None:
+    read_fd, write_fd = os.pipe()
+    pump = LinePump(read_fd, chunk_size=4, max_queued=2)
+    os.write(write_fd, "first line\r\nsecond ü line  \n".encode() + b"\xc3")
+    os.write(write_fd, b"\xbc without newline")
+    os.close(write_fd)
+    lines = [line for batch in pump for line in batch]
+    os.close(read_fd)
+    assert lines == ["first line", "second ü line", "ü without newline"]
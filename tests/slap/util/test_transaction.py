@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import pytest
+
+from slap.util.transaction import FileTransaction
+
+
+def test__FileTransaction__commit(tmp_path: Path) -> None:
+    (tmp_path / "a.txt").write_text("a1")
+    (tmp_path / "b.txt").write_text("b1")
+
+    with FileTransaction() as transaction:
+        transaction.write_files({tmp_path / "a.txt": "a2", tmp_path / "b.txt": "b2"})
+
+    assert (tmp_path / "a.txt").read_text() == "a2"
+    assert (tmp_path / "b.txt").read_text() == "b2"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.txt", "b.txt"]
+
+
+def test__FileTransaction__rollback(tmp_path: Path) -> None:
+    (tmp_path / "a.txt").write_text("a1")
+    (tmp_path / "b.txt").write_text("b1")
+
+    with pytest.raises(RuntimeError):
+        with FileTransaction() as transaction:
+            transaction.write_files({tmp_path / "a.txt": "a2"})
+            transaction.backup([tmp_path / "b.txt", tmp_path / "c.txt"])
+            (tmp_path / "b.txt").unlink()
+            (tmp_path / "c.txt").write_text("c2")
+            raise RuntimeError
+
+    assert (tmp_path / "a.txt").read_text() == "a1"
+    assert (tmp_path / "b.txt").read_text() == "b1"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.txt", "b.txt"]
+
+
+def test__FileTransaction__write_files__leaves_files_unchanged_if_staging_fails(tmp_path: Path) -> None:
+    (tmp_path / "a.txt").write_text("a1")
+
+    transaction = FileTransaction()
+    with pytest.raises(FileNotFoundError):
+        transaction.write_files({tmp_path / "a.txt": "a2", tmp_path / "missing" / "b.txt": "b2"})
+
+    assert (tmp_path / "a.txt").read_text() == "a1"
+    transaction.rollback()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.txt"]
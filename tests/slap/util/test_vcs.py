@@ -0,0 +1,94 @@
+import subprocess as sp
+from pathlib import Path
+
+import pytest
+
+from slap.util.vcs import FileInfo, FileStatus, Git
+
+
+@pytest.fixture
+def git(tmp_path: Path) -> Git:
+    sp.check_call(["git", "init", "-q"], cwd=tmp_path)
+    (tmp_path / "a.txt").write_text("a1")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.txt").write_text("b1")
+    sp.check_call(["git", "add", "."], cwd=tmp_path)
+    sp.check_call(["git", "-c", "user.name=x", "-c", "user.email=x@x", "commit", "-qm", "first"], cwd=tmp_path)
+    (tmp_path / "a.txt").write_text("a2")
+    sp.check_call(["git", "-c", "user.name=x", "-c", "user.email=x@x", "commit", "-qam", "second"], cwd=tmp_path)
+    return Git(tmp_path)
+
+
+def test__Git__get_file_contents(git: Git) -> None:
+    root = git.get_toplevel()
+    assert git.get_file_contents(root / "a.txt", "HEAD") == b"a2"
+    assert git.get_file_contents(root / "a.txt", "HEAD~1") == b"a1"
+    assert git.get_file_contents(root / "sub" / "b.txt", "HEAD") == b"b1"
+    assert git.get_file_contents(root / "sub", "HEAD") is None
+    assert git.get_file_contents(root / "missing.txt", "HEAD") is None
+    with pytest.raises(ValueError):
+        git.get_file_contents(root / "a.txt", "no-such-revision")
+
+
+def test__Git__get_files_contents(git: Git) -> None:
+    root = git.get_toplevel()
+    files = [root / "a.txt", root / "sub" / "b.txt", root / "missing.txt"]
+    assert git.get_files_contents(files, "HEAD~1") == {files[0]: b"a1", files[1]: b"b1", files[2]: None}
+    with pytest.raises(ValueError):
+        git.get_files_contents(files, "no-such-revision")
+
+
+def test__Git__get_files_contents__symlinked_checkout(git: Git, tmp_path: Path) -> None:
+    link = tmp_path.parent / (tmp_path.name + "-link")
+    link.symlink_to(tmp_path, target_is_directory=True)
+    linked = Git(link)
+    files = [link / "a.txt", link / "sub" / "b.txt", Path("a.txt")]
+    assert linked.get_files_contents(files, "HEAD") == {files[0]: b"a2", files[1]: b"b1", files[2]: b"a2"}
+    assert {file: linked.get_file_contents(file, "HEAD") for file in files} == linked.get_files_contents(files, "HEAD")
+
+
+def test__Git__iter_files_and_is_tracked(git: Git) -> None:
+    root = git.get_toplevel()
+    (root / "untracked.txt").write_text("")
+    assert sorted(git.iter_files()) == [root / "a.txt", root / "sub" / "b.txt"]
+    assert git.get_tracked_paths() == {"a.txt", "sub/b.txt"}
+    assert git.is_tracked(root / "sub" / ".." / "sub" / "b.txt")
+    assert not git.is_tracked(root / "untracked.txt")
+    assert not git.is_tracked(root.parent / "a.txt")
+
+
+def test__Git__iter_changed_files(git: Git) -> None:
+    root = git.get_toplevel()
+    (root / "a.txt").write_text("a3")
+    (root / "untracked.txt").write_text("")
+    sp.check_call(["git", "mv", "sub/b.txt", "sub/c.txt"], cwd=root)
+    assert sorted(git.iter_changed_files(), key=lambda f: f.path) == [
+        FileInfo(Path("a.txt"), FileStatus.NONE, FileStatus.MODIFIED),
+        FileInfo(Path("sub/c.txt"), FileStatus.RENAMED, FileStatus.NONE),
+        FileInfo(Path("untracked.txt"), FileStatus.UNKNOWN, FileStatus.UNKNOWN),
+    ]
+
+
+def test__Git__get_changed_files_since(git: Git) -> None:
+    root = git.get_toplevel()
+    (root / "sub" / "b.txt").write_text("b2")
+    (root / "untracked.txt").write_text("")
+    assert git.get_changed_files_since("HEAD") == [root / "sub" / "b.txt", root / "untracked.txt"]
+    assert git.get_changed_files_since("HEAD~1") == [root / "a.txt", root / "sub" / "b.txt", root / "untracked.txt"]
+    with pytest.raises(ValueError):
+        git.get_changed_files_since("no-such-revision")
+
+
+def test__Git__get_changed_files_since__compares_with_merge_base(git: Git) -> None:
+    root = git.get_toplevel()
+    commit = ["git", "-c", "user.name=x", "-c", "user.email=x@x", "commit", "-qam"]
+    sp.check_call(["git", "branch", "-q", "main"], cwd=root)
+    sp.check_call(["git", "checkout", "-qb", "feature"], cwd=root)
+    (root / "sub" / "b.txt").write_text("b2")
+    sp.check_call(commit + ["feature"], cwd=root)
+    sp.check_call(["git", "checkout", "-q", "main"], cwd=root)
+    (root / "a.txt").write_text("a3")
+    sp.check_call(commit + ["main"], cwd=root)
+    sp.check_call(["git", "checkout", "-q", "feature"], cwd=root)
+
+    assert git.get_changed_files_since("main") == [root / "sub" / "b.txt"]
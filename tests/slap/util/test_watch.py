@@ -0,0 +1,52 @@
+import os
+import threading
+from pathlib import Path
+
+from slap.util.watch import FileWatcher
+
+
+def test__FileWatcher__poll__detects_created_modified_and_deleted_files(tmp_path: Path) -> None:
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.py").write_text("a")
+    (tmp_path / "src" / "b.py").write_text("b")
+
+    watcher = FileWatcher([tmp_path])
+    assert watcher.poll() == set()
+
+    (tmp_path / "src" / "a.py").write_text("aa")
+    (tmp_path / "src" / "b.py").unlink()
+    (tmp_path / "src" / "c.py").write_text("c")
+    assert watcher.poll() == {tmp_path / "src" / "a.py", tmp_path / "src" / "b.py", tmp_path / "src" / "c.py"}
+    assert watcher.poll() == set()
+
+    # Changes to the modification time only are detected as well.
+    stat = (tmp_path / "src" / "c.py").stat()
+    os.utime(tmp_path / "src" / "c.py", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert watcher.poll() == {tmp_path / "src" / "c.py"}
+
+
+def test__FileWatcher__poll__skips_ignored_and_hidden_files(tmp_path: Path) -> None:
+    watcher = FileWatcher([tmp_path])
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "index").write_text("")
+    (tmp_path / "src" / "__pycache__").mkdir(parents=True)
+    (tmp_path / "src" / "__pycache__" / "a.cpython-310.pyc").write_text("")
+    (tmp_path / "src" / "a.py").write_text("a")
+    assert watcher.poll() == {tmp_path / "src" / "a.py"}
+
+
+def test__FileWatcher__wait__returns_empty_set_when_stopped(tmp_path: Path) -> None:
+    watcher = FileWatcher([tmp_path], interval=0.01)
+    stop = threading.Event()
+    stop.set()
+    assert watcher.wait(stop) == set()
+
+
+def test__FileWatcher__wait__returns_changes(tmp_path: Path) -> None:
+    watcher = FileWatcher([tmp_path], interval=0.01, debounce=0.01)
+    timer = threading.Timer(0.05, lambda: (tmp_path / "a.py").write_text("a"))
+    timer.start()
+    try:
+        assert watcher.wait() == {tmp_path / "a.py"}
+    finally:
+        timer.join()